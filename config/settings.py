@@ -16,6 +16,13 @@ class ModelConfig:
     region: str = "us-west-2"
     max_tokens: int = 4000
     temperature: float = 0.0  # 정확성 우선 (사용자 요구사항)
+    enable_prompt_cache: bool = True  # 정적 시스템 프롬프트에 Bedrock cachePoint 적용
+    enable_streaming_analysis: bool = True  # 쿼리 분석 시 ConverseStream으로 JSON이 완성되는 즉시 수신 중단
+    bedrock_runtime_endpoint_url: Optional[str] = None  # 미지정 시 리전 표준 엔드포인트 사용 (VPC 엔드포인트 등 사용 시 지정)
+    
+    # Bedrock Runtime HTTP 연결 풀 / 재시도 설정 (작업 풀/선행 검색의 동시 호출이 에이전트별 클라이언트를 공유)
+    max_pool_connections: int = 32
+    max_retry_attempts: int = 3
     
     # ReRank 모델
     rerank_model_id: str = "cohere.rerank-v3-5:0"
@@ -23,6 +30,24 @@ class ModelConfig:
     
     # Embedding 모델 (필요시)
     embedding_model_id: str = "amazon.titan-embed-text-v2:0"
+    
+    # 쿼리 분석 결과 캐시 (L1: 쿼리/컨텍스트 정확 일치, L2: 쿼리 임베딩 유사도)
+    analysis_cache_ttl_seconds: int = 600
+    analysis_cache_max_entries: int = 2048
+    enable_semantic_cache: bool = True
+    semantic_cache_threshold: float = 0.9
+    
+    # 개선된 ReAct Agent의 의도 분석 결과 캐시 (쿼리 임베딩 유사도 기준은 더 엄격하게)
+    enable_intent_cache: bool = True
+    intent_cache_threshold: float = 0.93
+    
+    # 최종 응답 캐시 (쿼리/시스템 프롬프트 + 사용 Citation 집합이 같으면 응답 생성 생략)
+    enable_response_cache: bool = True
+    response_cache_max_entries: int = 128
+    
+    # 단순 키워드 쿼리 fast path (컨텍스트 없음 + 길이 제한 미만 + 키워드 2개 이하면 LLM 분석 생략)
+    enable_analysis_fast_path: bool = True
+    fast_path_max_query_length: int = 20
 
 
 @dataclass
@@ -33,6 +58,19 @@ class KnowledgeBaseConfig:
     search_type: str = "HYBRID"  # HYBRID, SEMANTIC, or LEXICAL
     max_results: int = 30
     
+    # HTTP 연결 풀 / 재시도 설정 (동시 검색 시 연결 재사용)
+    max_pool_connections: int = 32
+    max_retry_attempts: int = 3
+    max_concurrency: int = 5  # 요청당 동시 KB 검색 수 (throttling 방지)
+    
+    # 검색 결과 캐시 (읽기 전용 KB 기준, 동일 쿼리 재검색 방지)
+    result_cache_ttl_seconds: int = 300
+    result_cache_max_entries: int = 512
+    
+    # 1차 검색 선행 실행 (의도 분석과 동시에 원본 쿼리로 검색해 결과 캐시를 미리 채움)
+    enable_primary_prefetch: bool = True
+    primary_prefetch_results: int = 50  # 분석 결과의 1차 검색 수(최대 50) 이상이어야 캐시 재사용 가능
+    
     # ReRank 설정 (현재 비활성화)
     enable_rerank: bool = False  # ReRank 기능 비활성화
     rerank_threshold: float = 0.5  # 이 점수 이하는 필터링
@@ -62,6 +100,15 @@ class APIConfig:
     port: int = 8000
     debug: bool = False
     cors_origins: list = None  # 프로덕션에서는 구체적인 도메인 지정
+    # UI 콜백을 별도 디스패처 스레드에서 전달 (포화 시 진행 이벤트는 버림)
+    # Streamlit처럼 스크립트 스레드에서만 렌더링할 수 있는 UI는 비활성화 상태로 사용
+    async_ui_callbacks: bool = False
+    ui_callback_queue_size: int = 256
+    # search_complete 이벤트의 검색 결과가 이 크기(JSON bytes)를 넘으면 참조 ID로 전달 (get_ui_payload로 조회)
+    ui_payload_inline_max_bytes: int = 1024
+    # submit_query_enhanced 작업 보관 (poll_job으로 조회되지 않은 완료 작업은 TTL/개수 제한으로 정리)
+    job_result_ttl_seconds: int = 600
+    max_retained_jobs: int = 256
     
     def __post_init__(self):
         if self.cors_origins is None:
@@ -77,6 +124,7 @@ class LoggingConfig:
     file_path: str = "logs/mcp-rag.log"
     max_file_size_mb: int = 10
     backup_count: int = 5
+    async_logging: bool = True  # 핸들러 I/O를 백그라운드 스레드(QueueListener)에서 처리
 
 
 class Settings:
@@ -104,6 +152,9 @@ class Settings:
         if os.getenv("KB_ID"):
             self.knowledge_base.kb_id = os.getenv("KB_ID")
         
+        if os.getenv("KB_MAX_CONCURRENCY"):
+            self.knowledge_base.max_concurrency = int(os.getenv("KB_MAX_CONCURRENCY"))
+        
         # 모델 설정
         if os.getenv("PRIMARY_MODEL_ID"):
             self.model.primary_model_id = os.getenv("PRIMARY_MODEL_ID")
@@ -111,6 +162,9 @@ class Settings:
         if os.getenv("RERANK_MODEL_ID"):
             self.model.rerank_model_id = os.getenv("RERANK_MODEL_ID")
         
+        if os.getenv("BEDROCK_RUNTIME_ENDPOINT_URL"):
+            self.model.bedrock_runtime_endpoint_url = os.getenv("BEDROCK_RUNTIME_ENDPOINT_URL")
+        
         # API 설정
         if os.getenv("API_HOST"):
             self.api.host = os.getenv("API_HOST")
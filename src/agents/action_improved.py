@@ -4,6 +4,8 @@ Improved Action Agent
 """
 
 import asyncio
+import threading
+from collections import deque
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 import time
@@ -22,7 +24,19 @@ class ImprovedActionAgent:
     def __init__(self):
         self.multi_stage_executor = multi_stage_search_executor
         self.tool_tracker = tool_call_tracker
-        self.execution_history = []
+        self.execution_history = deque(maxlen=100)  # 최근 100개만 유지
+        
+        # 실행 통계 누적값 (히스토리 추가/밀려남 시점에 갱신해 통계 조회 시 재순회 없음)
+        self._running_stats = {
+            "execution_time": 0.0,
+            "citation_count": 0,
+            "quality": 0.0,
+            "additional_search_count": 0,
+            "additional_searches": 0
+        }
+        self._intent_totals: Dict[str, List[float]] = {}  # 의도 -> [실행 수, 품질 합계]
+        self._history_lock = threading.Lock()
+        
         agent_logger.log_agent_action("ImprovedActionAgent", "initialized", {})
     
     def execute_enhanced_search_strategy(
@@ -47,11 +61,6 @@ class ImprovedActionAgent:
         try:
             start_time = time.time()
             
-            # UI 콜백 설정
-            if ui_callback:
-                self.tool_tracker.set_ui_callback(ui_callback)
-                self.multi_stage_executor.set_ui_callback(ui_callback)  # 추가
-            
             # ReRank 설정 결정
             if enable_rerank is None:
                 enable_rerank = settings.knowledge_base.enable_rerank
@@ -67,16 +76,19 @@ class ImprovedActionAgent:
             )
             
             # 1단계: 다단계 검색 실행
+            # UI 콜백은 공유 트래커/실행기에 설정하지 않고 호출마다 전달 (동시 요청 간 이벤트 혼선 방지)
             search_results = self._execute_multi_stage_search_with_tracking(
                 analysis_result,
-                max_results_per_query or analysis_result.get("max_results", 50)
+                max_results_per_query or analysis_result.get("max_results", 50),
+                ui_callback
             )
             
             # 2단계: ReRank 적용 (활성화된 경우)
             if enable_rerank and search_results.get("status") == "success":
                 search_results = self._apply_rerank_with_tracking(
                     search_results,
-                    analysis_result
+                    analysis_result,
+                    ui_callback
                 )
             
             # 3단계: 최종 결과 후처리
@@ -108,10 +120,24 @@ class ImprovedActionAgent:
             agent_logger.log_error(e, "enhanced_search_execution")
             return self._get_enhanced_error_response(str(e))
     
+    def prefetch_primary_search(self, query: str, max_results: Optional[int] = None) -> int:
+        """
+        1차 검색 선행 실행 (의도 분석과 동시에 호출)
+        
+        1차 검색은 원본 쿼리로 수행되므로 분석 결과를 기다리지 않고 미리 실행해 KB 결과 캐시를 채움
+        
+        Returns:
+            가져온 결과 수
+        """
+        return self.multi_stage_executor.prefetch_primary_search(
+            query, max_results or settings.knowledge_base.primary_prefetch_results
+        )
+    
     def _execute_multi_stage_search_with_tracking(
         self,
         analysis_result: Dict[str, Any],
-        primary_search_limit: int
+        primary_search_limit: int,
+        ui_callback: Optional[callable] = None
     ) -> Dict[str, Any]:
         """Tool 호출 추적과 함께 다단계 검색 실행"""
         
@@ -124,35 +150,31 @@ class ImprovedActionAgent:
                     "max_results": primary_search_limit,
                     "search_type": analysis_result.get("search_type", "HYBRID")
                 },
-                stage="primary_search"
+                stage="primary_search",
+                ui_callback=ui_callback
             )
             
             # 다단계 검색 실행
             search_results = self.multi_stage_executor.execute_multi_stage_search(
                 analysis_result=analysis_result,
                 max_additional_searches=analysis_result.get("max_additional_searches", 5),
-                primary_search_limit=primary_search_limit
+                primary_search_limit=primary_search_limit,
+                top_k=settings.citation.max_citations_per_response,
+                ui_callback=ui_callback
             )
             
             # 1차 검색 완료 처리
             primary_result = search_results.get("primary_results", {})
             self.tool_tracker.complete_tool_call(primary_call_id, primary_result)
             
-            # 추가 검색들의 Tool 호출 추적
+            # 추가 검색들은 동시에 실행되므로 하나의 배치 Tool 호출로 기록
             additional_results = search_results.get("additional_results", [])
-            for i, additional_result in enumerate(additional_results, 1):
-                if additional_result.get("status") == "success":
-                    # 추가 검색 Tool 호출 추적 (이미 완료된 것들을 기록)
-                    additional_call_id = self.tool_tracker.start_tool_call(
-                        tool_name="kb_search",
-                        parameters={
-                            "query": additional_result.get("query", ""),
-                            "max_results": 20,
-                            "search_type": "HYBRID"
-                        },
-                        stage=f"additional_search_{i}"
-                    )
-                    self.tool_tracker.complete_tool_call(additional_call_id, additional_result)
+            if additional_results:
+                self.tool_tracker.track_batch_search(
+                    [additional_result.get("query", "") for additional_result in additional_results],
+                    additional_results,
+                    ui_callback=ui_callback
+                )
             
             return search_results
             
@@ -165,7 +187,8 @@ class ImprovedActionAgent:
     def _apply_rerank_with_tracking(
         self,
         search_results: Dict[str, Any],
-        analysis_result: Dict[str, Any]
+        analysis_result: Dict[str, Any],
+        ui_callback: Optional[callable] = None
     ) -> Dict[str, Any]:
         """ReRank 적용 및 Tool 호출 추적"""
         
@@ -181,7 +204,8 @@ class ImprovedActionAgent:
                 "documents_count": len(citations),
                 "top_k": settings.model.rerank_top_k
             },
-            stage="rerank"
+            stage="rerank",
+            ui_callback=ui_callback
         )
         
         try:
@@ -312,31 +336,36 @@ class ImprovedActionAgent:
                 "diversity_score": 0.0
             }
         
+        # 신뢰도 합계/고신뢰 수/문서 집합/소문자 미리보기를 한 번의 순회로 집계
+        confidence_sum = 0.0
+        high_confidence_citations = 0
+        unique_documents = set()
+        previews = []
+        for citation in citations:
+            confidence = citation.get("confidence", 0)
+            confidence_sum += confidence
+            if confidence >= 0.7:
+                high_confidence_citations += 1
+            
+            doc_id = citation.get("document_uri", citation.get("uri", citation.get("id", "")))
+            if doc_id:
+                unique_documents.add(doc_id)
+            
+            previews.append(citation.get("preview", "").lower())
+        
         # 1. 관련성 점수 (평균 신뢰도)
-        relevance_scores = [c.get("confidence", 0) for c in citations]
-        relevance_score = sum(relevance_scores) / len(relevance_scores)
+        relevance_score = confidence_sum / len(citations)
         
         # 2. 커버리지 점수 (키워드 커버리지)
         key_entities = analysis_result.get("search_priorities", {}).get("key_entities", [])
-        covered_entities = 0
-        
-        for entity in key_entities:
-            entity_covered = any(
-                entity.lower() in citation.get("preview", "").lower() 
-                for citation in citations
-            )
-            if entity_covered:
-                covered_entities += 1
+        covered_entities = sum(
+            1 for entity in key_entities
+            if any(entity.lower() in preview for preview in previews)
+        )
         
         coverage_score = covered_entities / max(len(key_entities), 1)
         
         # 3. 다양성 점수 (서로 다른 문서 수)
-        unique_documents = set()
-        for citation in citations:
-            doc_id = citation.get("document_uri", citation.get("uri", citation.get("id", "")))
-            if doc_id:
-                unique_documents.add(doc_id)
-        
         diversity_score = len(unique_documents) / len(citations)
         
         # 4. 전체 품질 점수
@@ -349,7 +378,7 @@ class ImprovedActionAgent:
             "diversity_score": round(diversity_score, 3),
             "total_citations": len(citations),
             "unique_documents": len(unique_documents),
-            "high_confidence_citations": sum(1 for c in citations if c.get("confidence", 0) >= 0.7)
+            "high_confidence_citations": high_confidence_citations
         }
     
     def _save_enhanced_execution_history(
@@ -359,28 +388,50 @@ class ImprovedActionAgent:
     ):
         """개선된 실행 히스토리 저장"""
         try:
+            # 통계에 쓰는 값은 저장 시점에 스칼라로 정규화 (집계 시 기본값 처리/중첩 조회 없음)
+            quality_metrics = final_results.get("quality_metrics") or {}
+            tool_statistics = (final_results.get("tool_call_statistics") or {}).get("tool_statistics") or {}
             history_entry = {
                 "timestamp": datetime.now().isoformat(),
                 "primary_intent": analysis_result.get("primary_intent", "unknown"),
                 "complexity_level": analysis_result.get("complexity", "보통"),
-                "requires_additional_search": analysis_result.get("requires_additional_search", False),
+                "requires_additional_search": bool(analysis_result.get("requires_additional_search", False)),
                 "additional_searches_performed": len(final_results.get("search_stages", [])) - 1,
                 "final_citation_count": len(final_results.get("citations", [])),
-                "total_execution_time": final_results.get("total_execution_time", 0),
-                "quality_metrics": final_results.get("quality_metrics", {}),
+                "total_execution_time": float(final_results.get("total_execution_time", 0.0)),
+                "overall_quality": float(quality_metrics.get("overall_quality", 0.0)),
                 "rerank_applied": final_results.get("rerank_applied", False),
-                "tool_calls_made": len(final_results.get("tool_call_statistics", {}).get("tool_statistics", {}))
+                "tool_calls_made": len(tool_statistics)
             }
             
-            self.execution_history.append(history_entry)
-            
-            # 히스토리 크기 제한 (최근 100개만 유지)
-            if len(self.execution_history) > 100:
-                self.execution_history = self.execution_history[-100:]
+            with self._history_lock:
+                # 가장 오래된 항목이 밀려나면 누적값에서 먼저 제외
+                if len(self.execution_history) == self.execution_history.maxlen:
+                    self._update_running_stats(self.execution_history[0], -1)
+                self.execution_history.append(history_entry)
+                self._update_running_stats(history_entry, 1)
                 
         except Exception as e:
             agent_logger.log_error(e, "enhanced_execution_history_save")
     
+    def _update_running_stats(self, history_entry: Dict[str, Any], sign: int):
+        """히스토리 항목을 실행 통계 누적값에 더하거나(sign=1) 뺌(sign=-1)"""
+        quality = history_entry["overall_quality"]
+        stats = self._running_stats
+        stats["execution_time"] += sign * history_entry["total_execution_time"]
+        stats["citation_count"] += sign * history_entry["final_citation_count"]
+        stats["quality"] += sign * quality
+        stats["additional_searches"] += sign * history_entry["additional_searches_performed"]
+        if history_entry["requires_additional_search"]:
+            stats["additional_search_count"] += sign
+        
+        intent = history_entry["primary_intent"]
+        intent_total = self._intent_totals.setdefault(intent, [0, 0.0])
+        intent_total[0] += sign
+        intent_total[1] += sign * quality
+        if intent_total[0] == 0:
+            del self._intent_totals[intent]
+    
     def _get_enhanced_error_response(self, error_message: str) -> Dict[str, Any]:
         """개선된 에러 응답 생성"""
         return {
@@ -411,45 +462,20 @@ class ImprovedActionAgent:
         if not self.execution_history:
             return {"total_executions": 0}
         
-        total_executions = len(self.execution_history)
-        
-        # 기본 통계
-        avg_execution_time = sum(h.get("total_execution_time", 0) for h in self.execution_history) / total_executions
-        avg_citation_count = sum(h.get("final_citation_count", 0) for h in self.execution_history) / total_executions
-        
-        # 의도별 통계
-        intent_stats = {}
-        for history in self.execution_history:
-            intent = history.get("primary_intent", "unknown")
-            if intent not in intent_stats:
-                intent_stats[intent] = {"count": 0, "avg_quality": 0, "total_quality": 0}
-            
-            intent_stats[intent]["count"] += 1
-            quality = history.get("quality_metrics", {}).get("overall_quality", 0)
-            intent_stats[intent]["total_quality"] += quality
-        
-        # 평균 품질 계산
-        for intent, stats in intent_stats.items():
-            stats["avg_quality"] = round(stats["total_quality"] / stats["count"], 3)
-            del stats["total_quality"]
-        
-        # 추가 검색 통계
-        additional_search_rate = sum(
-            1 for h in self.execution_history 
-            if h.get("requires_additional_search", False)
-        ) / total_executions * 100
-        
-        avg_additional_searches = sum(
-            h.get("additional_searches_performed", 0) 
-            for h in self.execution_history
-        ) / total_executions
+        with self._history_lock:
+            total_executions = len(self.execution_history)
+            stats = dict(self._running_stats)
+            intent_stats = {
+                intent: {"count": count, "avg_quality": round(quality_sum / count, 3)}
+                for intent, (count, quality_sum) in self._intent_totals.items()
+            }
+            last_execution_time = self.execution_history[-1]["timestamp"]
         
-        # 품질 통계
-        quality_scores = [
-            h.get("quality_metrics", {}).get("overall_quality", 0) 
-            for h in self.execution_history
-        ]
-        avg_quality = sum(quality_scores) / len(quality_scores)
+        avg_execution_time = stats["execution_time"] / total_executions
+        avg_citation_count = stats["citation_count"] / total_executions
+        avg_quality = stats["quality"] / total_executions
+        additional_search_rate = stats["additional_search_count"] / total_executions * 100
+        avg_additional_searches = stats["additional_searches"] / total_executions
         
         return {
             "total_executions": total_executions,
@@ -460,7 +486,7 @@ class ImprovedActionAgent:
             "average_additional_searches": round(avg_additional_searches, 1),
             "intent_statistics": intent_stats,
             "tool_call_statistics": self.tool_tracker.get_call_statistics(),
-            "last_execution_time": self.execution_history[-1]["timestamp"]
+            "last_execution_time": last_execution_time
         }
 
 
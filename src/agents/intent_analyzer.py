@@ -10,6 +10,7 @@ from datetime import datetime
 import re
 
 from config.settings import settings
+from src.utils.bedrock import bedrock_runtime_config
 from src.utils.logger import agent_logger
 
 
@@ -23,7 +24,8 @@ class IntentAnalyzer:
         try:
             self.bedrock_runtime = boto3.client(
                 'bedrock-runtime',
-                region_name=self.region
+                region_name=self.region,
+                config=bedrock_runtime_config()
             )
             agent_logger.log_agent_action("IntentAnalyzer", "initialized", {"model_id": self.model_id})
         except Exception as e:
@@ -4,52 +4,364 @@ Citation 처리 메서드명을 수정하고 완전히 통합된 버전
 """
 
 import asyncio
-from typing import List, Dict, Any, Optional, Tuple
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator, Callable
 from datetime import datetime
 import time
 import hashlib
 
+import numpy as np
+
 from config.settings import settings
 from src.utils.logger import agent_logger
 from src.mcp.server import execute_mcp_tool_sync
-from src.utils.citation import CitationCollection, CitationProcessor, Citation
-from src.mcp.kb_client import BedrockKBClient
+from src.utils.citation import CitationCollection, CitationProcessor, Citation, make_citation_id, s3_document_title
+from src.mcp.kb_client import kb_client as shared_kb_client
+from src.utils.cache import TTLCache
+
+# pyahocorasick 안전 import (없으면 부분 문자열 검사로 대체)
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+# 근사 중복 판정용 SimHash 설정
+SIMHASH_SHINGLE_SIZE = 3  # 단어 3-gram shingle
+SIMHASH_MAX_DISTANCE = 8  # Hamming 거리 8 이하면 중복 (≈ Jaccard 0.9 이상)
+
+# LSH band 설정: 7비트 band 9개 (63비트)
+# 거리 8 이하인 두 지문은 비둘기집 원리에 따라 적어도 한 band가 완전히 일치하므로 후보 누락이 없음
+SIMHASH_BANDS = SIMHASH_MAX_DISTANCE + 1
+SIMHASH_BAND_BITS = 7
+_SIMHASH_BAND_MASK = (1 << SIMHASH_BAND_BITS) - 1
+
+# 단어 수 비율이 이 값 미만이면 Jaccard 0.9에 도달할 수 없으므로 Hamming 비교 없이 제외
+# (|A∩B|/|A∪B| ≤ min(|A|,|B|)/max(|A|,|B|))
+SIMHASH_MIN_LENGTH_RATIO = 0.9
+
+# _annotate_citations가 Citation에 저장하는 내부 계산용 필드 (외부 전달 전 제거)
+_INTERNAL_CITATION_FIELDS = ("_preview_lc", "_tokens", "_exact_fp", "_fp")
+
+
+def _shingles(words: Tuple[str, ...]) -> List[str]:
+    """단어 목록을 k-단어 shingle 목록으로 변환"""
+    k = SIMHASH_SHINGLE_SIZE
+    if len(words) <= k:
+        return [" ".join(words)]
+    return [" ".join(words[i:i + k]) for i in range(len(words) - k + 1)]
+
+
+def _simhash64_batch(token_lists: List[Tuple[str, ...]]) -> List[int]:
+    """
+    여러 텍스트의 64비트 SimHash 지문을 numpy로 일괄 계산 (빈 입력은 0)
+    
+    모든 shingle 해시를 하나의 비트 행렬로 펼친 뒤 텍스트 구간별로 비트 위치별 1의 개수를 합산
+    """
+    fingerprints = [0] * len(token_lists)
+    digests = []
+    segment_starts = []
+    segment_sizes = []
+    targets = []
+    
+    for index, words in enumerate(token_lists):
+        if not words:
+            continue
+        shingles = _shingles(words)
+        targets.append(index)
+        segment_starts.append(len(digests))
+        segment_sizes.append(len(shingles))
+        digests.extend(hashlib.blake2b(s.encode(), digest_size=8).digest() for s in shingles)
+    
+    if not digests:
+        return fingerprints
+    
+    # (shingle 수, 64) 비트 행렬 - 상위 비트부터
+    bits = np.unpackbits(np.frombuffer(b"".join(digests), dtype=np.uint8).reshape(-1, 8), axis=1)
+    ones = np.add.reduceat(bits, segment_starts, axis=0, dtype=np.int32)
+    majority = ones * 2 > np.array(segment_sizes)[:, None]
+    values = np.packbits(majority, axis=1).view(">u8").ravel().tolist()
+    
+    for index, value in zip(targets, values):
+        fingerprints[index] = value
+    return fingerprints
+
+
+def _simhash64(words: Tuple[str, ...]) -> int:
+    """소문자 단어 shingle 기반 64비트 SimHash 지문 계산 (빈 입력은 0)"""
+    return _simhash64_batch([words])[0]
+
+
+def _exact_fingerprint(words: Tuple[str, ...]) -> int:
+    """공백/대소문자 정규화된 텍스트의 64비트 정확 일치 지문 (빈 입력은 0)"""
+    if not words:
+        return 0
+    return int.from_bytes(hashlib.blake2b(" ".join(words).encode(), digest_size=8).digest(), "big")
+
+
+def _hamming_distance(fp1: int, fp2: int) -> int:
+    """두 지문 간 Hamming 거리 (Python 3.9 호환 popcount)"""
+    return bin(fp1 ^ fp2).count("1")
+
+
+class _SimHashIndex:
+    """
+    SimHash 지문 banded LSH 인덱스 - band가 일치하는 후보만 Hamming 거리 비교
+    
+    지문과 함께 단어 수를 저장해 길이 차이가 큰 후보는 정수 비교만으로 제외
+    """
+    
+    __slots__ = ("_buckets",)
+    
+    def __init__(self):
+        self._buckets: List[Dict[int, List[Tuple[int, int]]]] = [{} for _ in range(SIMHASH_BANDS)]
+    
+    def add(self, fp: int, word_count: int = 0):
+        """지문 추가 (0은 빈 텍스트이므로 제외)"""
+        if not fp:
+            return
+        entry = (fp, word_count)
+        for band, bucket in enumerate(self._buckets):
+            key = (fp >> (band * SIMHASH_BAND_BITS)) & _SIMHASH_BAND_MASK
+            bucket.setdefault(key, []).append(entry)
+    
+    def has_near_duplicate(self, fp: int, word_count: int = 0) -> bool:
+        """Hamming 거리 임계값 이내의 지문 존재 여부 (word_count가 0이면 길이 비교 생략)"""
+        if not fp:
+            return False
+        for band, bucket in enumerate(self._buckets):
+            candidates = bucket.get((fp >> (band * SIMHASH_BAND_BITS)) & _SIMHASH_BAND_MASK)
+            if not candidates:
+                continue
+            for other_fp, other_count in candidates:
+                if word_count and other_count:
+                    shorter, longer = (word_count, other_count) if word_count <= other_count else (other_count, word_count)
+                    if shorter < SIMHASH_MIN_LENGTH_RATIO * longer:
+                        continue
+                if _hamming_distance(fp, other_fp) <= SIMHASH_MAX_DISTANCE:
+                    return True
+        return False
+
+
+
+def _citation_dedup_key(citation: Dict[str, Any], citation_uri: str) -> Tuple[str, Any, int]:
+    """중복 판정용 복합 키 (URI, 페이지 번호, 정규화된 preview 200자 지문)"""
+    exact_fp = citation.get("_exact_fp")
+    if exact_fp is None:
+        exact_fp = _exact_fingerprint(tuple(citation.get("preview", "").lower()[:200].split()))
+    return (citation_uri, citation.get("page_number"), exact_fp)
+
+
+class _CitationDeduplicator:
+    """
+    우선순위 순서로 들어오는 Citation을 점진적으로 중복 제거 (먼저 들어온 Citation 유지)
+    
+    검색 단계가 끝나는 대로 Citation을 추가할 수 있어 마지막 검색 완료 후 남는 작업은 정렬뿐임
+    """
+    
+    __slots__ = (
+        "kept", "seen_count", "_score_citation", "_seen_ids", "_seen_uris",
+        "_seen_keys", "_kept_fingerprints", "_kept_exact_fps"
+    )
+    
+    def __init__(self, score_citation: Optional[Callable[[Dict[str, Any]], float]] = None):
+        self.kept: List[Dict[str, Any]] = []
+        self.seen_count = 0
+        self._score_citation = score_citation
+        self._seen_ids = set()
+        self._seen_uris = set()
+        self._seen_keys = set()
+        self._kept_fingerprints = _SimHashIndex()
+        self._kept_exact_fps = set()
+    
+    def add_stage(self, citations: List[Dict[str, Any]], source_stage: str, priority_score: float):
+        """검색 단계 정보(source_stage, priority_score)를 부여하며 한 단계의 Citation 추가"""
+        for citation in citations:
+            citation["source_stage"] = source_stage
+            citation["priority_score"] = priority_score
+            self.add(citation)
+    
+    def add(self, citation: Dict[str, Any]) -> bool:
+        """Citation 추가 (기존 Citation과 중복이면 False)"""
+        self.seen_count += 1
+        citation_id = citation.get("id", "")
+        citation_uri = citation["uri"]
+        
+        # ID 기반 중복 확인
+        if citation_id and citation_id in self._seen_ids:
+            return False
+        
+        citation_fp = citation.get("_fp", 0)
+        word_count = len(citation.get("_tokens", ()))
+        citation_key = None
+        if citation_uri:
+            # URI 기반 중복 확인 (같은 URI의 복합 키는 항상 이 단계에서 걸러짐)
+            if citation_uri in self._seen_uris:
+                return False
+        else:
+            # URI가 없는 경우에만 복합 키 (URI, 페이지, preview 지문) 기반 중복 확인
+            citation_key = _citation_dedup_key(citation, citation_uri)
+            if citation_key in self._seen_keys:
+                return False
+            
+            # 정규화된 preview 정확 일치 (페이지만 다른 경우) - 유사도 비교 전 단락
+            if citation_key[2] and citation_key[2] in self._kept_exact_fps:
+                return False
+            
+            # 텍스트 기반 중복 확인 (SimHash LSH 후보만 비교)
+            if self._kept_fingerprints.has_near_duplicate(citation_fp, word_count):
+                return False
+        
+        if self._score_citation is not None:
+            citation["final_score"] = self._score_citation(citation)
+        self.kept.append(citation)
+        if citation_id:
+            self._seen_ids.add(citation_id)
+        if citation_uri:
+            self._seen_uris.add(citation_uri)
+        else:
+            self._seen_keys.add(citation_key)
+        self._kept_fingerprints.add(citation_fp, word_count)
+        if citation.get("_exact_fp"):
+            self._kept_exact_fps.add(citation["_exact_fp"])
+        return True
+
+# 의도별 우선순위 키워드 (한국어 조사가 붙은 형태도 매칭되도록 부분 문자열로 비교)
+INTENT_KEYWORDS = {
+    "절차_문의": ("절차", "단계", "프로세스", "방법", "순서"),
+    "규정_확인": ("규정", "기준", "법령", "조항", "요구사항"),
+    "기술_질문": ("기술", "방법", "해결책", "구현", "적용"),
+    "비교_분석": ("비교", "차이점", "장단점", "선택", "기준"),
+    "문제_해결": ("해결", "대응", "조치", "방안", "처리")
+}
+
 
+def _build_intent_matcher(
+    intent_keywords: Tuple[str, ...],
+    entity_terms: List[str]
+) -> Callable[[str], Tuple[int, int]]:
+    """
+    의도 키워드/엔티티 매칭 함수 생성 - 텍스트별 (키워드 일치 수, 엔티티 일치 수) 반환
+    
+    서로 다른 용어는 텍스트에 여러 번 등장해도 한 번만 집계 (부분 문자열 검사와 동일한 결과).
+    pyahocorasick이 있으면 오토마톤 한 번의 선형 스캔으로 모든 용어를 찾음
+    """
+    # 용어별 (키워드 가중 횟수, 엔티티 가중 횟수) - 중복 용어는 입력 목록 기준으로 누적
+    term_counts: Dict[str, List[int]] = {}
+    for keyword in intent_keywords:
+        term_counts.setdefault(keyword, [0, 0])[0] += 1
+    for entity in entity_terms:
+        term_counts.setdefault(entity, [0, 0])[1] += 1
+    
+    # 빈 문자열은 항상 일치하므로 기본값으로 처리
+    base_counts = term_counts.pop("", [0, 0])
+    
+    if not term_counts:
+        return lambda text: (base_counts[0], base_counts[1])
+    
+    if AHOCORASICK_AVAILABLE:
+        automaton = ahocorasick.Automaton()
+        for term, counts in term_counts.items():
+            automaton.add_word(term, (term, counts[0], counts[1]))
+        automaton.make_automaton()
+        
+        def match(text: str) -> Tuple[int, int]:
+            keyword_hits, entity_hits = base_counts
+            matched = set()
+            for _, (term, keyword_count, entity_count) in automaton.iter(text):
+                if term not in matched:
+                    matched.add(term)
+                    keyword_hits += keyword_count
+                    entity_hits += entity_count
+            return keyword_hits, entity_hits
+        return match
+    
+    terms = [(term, counts[0], counts[1]) for term, counts in term_counts.items()]
+    
+    def match(text: str) -> Tuple[int, int]:
+        keyword_hits, entity_hits = base_counts
+        for term, keyword_count, entity_count in terms:
+            if term in text:
+                keyword_hits += keyword_count
+                entity_hits += entity_count
+        return keyword_hits, entity_hits
+    return match
+
+
+def _rank_order(
+    final_scores: np.ndarray,
+    confidences: np.ndarray,
+    indexes: np.ndarray
+) -> List[int]:
+    """
+    (최종 점수 내림차순, 신뢰도 내림차순, 인덱스 오름차순) 정렬 순서 반환
+    
+    모든 키가 같으면 입력 순서를 유지 (안정 정렬과 동일)
+    """
+    positions = np.arange(len(final_scores))
+    # lexsort는 마지막 키가 1순위
+    return np.lexsort((positions, indexes, -confidences, -final_scores)).tolist()
+
+
+# 이 개수 이상의 KB 결과는 Citation 변환을 워커 스레드에서 수행 (이벤트 루프 점유 방지)
+CONVERSION_OFFLOAD_THRESHOLD = 32
+
+# 기본 Citation에 보존할 KB 메타데이터 키 (UI/응답 생성에서 실제로 사용하는 항목만)
+BASIC_CITATION_METADATA_KEYS = (
+    "x-amz-bedrock-kb-source-uri",
+    "x-amz-bedrock-kb-document-page-number"
+)
 
 class SearchStage:
     """검색 단계 정보"""
     
+    __slots__ = (
+        "stage_type", "query", "stage_number", "start_time",
+        "results", "status", "error_message", "_t_start", "_t_end"
+    )
+    
     def __init__(self, stage_type: str, query: str, stage_number: int = 0):
         self.stage_type = stage_type  # "primary" or "additional"
         self.query = query
         self.stage_number = stage_number
-        self.start_time = None
-        self.end_time = None
+        self.start_time = None  # epoch 초 (ISO 변환은 to_dict 시점에 수행)
         self.results = []
         self.status = "pending"  # pending, running, completed, failed
         self.error_message = None
+        self._t_start = None  # 소요 시간 계산용 monotonic 시각
+        self._t_end = None
     
     def start(self):
         """검색 단계 시작"""
-        self.start_time = datetime.now()
+        self._t_start = time.perf_counter()
+        self.start_time = time.time()
         self.status = "running"
     
     def complete(self, results: List[Dict[str, Any]]):
         """검색 단계 완료"""
-        self.end_time = datetime.now()
+        self._t_end = time.perf_counter()
         self.results = results
         self.status = "completed"
     
     def fail(self, error_message: str):
         """검색 단계 실패"""
-        self.end_time = datetime.now()
+        self._t_end = time.perf_counter()
         self.status = "failed"
         self.error_message = error_message
     
+    @property
+    def end_time(self) -> Optional[float]:
+        """종료 epoch 초 (시작 시각 + monotonic 소요 시간으로 계산, 벽시계 재조회 없음)"""
+        if self.start_time is None or self._t_end is None:
+            return None
+        return self.start_time + self.get_duration()
+    
     def get_duration(self) -> float:
         """검색 소요 시간 반환"""
-        if self.start_time and self.end_time:
-            return (self.end_time - self.start_time).total_seconds()
+        if self._t_start is not None and self._t_end is not None:
+            return self._t_end - self._t_start
         return 0.0
     
     def to_dict(self) -> Dict[str, Any]:
@@ -62,8 +374,8 @@ class SearchStage:
             "duration": self.get_duration(),
             "result_count": len(self.results),
             "error_message": self.error_message,
-            "start_time": self.start_time.isoformat() if self.start_time else None,
-            "end_time": self.end_time.isoformat() if self.end_time else None
+            "start_time": datetime.fromtimestamp(self.start_time).isoformat() if self.start_time else None,
+            "end_time": datetime.fromtimestamp(self.end_time).isoformat() if self.end_time else None
         }
 
 
@@ -71,121 +383,278 @@ class MultiStageSearchExecutor:
     """다단계 검색 실행기 - 완전 수정된 버전"""
     
     def __init__(self):
-        self.kb_client = BedrockKBClient()
-        self.search_stages = []
-        self.execution_history = []
+        # 프로세스 전역 KB 클라이언트를 공유하여 boto3 클라이언트/연결 풀을 재사용
+        self.kb_client = shared_kb_client
+        self.execution_history = deque(maxlen=50)  # 최근 50개만 유지
         self.ui_callback = None  # UI 콜백 함수 추가
+        self._conversion_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="citation-convert")
+        self._kb_cache = TTLCache(
+            max_entries=settings.knowledge_base.result_cache_max_entries,
+            ttl_seconds=settings.knowledge_base.result_cache_ttl_seconds
+        )
         agent_logger.log_agent_action("MultiStageSearchExecutor", "initialized", {})
     
+    def invalidate_cache(self):
+        """KB 검색 결과 캐시 무효화 (KB 데이터 동기화 후 호출)"""
+        self._kb_cache.clear()
+        agent_logger.log_agent_action("MultiStageSearchExecutor", "kb_cache_invalidated", {})
+    
+    def close(self):
+        """Citation 변환용 스레드 풀 종료"""
+        if self._conversion_pool is not None:
+            self._conversion_pool.shutdown(wait=False)
+            self._conversion_pool = None
+    
     def set_ui_callback(self, ui_callback: callable):
-        """UI 콜백 함수 설정"""
+        """기본 UI 콜백 함수 설정 (요청별 콜백은 execute_multi_stage_search의 ui_callback 사용)"""
         self.ui_callback = ui_callback
     
     def execute_multi_stage_search(
         self,
         analysis_result: Dict[str, Any],
         max_additional_searches: int = 5,
-        primary_search_limit: int = 50
+        primary_search_limit: int = 50,
+        top_k: Optional[int] = None,
+        ui_callback: Optional[callable] = None
+    ) -> Dict[str, Any]:
+        """다단계 검색 실행 (동기 래퍼)"""
+        return _run_coroutine_sync(
+            self.execute_multi_stage_search_async(
+                analysis_result,
+                max_additional_searches=max_additional_searches,
+                primary_search_limit=primary_search_limit,
+                top_k=top_k,
+                ui_callback=ui_callback
+            )
+        )
+    
+    async def execute_multi_stage_search_async(
+        self,
+        analysis_result: Dict[str, Any],
+        max_additional_searches: int = 5,
+        primary_search_limit: int = 50,
+        top_k: Optional[int] = None,
+        ui_callback: Optional[callable] = None
     ) -> Dict[str, Any]:
-        """다단계 검색 실행"""
+        """다단계 검색 실행 - 스트리밍 검색의 최종 결과만 반환"""
         try:
-            start_time = time.time()
-            self.search_stages = []
-            
-            # 원본 쿼리 추출
-            original_query = analysis_result.get("original_query", "")
-            if not original_query:
-                original_query = analysis_result.get("search_queries", [""])[0]
+            final_result = None
+            async for event in self.stream_multi_stage_search(
+                analysis_result,
+                max_additional_searches=max_additional_searches,
+                primary_search_limit=primary_search_limit,
+                top_k=top_k,
+                ui_callback=ui_callback
+            ):
+                if event["stage"] == "final":
+                    final_result = event["result"]
             
-            agent_logger.log_agent_action(
-                "MultiStageSearchExecutor",
-                "multi_stage_search_start",
-                {
-                    "original_query": original_query[:100],
-                    "requires_additional_search": analysis_result.get("requires_additional_search", False),
-                    "max_additional_searches": max_additional_searches
-                }
-            )
+            return final_result
             
-            # 1단계: 1차 하이브리드 검색 (50개)
-            primary_results = self._perform_primary_search(
-                original_query, 
-                primary_search_limit
+        except Exception as e:
+            agent_logger.log_error(e, "multi_stage_search_execution")
+            return self._get_error_result(str(e))
+    
+    async def stream_multi_stage_search(
+        self,
+        analysis_result: Dict[str, Any],
+        max_additional_searches: int = 5,
+        primary_search_limit: int = 50,
+        top_k: Optional[int] = None,
+        ui_callback: Optional[callable] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        다단계 검색을 실행하면서 단계별 결과를 완료 순서대로 전달
+        
+        ui_callback을 넘기면 이 실행의 진행 이벤트는 그 콜백으로만 전달 (없으면 set_ui_callback으로 지정한 기본 콜백)
+        
+        Yields:
+            {"stage": "primary", ...}: 1차 검색 완료 직후
+            {"stage": "additional", ...}: 각 추가 검색 완료 시 (완료 순서, 새로 발견된 Citation만 포함)
+            {"stage": "final", ...}: 통합/우선순위 정렬된 최종 결과
+        """
+        start_time = time.perf_counter()
+        # 단계 목록은 실행마다 따로 유지 (같은 executor로 여러 작업이 동시에 검색해도 섞이지 않도록)
+        search_stages: List[SearchStage] = []
+        ui_callback = ui_callback or self.ui_callback
+        
+        # 원본 쿼리 추출
+        original_query = analysis_result.get("original_query", "")
+        if not original_query:
+            original_query = analysis_result.get("search_queries", [""])[0]
+        
+        agent_logger.log_agent_action(
+            "MultiStageSearchExecutor",
+            "multi_stage_search_start",
+            lambda: {
+                "original_query": original_query[:100],
+                "requires_additional_search": analysis_result.get("requires_additional_search", False),
+                "max_additional_searches": max_additional_searches
+            }
+        )
+        
+        # 추가 검색 쿼리는 분석 단계에서 이미 결정되어 1차 결과에 의존하지 않음
+        additional_queries = []
+        if analysis_result.get("requires_additional_search", False):
+            additional_queries = analysis_result.get("additional_search_queries", [])[:max_additional_searches]
+        
+        # 동시 KB 검색 수 제한 (Semaphore는 실행 중인 이벤트 루프 안에서 생성)
+        kb_semaphore = asyncio.Semaphore(max(1, settings.knowledge_base.max_concurrency))
+        
+        # 1단계: 1차 하이브리드 검색 (50개) / 2단계: 추가 검색을 동시에 시작
+        primary_task = asyncio.ensure_future(
+            self._perform_primary_search(
+                original_query, search_stages, primary_search_limit, kb_semaphore, ui_callback
             )
+        )
+        additional_tasks = self._schedule_additional_searches(
+            additional_queries, primary_task, search_stages, kb_semaphore, ui_callback
+        )
+        
+        try:
+            primary_results = await primary_task
+            primary_citations = primary_results.get("citations", [])
             
-            # 2단계: 추가 검색 필요성 판단 및 실행
-            additional_results = []
-            if analysis_result.get("requires_additional_search", False):
-                additional_queries = analysis_result.get("additional_search_queries", [])
-                if additional_queries:
-                    additional_results = self._perform_additional_searches(
-                        additional_queries[:max_additional_searches],
-                        primary_results
-                    )
-            
-            # 3단계: 검색 결과 통합 및 중복 제거
-            integrated_results = self._integrate_search_results(
-                primary_results,
-                additional_results,
-                analysis_result
-            )
+            seen_ids = {c.get("id") for c in primary_citations if c.get("id")}
+            seen_uris = {c["uri"] for c in primary_citations}
+            seen_uris.discard("")
             
-            # 실행 시간 계산
-            total_time = time.time() - start_time
+            # 통합 중복 제거는 1차 결과부터 바로 시작하고, 추가 검색은 단계 순서가 이어지는 대로 반영
+            # (우선순위가 단계 순서를 따르므로 순서를 지켜야 최종 결과가 일괄 처리와 같음)
+            deduplicator = _CitationDeduplicator(self._build_intent_scorer(analysis_result))
+            deduplicator.add_stage(primary_citations, "primary", 1.0)
+            pending_stages: Dict[int, Dict[str, Any]] = {}
+            next_stage_number = 1
             
-            # 결과 구성
-            final_result = {
-                "status": "success",
-                "primary_results": primary_results,
-                "additional_results": additional_results,
-                "integrated_results": integrated_results,
-                "citations": integrated_results.get("citations", []),
-                "search_stages": [stage.to_dict() for stage in self.search_stages],
-                "metadata": {
-                    "total_search_time": round(total_time, 3),
-                    "primary_result_count": len(primary_results.get("citations", [])),
-                    "additional_search_count": len(additional_results),
-                    "final_citation_count": len(integrated_results.get("citations", [])),
-                    "deduplication_ratio": self._calculate_deduplication_ratio(
-                        primary_results, additional_results, integrated_results
-                    )
-                }
+            # 스트리밍 이벤트에는 내부 계산용 필드를 뺀 복사본 전달 (원본은 중복 판정에 계속 사용)
+            public_primary = self._public_stage_result(primary_results)
+            yield {
+                "stage": "primary",
+                "stage_number": 1,
+                "citations": public_primary["citations"],
+                "result": public_primary
             }
             
-            # 실행 히스토리 저장
-            self._save_execution_history(analysis_result, final_result)
-            
-            agent_logger.log_agent_action(
-                "MultiStageSearchExecutor",
-                "multi_stage_search_complete",
-                {
-                    "total_time": total_time,
-                    "final_citation_count": len(integrated_results.get("citations", [])),
-                    "search_stages": len(self.search_stages)
+            # 추가 검색은 완료되는 순서대로 전달 (지금까지 전달된 Citation과 중복 제거)
+            additional_results = []
+            for next_completed in asyncio.as_completed(additional_tasks):
+                additional_result = await next_completed
+                additional_results.append(additional_result)
+                
+                pending_stages[additional_result.get("stage_number", 0)] = additional_result
+                while next_stage_number in pending_stages:
+                    self._add_additional_stage(
+                        deduplicator, pending_stages.pop(next_stage_number), next_stage_number
+                    )
+                    next_stage_number += 1
+                
+                new_citations = []
+                for citation in additional_result.get("citations", []):
+                    citation_id = citation.get("id", "")
+                    citation_uri = citation["uri"]
+                    if (citation_id and citation_id in seen_ids) or (citation_uri and citation_uri in seen_uris):
+                        continue
+                    if citation_id:
+                        seen_ids.add(citation_id)
+                    if citation_uri:
+                        seen_uris.add(citation_uri)
+                    new_citations.append(self._strip_internal_fields(citation))
+                
+                yield {
+                    "stage": "additional",
+                    "stage_number": additional_result.get("stage_number", 0),
+                    "citations": new_citations,
+                    "result": self._public_stage_result(additional_result)
                 }
-            )
             
-            return final_result
+            # 통합 시 우선순위는 추가 검색 순서 기준
+            additional_results.sort(key=lambda r: r.get("stage_number", 0))
+            for stage_number in sorted(pending_stages):
+                self._add_additional_stage(deduplicator, pending_stages[stage_number], stage_number)
             
+        finally:
+            for task in additional_tasks:
+                if not task.done():
+                    task.cancel()
+        
+        # 3단계: 검색 결과 통합 (중복 제거는 이미 끝났으므로 정렬만 수행)
+        try:
+            integrated_results = self._build_integrated_result(deduplicator, top_k=top_k)
         except Exception as e:
-            agent_logger.log_error(e, "multi_stage_search_execution")
-            return self._get_error_result(str(e))
+            agent_logger.log_error(e, "search_result_integration")
+            integrated_results = {
+                "status": "error",
+                "error": str(e),
+                "citations": primary_citations
+            }
+        
+        # 실행 시간 계산
+        total_time = time.perf_counter() - start_time
+        
+        # 결과 구성
+        final_result = {
+            "status": "success",
+            "primary_results": primary_results,
+            "additional_results": additional_results,
+            "integrated_results": integrated_results,
+            "citations": integrated_results.get("citations", []),
+            "search_stages": [stage.to_dict() for stage in search_stages],
+            "metadata": {
+                "total_search_time": round(total_time, 3),
+                "primary_result_count": len(primary_citations),
+                "additional_search_count": len(additional_results),
+                "final_citation_count": len(integrated_results.get("citations", [])),
+                "deduplication_ratio": integrated_results.get(
+                    "deduplication_stats", {}
+                ).get("deduplication_ratio", 0.0)
+            }
+        }
+        
+        # 실행 히스토리 저장
+        self._save_execution_history(analysis_result, final_result)
+        
+        agent_logger.log_agent_action(
+            "MultiStageSearchExecutor",
+            "multi_stage_search_complete",
+            lambda: {
+                "total_time": total_time,
+                "final_citation_count": len(integrated_results.get("citations", [])),
+                "search_stages": len(search_stages)
+            }
+        )
+        
+        # 외부로 전달되는 단계별/통합/최종 Citation 모두에서 내부 계산용 필드 제거
+        # (통합 결과의 Citation은 1차/추가 검색 Citation과 같은 객체이므로 제자리에서 한 번씩만 제거)
+        self._remove_internal_fields(primary_citations)
+        for additional_result in additional_results:
+            self._remove_internal_fields(additional_result.get("citations", []))
+        self._remove_internal_fields(final_result["citations"])
+        final_result["citations"] = list(final_result["citations"])
+        
+        yield {
+            "stage": "final",
+            "citations": final_result["citations"],
+            "result": final_result
+        }
     
-    def _perform_primary_search(
+    async def _perform_primary_search(
         self, 
         query: str, 
-        max_results: int = 50
+        search_stages: List[SearchStage],
+        max_results: int = 50,
+        kb_semaphore: Optional[asyncio.Semaphore] = None,
+        ui_callback: Optional[callable] = None
     ) -> Dict[str, Any]:
         """1차 하이브리드 검색 수행"""
         
         stage = SearchStage("primary", query, 1)
-        self.search_stages.append(stage)
+        search_stages.append(stage)
         stage.start()
         
         try:
             # UI 콜백 호출
-            if self.ui_callback:
-                self.ui_callback("stage_update", {
+            if ui_callback:
+                ui_callback("stage_update", {
                     "stage": "kb_search",
                     "message": f"1차 KB 검색 실행 중... (최대 {max_results}개 결과)",
                     "query": query[:50] + "..." if len(query) > 50 else query
@@ -194,38 +663,25 @@ class MultiStageSearchExecutor:
             agent_logger.log_agent_action(
                 "MultiStageSearchExecutor",
                 "primary_search_start",
-                {"query": query[:100], "max_results": max_results}
+                lambda: {"query": query[:100], "max_results": max_results}
             )
             
             # KB 검색 실행
-            search_results, search_time = self.kb_client.search_knowledge_base(
-                query=query,
-                max_results=max_results,
-                search_type="HYBRID"
+            search_results, search_time = await self._search_kb(
+                query, max_results, kb_semaphore, "primary"
             )
             
             # UI 콜백 호출 - 검색 완료
-            if self.ui_callback:
-                self.ui_callback("stage_update", {
+            if ui_callback:
+                ui_callback("stage_update", {
                     "stage": "kb_search",
                     "message": f"1차 KB 검색 완료 ({len(search_results)}개 결과, {search_time:.2f}초)",
                     "result_count": len(search_results),
                     "search_time": search_time
                 })
             
-            # Citation 처리 - 수정된 부분
-            citations = []
-            for result in search_results:
-                try:
-                    # Citation.from_kb_result 직접 사용
-                    citation = Citation.from_kb_result(result)
-                    citations.append(citation.to_dict())
-                except Exception as e:
-                    agent_logger.log_error(e, f"citation_processing_primary")
-                    # 기본 Citation 생성
-                    basic_citation = self._create_basic_citation(result)
-                    if basic_citation:
-                        citations.append(basic_citation)
+            # Citation 처리
+            citations = await self._convert_search_results_async(search_results, "citation_processing_primary")
             
             result = {
                 "status": "success",
@@ -241,7 +697,7 @@ class MultiStageSearchExecutor:
             agent_logger.log_agent_action(
                 "MultiStageSearchExecutor",
                 "primary_search_complete",
-                {
+                lambda: {
                     "result_count": len(citations),
                     "search_time": search_time
                 }
@@ -260,110 +716,250 @@ class MultiStageSearchExecutor:
                 "query": query
             }
     
-    def _perform_additional_searches(
+    async def _search_kb(
         self,
-        additional_queries: List[str],
-        primary_results: Dict[str, Any]
-    ) -> List[Dict[str, Any]]:
-        """의도 기반 추가 검색 수행 - 수정된 버전"""
-        
-        additional_results = []
-        primary_citations = primary_results.get("citations", [])
-        
-        for i, query in enumerate(additional_queries, 1):
-            stage = SearchStage("additional", query, i)
-            self.search_stages.append(stage)
-            stage.start()
-            
-            try:
-                # UI 콜백 호출
-                if self.ui_callback:
-                    self.ui_callback("stage_update", {
-                        "stage": "multi_stage_search",
-                        "message": f"추가 검색 {i}/{len(additional_queries)} 실행 중...",
-                        "query": query[:50] + "..." if len(query) > 50 else query,
-                        "stage_number": i,
-                        "total_stages": len(additional_queries)
-                    })
-                
+        query: str,
+        max_results: int,
+        kb_semaphore: Optional[asyncio.Semaphore],
+        stage_label: str
+    ) -> Tuple[List[Dict[str, Any]], float]:
+        """
+        동시 실행 수 제한과 결과 캐시를 적용한 KB 하이브리드 검색
+        
+        - 캐시 적중 시 KB 호출 없이 저장된 결과 반환 (검색 시간 0)
+        - 더 많은 결과 수로 캐시된 검색은 상위 max_results개만 잘라 재사용 (KB 결과는 점수순)
+        - Semaphore 대기 시간은 튜닝용으로 로깅
+        """
+        search_type = "HYBRID"
+        cache_key = hashlib.blake2b(f"{query}|{search_type}".encode(), digest_size=16).hexdigest()
+        cached_entry = self._kb_cache.get(cache_key)
+        if cached_entry is not None:
+            cached_limit, cached_results = cached_entry
+            # 요청 수 이상으로 검색했거나, 결과가 요청 수보다 적게(전부) 반환된 경우만 재사용
+            if cached_limit >= max_results or len(cached_results) < cached_limit:
+                cached_results = cached_results[:max_results]
                 agent_logger.log_agent_action(
                     "MultiStageSearchExecutor",
-                    f"additional_search_{i}_start",
-                    {"query": query[:100]}
+                    "kb_cache_hit",
+                    lambda: {"stage": stage_label, "result_count": len(cached_results)}
                 )
-                
-                # 중복 방지를 위한 필터링된 검색
-                search_results, search_time = self.kb_client.search_knowledge_base(
+                return cached_results, 0.0
+        
+        if kb_semaphore is None:
+            search_results, search_time = await self.kb_client.asearch_knowledge_base(
+                query=query,
+                max_results=max_results,
+                search_type=search_type
+            )
+        else:
+            wait_start = time.perf_counter()
+            async with kb_semaphore:
+                wait_time = time.perf_counter() - wait_start
+                if wait_time > 0.01:
+                    agent_logger.log_agent_action(
+                        "MultiStageSearchExecutor",
+                        "kb_semaphore_wait",
+                        lambda: {"stage": stage_label, "wait_time": round(wait_time, 3)}
+                    )
+                search_results, search_time = await self.kb_client.asearch_knowledge_base(
                     query=query,
-                    max_results=20,  # 추가 검색은 20개로 제한
-                    search_type="HYBRID"
+                    max_results=max_results,
+                    search_type=search_type
                 )
-                
-                # UI 콜백 호출 - 검색 완료
-                if self.ui_callback:
-                    self.ui_callback("search_stage_complete", {
-                        "stage_number": i,
-                        "total_stages": len(additional_queries),
-                        "result_count": len(search_results),
-                        "search_time": search_time,
-                        "query": query[:50] + "..." if len(query) > 50 else query
-                    })
-                
-                # Citation 처리 및 중복 제거 - 수정된 부분
-                citations = []
-                for result in search_results:
-                    try:
-                        # Citation.from_kb_result 직접 사용
-                        citation = Citation.from_kb_result(result)
-                        citation_dict = citation.to_dict()
-                        
-                        # 중복 확인
-                        if not self._is_duplicate_citation(citation_dict, primary_citations):
-                            citations.append(citation_dict)
-                    except Exception as e:
-                        agent_logger.log_error(e, f"citation_processing_additional_{i}")
-                        # 기본 Citation 생성
-                        basic_citation = self._create_basic_citation(result)
-                        if basic_citation and not self._is_duplicate_citation(basic_citation, primary_citations):
-                            citations.append(basic_citation)
-                
-                result = {
-                    "status": "success",
-                    "citations": citations,
+        
+        self._kb_cache.put(cache_key, (max_results, search_results))
+        return search_results, search_time
+    
+    def prefetch_primary_search(self, query: str, max_results: int = 50) -> int:
+        """
+        1차 검색 선행 실행 (쿼리 분석과 동시에 실행해 KB 결과 캐시를 미리 채움)
+        
+        이후 execute_multi_stage_search의 1차 검색은 max_results 이하이면 캐시에서 바로 처리됨
+        
+        Returns:
+            가져온 결과 수 (실패 시 0 - 1차 검색이 평소처럼 다시 수행됨)
+        """
+        try:
+            search_results, search_time = _run_coroutine_sync(
+                self._search_kb(query, max_results, None, "primary_prefetch")
+            )
+            agent_logger.log_agent_action(
+                "MultiStageSearchExecutor",
+                "primary_search_prefetched",
+                lambda: {"result_count": len(search_results), "search_time": search_time}
+            )
+            return len(search_results)
+        except Exception as e:
+            agent_logger.log_error(e, "primary_search_prefetch")
+            return 0
+    
+    def _schedule_additional_searches(
+        self,
+        additional_queries: List[str],
+        primary_task: "asyncio.Future",
+        search_stages: List[SearchStage],
+        kb_semaphore: Optional[asyncio.Semaphore] = None,
+        ui_callback: Optional[callable] = None
+    ) -> List["asyncio.Task"]:
+        """의도 기반 추가 검색을 동시 실행 태스크로 등록"""
+        
+        if not additional_queries:
+            return []
+        
+        # 1차 결과 중복 판정 인덱스는 1차 검색 완료 직후 한 번만 만들어 모든 추가 검색이 공유
+        primary_index_task = asyncio.ensure_future(self._build_primary_index(primary_task))
+        
+        total_stages = len(additional_queries)
+        return [
+            asyncio.ensure_future(
+                self._perform_additional_search(
+                    i, query, total_stages, primary_index_task, search_stages, kb_semaphore, ui_callback
+                )
+            )
+            for i, query in enumerate(additional_queries, 1)
+        ]
+    
+    async def _build_primary_index(self, primary_task: "asyncio.Future") -> Dict[str, Any]:
+        """1차 검색 완료를 기다려 중복 판정 인덱스 구성"""
+        primary_results = await primary_task
+        return self._build_duplicate_index(primary_results.get("citations", []))
+    
+    async def _perform_additional_search(
+        self,
+        i: int,
+        query: str,
+        total_stages: int,
+        primary_index_task: "asyncio.Future",
+        search_stages: List[SearchStage],
+        kb_semaphore: Optional[asyncio.Semaphore] = None,
+        ui_callback: Optional[callable] = None
+    ) -> Dict[str, Any]:
+        """단일 추가 검색 수행"""
+        
+        stage = SearchStage("additional", query, i)
+        search_stages.append(stage)
+        stage.start()
+        
+        try:
+            # UI 콜백 호출
+            if ui_callback:
+                ui_callback("stage_update", {
+                    "stage": "multi_stage_search",
+                    "message": f"추가 검색 {i}/{total_stages} 실행 중...",
+                    "query": query[:50] + "..." if len(query) > 50 else query,
+                    "stage_number": i,
+                    "total_stages": total_stages
+                })
+            
+            agent_logger.log_agent_action(
+                "MultiStageSearchExecutor",
+                f"additional_search_{i}_start",
+                lambda: {"query": query[:100]}
+            )
+            
+            # 중복 방지를 위한 필터링된 검색
+            search_results, search_time = await self._search_kb(
+                query, 20, kb_semaphore, f"additional_{i}"  # 추가 검색은 20개로 제한
+            )
+            
+            # UI 콜백 호출 - 검색 완료
+            if ui_callback:
+                ui_callback("search_stage_complete", {
+                    "stage_number": i,
+                    "total_stages": total_stages,
+                    "result_count": len(search_results),
                     "search_time": search_time,
-                    "query": query,
-                    "search_type": "HYBRID",
+                    "query": query[:50] + "..." if len(query) > 50 else query
+                })
+            
+            # Citation 처리
+            converted_citations = await self._convert_search_results_async(
+                search_results, f"citation_processing_additional_{i}"
+            )
+            
+            # 중복 확인은 1차 검색 결과가 필요하므로 1차 결과 인덱스 구성을 기다림
+            primary_index = await primary_index_task
+            citations = [
+                citation
+                for citation in converted_citations
+                if not self._is_duplicate_citation(citation, primary_index)
+            ]
+            
+            result = {
+                "status": "success",
+                "citations": citations,
+                "search_time": search_time,
+                "query": query,
+                "search_type": "HYBRID",
+                "result_count": len(citations),
+                "stage_number": i
+            }
+            
+            stage.complete(citations)
+            
+            agent_logger.log_agent_action(
+                "MultiStageSearchExecutor",
+                f"additional_search_{i}_complete",
+                lambda: {
                     "result_count": len(citations),
-                    "stage_number": i
-                }
-                
-                additional_results.append(result)
-                stage.complete(citations)
-                
-                agent_logger.log_agent_action(
-                    "MultiStageSearchExecutor",
-                    f"additional_search_{i}_complete",
-                    {
-                        "result_count": len(citations),
-                        "search_time": search_time
-                    }
-                )
-                
-            except Exception as e:
-                stage.fail(str(e))
-                agent_logger.log_error(e, f"additional_search_{i}")
-                
-                error_result = {
-                    "status": "error",
-                    "error": str(e),
-                    "citations": [],
-                    "search_time": 0,
-                    "query": query,
-                    "stage_number": i
+                    "search_time": search_time
                 }
-                additional_results.append(error_result)
+            )
+            
+            return result
+            
+        except Exception as e:
+            stage.fail(str(e))
+            agent_logger.log_error(e, f"additional_search_{i}")
+            
+            return {
+                "status": "error",
+                "error": str(e),
+                "citations": [],
+                "search_time": 0,
+                "query": query,
+                "stage_number": i
+            }
+    
+    async def _convert_search_results_async(
+        self,
+        search_results: List[Dict[str, Any]],
+        context: str
+    ) -> List[Dict[str, Any]]:
+        """결과 수가 많으면 Citation 변환을 스레드 풀에서 수행하여 다른 검색 단계 진행을 막지 않음"""
+        if self._conversion_pool is None or len(search_results) < CONVERSION_OFFLOAD_THRESHOLD:
+            return self._convert_search_results(search_results, context)
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._conversion_pool, self._convert_search_results, search_results, context
+        )
+    
+    def _convert_search_results(
+        self,
+        search_results: List[Dict[str, Any]],
+        context: str
+    ) -> List[Dict[str, Any]]:
+        """KB 검색 결과를 Citation 딕셔너리로 일괄 변환 (실패 항목은 기본 Citation으로 대체)"""
+        citation_dicts, errors = Citation.from_kb_result_batch(search_results)
+        if errors:
+            agent_logger.log_error(errors[0], f"{context} ({len(errors)}/{len(search_results)} failed)")
+        
+        citations = []
+        converted = []
+        for result, citation_dict in zip(search_results, citation_dicts):
+            if citation_dict is None:
+                # 기본 Citation 생성
+                citation_dict = self._create_basic_citation(result)
+                if citation_dict:
+                    citations.append(citation_dict)
+            else:
+                converted.append(citation_dict)
+                citations.append(citation_dict)
         
-        return additional_results
+        # 정상 변환된 Citation의 지문은 한 번에 계산
+        self._annotate_citations(converted)
+        return citations
     
     def _create_basic_citation(self, kb_result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """기본 Citation 생성 (fallback)"""
@@ -374,7 +970,6 @@ class MultiStageSearchExecutor:
             
             # 기본 정보 추출
             document_uri = ""
-            document_title = "Unknown Document"
             
             # S3 URI 추출
             if location and 's3Location' in location:
@@ -383,15 +978,7 @@ class MultiStageSearchExecutor:
                 document_uri = metadata['x-amz-bedrock-kb-source-uri']
             
             # 파일명 추출
-            if document_uri and document_uri.startswith('s3://'):
-                filename = document_uri.split('/')[-1]
-                if filename and '.' in filename:
-                    try:
-                        from urllib.parse import unquote
-                        filename = unquote(filename)
-                    except:
-                        pass
-                    document_title = filename
+            document_title = s3_document_title(document_uri)
             
             # 페이지 번호
             page_number = metadata.get('x-amz-bedrock-kb-document-page-number')
@@ -401,8 +988,8 @@ class MultiStageSearchExecutor:
                 except (ValueError, TypeError):
                     page_number = None
             
-            return {
-                "id": hashlib.md5(f"{document_uri}:{content.get('text', '')[:100]}".encode()).hexdigest()[:12],
+            return self._annotate_citation({
+                "id": make_citation_id(document_uri, content.get('text', '')),
                 "document_uri": document_uri,
                 "document_title": document_title,
                 "uri": document_uri,
@@ -411,237 +998,197 @@ class MultiStageSearchExecutor:
                 "confidence": kb_result.get('score', 0.0),
                 "relevance": kb_result.get('score', 0.0),
                 "page_number": page_number,
-                "metadata": metadata,
+                "metadata": {key: metadata[key] for key in BASIC_CITATION_METADATA_KEYS if key in metadata},
                 "location": location if location else {"s3Location": {"uri": document_uri}} if document_uri else {}
-            }
-            
+            })
+
         except Exception as e:
             agent_logger.log_error(e, "create_basic_citation")
             return None
+
+    def _annotate_citation(self, citation: Dict[str, Any]) -> Dict[str, Any]:
+        """단일 Citation에 중복 판정/우선순위 계산용 파생 값 저장"""
+        return self._annotate_citations([citation])[0]
+    
+    def _annotate_citations(self, citations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        중복 판정/우선순위 계산용 파생 값을 Citation에 1회 계산해 저장
+        
+        - uri: uri/document_uri 중 하나로 정규화된 문서 URI (중복 판정 시 단일 조회)
+        - _preview_lc: 소문자 preview
+        - _tokens: preview 처음 200자의 단어 목록
+        - _exact_fp: 정규화된 _tokens의 정확 일치 지문
+        - _fp: _tokens 기반 SimHash 지문 (목록 단위로 일괄 계산)
+        """
+        for citation in citations:
+            citation["uri"] = citation.get("uri") or citation.get("document_uri") or ""
+            preview_lc = citation.get("preview", "").lower()
+            tokens = tuple(preview_lc[:200].split())
+            citation["_preview_lc"] = preview_lc
+            citation["_tokens"] = tokens
+            citation["_exact_fp"] = _exact_fingerprint(tokens)
+        
+        fingerprints = _simhash64_batch([citation["_tokens"] for citation in citations])
+        for citation, fingerprint in zip(citations, fingerprints):
+            citation["_fp"] = fingerprint
+        return citations
     
-    def _integrate_search_results(
+    def _strip_internal_fields(self, citation: Dict[str, Any]) -> Dict[str, Any]:
+        """내부 계산용(_ 접두사) 필드를 제외한 Citation 반환"""
+        return {key: value for key, value in citation.items() if not key.startswith("_")}
+    
+    def _public_stage_result(self, stage_result: Dict[str, Any]) -> Dict[str, Any]:
+        """단계 결과의 Citation을 내부 계산용 필드를 뺀 복사본으로 바꾼 결과 반환"""
+        return {
+            **stage_result,
+            "citations": [self._strip_internal_fields(citation) for citation in stage_result.get("citations", [])]
+        }
+    
+    def _remove_internal_fields(self, citations: List[Dict[str, Any]]):
+        """Citation에서 내부 계산용 필드를 제자리에서 제거 (검색 실행이 끝난 뒤에만 호출)"""
+        for citation in citations:
+            for key in _INTERNAL_CITATION_FIELDS:
+                citation.pop(key, None)
+
+    def _add_additional_stage(
         self,
-        primary_results: Dict[str, Any],
-        additional_results: List[Dict[str, Any]],
-        analysis_result: Dict[str, Any]
+        deduplicator: _CitationDeduplicator,
+        additional_result: Dict[str, Any],
+        stage_number: int
+    ):
+        """추가 검색 결과 하나를 통합 중복 제거에 반영 (stage_number는 1부터)"""
+        if additional_result.get("status") == "success":
+            deduplicator.add_stage(
+                additional_result.get("citations", []),
+                f"additional_{stage_number}",
+                0.8 - ((stage_number - 1) * 0.1)  # 순서에 따라 우선순위 감소
+            )
+    
+    def _build_integrated_result(
+        self,
+        deduplicator: _CitationDeduplicator,
+        top_k: Optional[int] = None
     ) -> Dict[str, Any]:
-        """검색 결과 통합 및 중복 제거"""
+        """중복 제거가 끝난 Citation을 의도 기반으로 정렬(1회)하여 통합 결과 구성"""
         
-        try:
-            # 모든 Citation 수집
-            all_citations = []
-            
-            # 1차 검색 결과 추가 (우선순위 높음)
-            primary_citations = primary_results.get("citations", [])
-            for citation in primary_citations:
-                citation["source_stage"] = "primary"
-                citation["priority_score"] = 1.0
-                all_citations.append(citation)
-            
-            # 추가 검색 결과 추가
-            for i, additional_result in enumerate(additional_results):
-                if additional_result.get("status") == "success":
-                    additional_citations = additional_result.get("citations", [])
-                    for citation in additional_citations:
-                        citation["source_stage"] = f"additional_{i+1}"
-                        citation["priority_score"] = 0.8 - (i * 0.1)  # 순서에 따라 우선순위 감소
-                        all_citations.append(citation)
-            
-            # 중복 제거
-            deduplicated_citations = self._deduplicate_citations(all_citations)
-            
-            # 의도 기반 우선순위 정렬
-            prioritized_citations = self._prioritize_citations_by_intent(
-                deduplicated_citations, 
-                analysis_result
-            )
-            
-            # 최종 결과 구성
-            integrated_result = {
-                "status": "success",
-                "citations": prioritized_citations,
-                "total_citations": len(prioritized_citations),
-                "deduplication_stats": {
-                    "original_count": len(all_citations),
-                    "deduplicated_count": len(deduplicated_citations),
-                    "final_count": len(prioritized_citations),
-                    "deduplication_ratio": round(
-                        (len(all_citations) - len(deduplicated_citations)) / max(len(all_citations), 1) * 100, 1
-                    )
-                }
-            }
-            
-            return integrated_result
-            
-        except Exception as e:
-            agent_logger.log_error(e, "search_result_integration")
-            return {
-                "status": "error",
-                "error": str(e),
-                "citations": primary_results.get("citations", [])
+        deduplicated_citations = deduplicator.kept
+        prioritized_citations = self._rank_citations(deduplicated_citations, top_k=top_k)
+        original_count = deduplicator.seen_count
+        
+        return {
+            "status": "success",
+            "citations": prioritized_citations,
+            "total_citations": len(prioritized_citations),
+            "deduplication_stats": {
+                "original_count": original_count,
+                "deduplicated_count": len(deduplicated_citations),
+                "final_count": len(prioritized_citations),
+                "deduplication_ratio": round(
+                    (original_count - len(deduplicated_citations)) / max(original_count, 1) * 100, 1
+                )
             }
+        }
+    
+    def _build_duplicate_index(self, existing_citations: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """기존 Citation 목록의 중복 판정용 인덱스 (ID/URI 집합 + SimHash LSH) 구성"""
+        fp_index = _SimHashIndex()
+        ids = set()
+        uris = set()
+        exact_fps = set()
+        for existing in existing_citations:
+            if existing.get("id"):
+                ids.add(existing["id"])
+            existing_uri = existing["uri"]
+            if existing_uri:
+                uris.add(existing_uri)
+            if existing.get("_exact_fp"):
+                exact_fps.add(existing["_exact_fp"])
+            fp_index.add(existing.get("_fp", 0), len(existing.get("_tokens", ())))
+        return {"ids": ids, "uris": uris, "exact_fps": exact_fps, "fps": fp_index}
     
     def _is_duplicate_citation(
         self, 
         citation: Dict[str, Any], 
-        existing_citations: List[Dict[str, Any]]
+        duplicate_index: Dict[str, Any]
     ) -> bool:
-        """Citation 중복 여부 확인"""
+        """
+        Citation 중복 여부 확인 (_build_duplicate_index로 만든 인덱스 기준)
         
-        citation_id = citation.get("id", "")
-        citation_uri = citation.get("uri", citation.get("document_uri", ""))
-        citation_text = citation.get("preview", "")[:200]  # 처음 200자만 비교
+        _CitationDeduplicator와 같은 규칙: ID/URI로 판정하고, preview 기반 판정은 URI가 없는 Citation에만 적용
+        """
         
-        for existing in existing_citations:
-            # 1. ID 기반 중복 확인
-            if citation_id and citation_id == existing.get("id", ""):
-                return True
-            
-            # 2. URI 기반 중복 확인
-            existing_uri = existing.get("uri", existing.get("document_uri", ""))
-            if citation_uri and citation_uri == existing_uri:
-                return True
-            
-            # 3. 텍스트 유사도 기반 중복 확인 (간단한 방식)
-            existing_text = existing.get("preview", "")[:200]
-            if citation_text and existing_text:
-                similarity = self._calculate_text_similarity(citation_text, existing_text)
-                if similarity > 0.9:  # 90% 이상 유사하면 중복으로 판단
-                    return True
+        # 1. ID 기반 중복 확인
+        citation_id = citation.get("id", "")
+        if citation_id and citation_id in duplicate_index["ids"]:
+            return True
         
-        return False
-    
-    def _deduplicate_citations(self, citations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Citation 중복 제거"""
+        # 2. URI 기반 중복 확인 (URI가 있으면 통합 중복 제거와 같이 URI 기준으로만 판정)
+        citation_uri = citation["uri"]
+        if citation_uri:
+            return citation_uri in duplicate_index["uris"]
         
-        deduplicated = []
-        seen_ids = set()
-        seen_uris = set()
+        # 3. URI가 없는 경우에만 정규화된 preview 정확 일치 확인 (공백/대소문자 차이만 있는 경우)
+        exact_fp = citation.get("_exact_fp", 0)
+        if exact_fp and exact_fp in duplicate_index["exact_fps"]:
+            return True
         
-        # 우선순위 순으로 정렬 (priority_score 높은 순)
-        sorted_citations = sorted(
-            citations, 
-            key=lambda x: x.get("priority_score", 0), 
-            reverse=True
+        # 4. SimHash 지문 기반 근사 중복 확인 (preview 처음 200자)
+        return duplicate_index["fps"].has_near_duplicate(
+            citation.get("_fp", 0), len(citation.get("_tokens", ()))
         )
-        
-        for citation in sorted_citations:
-            citation_id = citation.get("id", "")
-            citation_uri = citation.get("uri", citation.get("document_uri", ""))
-            
-            # ID 기반 중복 확인
-            if citation_id and citation_id in seen_ids:
-                continue
-            
-            # URI 기반 중복 확인
-            if citation_uri and citation_uri in seen_uris:
-                continue
-            
-            # 텍스트 기반 중복 확인
-            is_duplicate = False
-            citation_text = citation.get("preview", "")[:200]
-            
-            for existing in deduplicated:
-                existing_text = existing.get("preview", "")[:200]
-                if citation_text and existing_text:
-                    similarity = self._calculate_text_similarity(citation_text, existing_text)
-                    if similarity > 0.9:
-                        is_duplicate = True
-                        break
-            
-            if not is_duplicate:
-                deduplicated.append(citation)
-                if citation_id:
-                    seen_ids.add(citation_id)
-                if citation_uri:
-                    seen_uris.add(citation_uri)
-        
-        return deduplicated
     
-    def _prioritize_citations_by_intent(
-        self, 
-        citations: List[Dict[str, Any]], 
+    def _build_intent_scorer(
+        self,
         analysis_result: Dict[str, Any]
-    ) -> List[Dict[str, Any]]:
-        """의도 기반 Citation 우선순위 정렬"""
+    ) -> Callable[[Dict[str, Any]], float]:
+        """의도 기반 final_score 계산 함수 생성 (priority_score + 키워드/엔티티 매칭 점수)"""
         
         primary_intent = analysis_result.get("primary_intent", "")
-        key_entities = analysis_result.get("key_entities", [])
+        intent_keywords = INTENT_KEYWORDS.get(primary_intent, ())
+        # 엔티티는 한 번만 소문자 변환
+        entity_terms = [entity.lower() for entity in analysis_result.get("key_entities", [])]
         
-        # 각 Citation에 의도 기반 점수 부여
-        for citation in citations:
-            intent_score = 0.0
-            preview_text = citation.get("preview", "").lower()
-            
-            # 1. 의도별 키워드 매칭
-            intent_keywords = {
-                "절차_문의": ["절차", "단계", "프로세스", "방법", "순서"],
-                "규정_확인": ["규정", "기준", "법령", "조항", "요구사항"],
-                "기술_질문": ["기술", "방법", "해결책", "구현", "적용"],
-                "비교_분석": ["비교", "차이점", "장단점", "선택", "기준"],
-                "문제_해결": ["해결", "대응", "조치", "방안", "처리"]
-            }
-            
-            if primary_intent in intent_keywords:
-                for keyword in intent_keywords[primary_intent]:
-                    if keyword in preview_text:
-                        intent_score += 0.2
+        # 의도 키워드와 엔티티가 모두 없으면 (의도 미지정 등) preview 스캔 없이 기존 점수 사용
+        if not intent_keywords and not entity_terms:
+            return lambda citation: citation.get("priority_score", 0.5)
+        
+        # 키워드와 엔티티를 하나의 매처로 묶어 preview당 한 번만 스캔
+        match_terms = _build_intent_matcher(intent_keywords, entity_terms)
+        
+        def score(citation: Dict[str, Any]) -> float:
+            preview_text = citation.get("_preview_lc")
+            if preview_text is None:
+                preview_text = citation.get("preview", "").lower()
             
-            # 2. 핵심 엔티티 매칭
-            for entity in key_entities:
-                if entity.lower() in preview_text:
-                    intent_score += 0.3
+            # 1. 의도별 키워드 매칭 / 2. 핵심 엔티티 매칭
+            keyword_hits, entity_hits = match_terms(preview_text)
+            intent_score = 0.2 * keyword_hits
+            intent_score += 0.3 * entity_hits
             
             # 3. 기존 우선순위 점수와 결합
-            original_score = citation.get("priority_score", 0.5)
-            citation["final_score"] = original_score + intent_score
-        
-        # 최종 점수 기준으로 정렬
-        sorted_citations = sorted(
-            citations,
-            key=lambda x: (
-                x.get("final_score", 0),
-                x.get("confidence", 0),
-                -x.get("index", 999)  # 인덱스는 낮을수록 좋음
-            ),
-            reverse=True
-        )
-        
-        return sorted_citations
-    
-    def _calculate_text_similarity(self, text1: str, text2: str) -> float:
-        """간단한 텍스트 유사도 계산 (Jaccard 유사도)"""
-        if not text1 or not text2:
-            return 0.0
-        
-        # 단어 단위로 분할
-        words1 = set(text1.lower().split())
-        words2 = set(text2.lower().split())
+            return citation.get("priority_score", 0.5) + intent_score
         
-        # Jaccard 유사도 계산
-        intersection = len(words1.intersection(words2))
-        union = len(words1.union(words2))
-        
-        return intersection / union if union > 0 else 0.0
+        return score
     
-    def _calculate_deduplication_ratio(
+    def _rank_citations(
         self,
-        primary_results: Dict[str, Any],
-        additional_results: List[Dict[str, Any]],
-        integrated_results: Dict[str, Any]
-    ) -> float:
-        """중복 제거 비율 계산"""
-        
-        total_original = len(primary_results.get("citations", []))
-        for result in additional_results:
-            total_original += len(result.get("citations", []))
+        citations: List[Dict[str, Any]],
+        top_k: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """final_score 기준 Citation 정렬 (top_k 지정 시 상위 top_k개만 반환)"""
         
-        final_count = len(integrated_results.get("citations", []))
+        # 점수 열만 배열로 모아 numpy로 한 번에 정렬
+        order = _rank_order(
+            np.array([c.get("final_score", 0) for c in citations], dtype=float),
+            np.array([c.get("confidence", 0) for c in citations], dtype=float),
+            np.array([c.get("index", 999) for c in citations], dtype=float)
+        )
         
-        if total_original == 0:
-            return 0.0
+        # 상위 일부만 사용하는 경우 앞부분만 dict로 되돌림
+        if top_k is not None and top_k < len(order):
+            order = order[:top_k]
         
-        return round((total_original - final_count) / total_original * 100, 1)
+        return [citations[i] for i in order]
     
     def _save_execution_history(
         self, 
@@ -654,17 +1201,13 @@ class MultiStageSearchExecutor:
                 "timestamp": datetime.now().isoformat(),
                 "primary_intent": analysis_result.get("primary_intent", "unknown"),
                 "requires_additional_search": analysis_result.get("requires_additional_search", False),
-                "search_stages": len(self.search_stages),
+                "search_stages": len(final_result.get("search_stages", [])),
                 "final_citation_count": len(final_result.get("citations", [])),
                 "total_search_time": final_result.get("metadata", {}).get("total_search_time", 0),
                 "deduplication_ratio": final_result.get("metadata", {}).get("deduplication_ratio", 0)
             }
             
             self.execution_history.append(history_entry)
-            
-            # 히스토리 크기 제한 (최근 50개만 유지)
-            if len(self.execution_history) > 50:
-                self.execution_history = self.execution_history[-50:]
                 
         except Exception as e:
             agent_logger.log_error(e, "save_execution_history")
@@ -675,7 +1218,7 @@ class MultiStageSearchExecutor:
             "status": "error",
             "error": error_message,
             "citations": [],
-            "search_stages": [stage.to_dict() for stage in self.search_stages],
+            "search_stages": [],
             "metadata": {
                 "total_search_time": 0,
                 "primary_result_count": 0,
@@ -690,9 +1233,20 @@ class MultiStageSearchExecutor:
             return {"total_executions": 0}
         
         total_executions = len(self.execution_history)
-        avg_search_time = sum(h.get("total_search_time", 0) for h in self.execution_history) / total_executions
-        avg_citation_count = sum(h.get("final_citation_count", 0) for h in self.execution_history) / total_executions
-        additional_search_rate = sum(1 for h in self.execution_history if h.get("requires_additional_search", False)) / total_executions * 100
+        
+        # 히스토리 한 번 순회로 검색 시간/Citation 수/추가 검색 횟수 합계 집계
+        total_search_time = 0
+        total_citation_count = 0
+        additional_search_count = 0
+        for h in self.execution_history:
+            total_search_time += h.get("total_search_time", 0)
+            total_citation_count += h.get("final_citation_count", 0)
+            if h.get("requires_additional_search", False):
+                additional_search_count += 1
+        
+        avg_search_time = total_search_time / total_executions
+        avg_citation_count = total_citation_count / total_executions
+        additional_search_rate = additional_search_count / total_executions * 100
         
         return {
             "total_executions": total_executions,
@@ -703,5 +1257,16 @@ class MultiStageSearchExecutor:
         }
 
 
+def _run_coroutine_sync(coro):
+    """동기 컨텍스트에서 코루틴 실행 (이벤트 루프가 이미 실행 중이면 별도 스레드에서 실행)"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
 # 전역 인스턴스
 multi_stage_search_executor = MultiStageSearchExecutor()
@@ -4,32 +4,248 @@ Orchestration Agent
 ReAct 패턴의 Thought 단계를 담당
 """
 
+import asyncio
 import boto3
-import json
+import copy
+import hashlib
+import os
+import re
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
 
 from config.settings import settings
+from src.utils.bedrock import bedrock_runtime_config
 from src.utils.logger import agent_logger
 from src.utils.session import ChatSession, Message
+from src.utils.cache import TTLCache, SemanticCache
+from src.utils.embedding import query_embedder
+from src.utils.json_utils import json_loads
+
+
+# 기본 시스템 프롬프트
+DEFAULT_ANALYSIS_SYSTEM_PROMPT = """당신은 건설/건축 분야 전문 AI 어시스턴트입니다. 
+사용자의 질문을 분석하여 Knowledge Base 검색에 최적화된 검색어를 생성하는 것이 주요 역할입니다.
+실제 현장 상황을 법적 근거와 기술 기준에 연결하여 정확한 정보를 찾을 수 있도록 도와주세요."""
+
+# 쿼리 분석 지시문 (응답 형식 + 검색어 최적화 가이드라인)
+# 프롬프트 캐시가 적중하려면 호출마다 바이트 단위로 같아야 하므로 쿼리/컨텍스트/시각 등 동적 내용은 넣지 않음
+ANALYSIS_INSTRUCTIONS = """=== 사용자 쿼리 분석 및 KB 검색 최적화 ===
+
+사용자 질문을 분석하여 Knowledge Base에서 정확한 정보를 찾을 수 있도록 최적화된 검색 전략을 수립해주세요.
+
+다음 JSON 형태로 응답해주세요:
+
+{
+    "query_analysis": {
+        "user_intent": "사용자가 알고 싶어하는 핵심 내용",
+        "context_type": "현장상황|법규문의|기술질문|절차문의",
+        "complexity": "단순|보통|복잡",
+        "requires_legal_basis": true/false
+    },
+    "search_strategy": {
+        "approach": "단일검색|다중검색|단계적검색",
+        "primary_query": "가장 중요한 검색어 (KB 검색에 최적화)",
+        "secondary_queries": [
+            "보조 검색어 1",
+            "보조 검색어 2"
+        ],
+        "reasoning": "검색 전략 선택 이유"
+    },
+    "domain_context": {
+        "construction_category": "구조|시공|품질|안전|관리|설계|기타",
+        "legal_framework": "건설기술진흥법|건축법|산업안전보건법|기타|해당없음",
+        "technical_area": "콘크리트|철근|거푸집|품질관리|안전관리|기타",
+        "priority_keywords": ["핵심키워드1", "핵심키워드2", "핵심키워드3"]
+    }
+}
+
+=== 검색어 최적화 가이드라인 ===
+
+**현장 상황 → 법적/기술적 근거 연결**
+- 사용자의 현장 상황을 이해하고, 관련 법규나 기술 기준으로 연결
+- 예시: "철거공사 품질관리" → "건설 현장 철거 공사 품질관리 계획 품질시험 계획 수립 의무"
+
+**구체적이고 포괄적인 검색어 생성**
+- 너무 구체적이면 결과가 없고, 너무 일반적이면 부정확
+- 법조문, 시행령, 기술기준 등 다양한 관점에서 검색
+- 동의어와 관련 용어를 포함하여 검색 범위 확장
+
+**단계적 검색 전략**
+- 복잡한 질문은 여러 단계로 나누어 검색
+- 1단계: 기본 개념 및 법적 근거
+- 2단계: 구체적 적용 기준
+- 3단계: 실무 적용 방법
+
+검색어는 Knowledge Base의 문서에서 실제로 사용될 가능성이 높은 용어로 구성해주세요."""
+
+# 키워드 추출용 불용어 / 어미 조사 패턴
+_STOP_WORDS = frozenset({
+    "을", "를", "이", "가", "은", "는", "에", "에서", "으로", "로", "와", "과", "의", "도", "만",
+    "까지", "부터", "하고", "하는", "해서", "해줘", "알려줘", "설명해줘", "하려고", "하는데"
+})
+_PARTICLE_RE = re.compile(r"(?:에서|으로|에게|을|를|이|가)$")
+
+# 분석 실패 시 기본 전략의 고정 필드
+_FALLBACK_BASE = MappingProxyType({
+    "query_type": "단일검색",
+    "complexity": "보통",
+    "search_strategy": "직접검색",
+    "reasoning": "쿼리 분석 실패로 기본 전략 적용",
+    "fallback": True
+})
+
+# 응답에서 JSON 본문 추출 (```json 코드 블록 우선, 없으면 첫 '{' ~ 마지막 '}')
+_JSON_BLOCK_RE = re.compile(
+    r"\A(?:.*?```json\s*(?P<fenced>.*?)\s*(?:```|\Z)|[^{]*(?P<bare>\{.*\}))",
+    re.DOTALL
+)
+
+# 사용자 메시지 템플릿 (cachePoint 뒤에 오는 동적 부분)
+ANALYSIS_USER_TEMPLATE = """사용자 질문: "{user_query}"
+
+위 지침에 따라 검색 전략을 JSON 형태로 응답해주세요."""
+
+
+@lru_cache(maxsize=32)
+def _analysis_system_text(system_content: str) -> str:
+    """시스템 프롬프트 + 분석 지시문 (시스템 프롬프트별로 한 번만 조합해 매 호출 동일한 문자열 사용)"""
+    return f"{system_content}\n\n{ANALYSIS_INSTRUCTIONS}"
+
+
+def _bedrock_runtime_endpoint(region: str) -> str:
+    """Bedrock Runtime 엔드포인트 URL (설정값 우선, 없으면 리전 표준 엔드포인트)"""
+    if settings.model.bedrock_runtime_endpoint_url:
+        return settings.model.bedrock_runtime_endpoint_url
+    domain = "amazonaws.com.cn" if region.startswith("cn-") else "amazonaws.com"
+    return f"https://bedrock-runtime.{region}.{domain}"
+
+
+def _copy_analysis_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    분석 결과 복사 (캐시 저장/반환용)
+    
+    분석 결과는 문자열/문자열 리스트가 대부분이므로 리스트만 얕게 복사하고,
+    그 외 중첩 구조가 있을 때만 deepcopy 사용
+    """
+    copied = {}
+    for key, value in result.items():
+        if isinstance(value, list):
+            if all(isinstance(item, str) for item in value):
+                value = list(value)
+            else:
+                value = copy.deepcopy(value)
+        elif isinstance(value, dict):
+            value = copy.deepcopy(value)
+        copied[key] = value
+    return copied
+
+
+@lru_cache(maxsize=32)
+def _analysis_system_blocks(system_text: str, prompt_cache: bool) -> Tuple[Dict[str, Any], ...]:
+    """Converse system 블록 (시스템 텍스트별로 한 번만 구성, 프롬프트 캐시 사용 시 cachePoint 추가)"""
+    if prompt_cache:
+        return ({"text": system_text}, {"cachePoint": {"type": "default"}})
+    return ({"text": system_text},)
+
+
+class _JsonObjectScanner:
+    """
+    스트리밍 텍스트에서 최상위 JSON 객체의 끝을 찾는 증분 스캐너
+    
+    문자열 리터럴 내부의 중괄호/이스케이프를 구분하며, 객체가 닫히면 해당 객체 문자열을 반환
+    """
+    
+    __slots__ = ("_parts", "_depth", "_in_string", "_escaped")
+    
+    def __init__(self):
+        self._parts: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+    
+    def feed(self, text: str) -> Optional[str]:
+        """텍스트 조각 추가 (최상위 객체가 닫히면 객체 문자열, 아니면 None)"""
+        start = 0
+        for index, char in enumerate(text):
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                    self._parts = []
+                    start = index
+                continue
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._parts.append(text[start:index + 1])
+                    return "".join(self._parts)
+        if self._depth:
+            self._parts.append(text[start:])
+        return None
 
 
 class OrchestrationAgent:
     """사용자 쿼리 분석 및 검색 전략 수립 Agent"""
     
-    def __init__(self, model_id: Optional[str] = None, region: Optional[str] = None):
+    def __init__(
+        self,
+        model_id: Optional[str] = None,
+        region: Optional[str] = None,
+        max_parallel_requests: Optional[int] = None
+    ):
         self.model_id = model_id or settings.model.primary_model_id
         self.region = region or settings.model.region
+        # 동시 Bedrock 호출 수 (HTTP 연결 풀 크기와 batch_analyze 동시 실행 수에 사용)
+        self.max_parallel_requests = max_parallel_requests or (os.cpu_count() or 1) * 5
+        self._bedrock_runtime = None  # 첫 호출 시 생성 (import 시점의 자격 증명 확인/클라이언트 생성 비용 제거)
+        # 호출마다 동일한 추론 설정 (요청마다 새로 만들지 않음)
+        self._inference_config = {
+            "maxTokens": settings.model.max_tokens,
+            "temperature": settings.model.temperature
+        }
         
-        try:
-            self.bedrock_runtime = boto3.client(
-                'bedrock-runtime',
-                region_name=self.region
-            )
-            agent_logger.log_agent_action("OrchestrationAgent", "initialized", {"model_id": self.model_id})
-        except Exception as e:
-            agent_logger.log_error(e, "orchestration_agent_init")
-            raise
+        # 분석 결과 캐시 (L1: 정확 일치, L2: 쿼리 임베딩 유사도)
+        self._analysis_cache = TTLCache(
+            max_entries=settings.model.analysis_cache_max_entries,
+            ttl_seconds=settings.model.analysis_cache_ttl_seconds
+        )
+        self._semantic_cache = SemanticCache(
+            threshold=settings.model.semantic_cache_threshold,
+            max_entries=settings.model.analysis_cache_max_entries,
+            ttl_seconds=settings.model.analysis_cache_ttl_seconds
+        )
+        self._semantic_cache_enabled = settings.model.enable_semantic_cache
+        self._fast_path_hits = 0  # 규칙 기반 fast path로 LLM 호출을 생략한 횟수
+    
+    @property
+    def bedrock_runtime(self):
+        """Bedrock Runtime 클라이언트 (지연 생성)"""
+        if self._bedrock_runtime is None:
+            try:
+                # 엔드포인트를 직접 지정해 클라이언트 생성 시 엔드포인트 규칙 해석 생략
+                self._bedrock_runtime = boto3.client(
+                    'bedrock-runtime',
+                    region_name=self.region,
+                    endpoint_url=_bedrock_runtime_endpoint(self.region),
+                    config=bedrock_runtime_config(max_pool_connections=self.max_parallel_requests)
+                )
+                agent_logger.log_agent_action("OrchestrationAgent", "initialized", lambda: {"model_id": self.model_id})
+            except Exception as e:
+                agent_logger.log_error(e, "orchestration_agent_init")
+                raise
+        return self._bedrock_runtime
     
     def analyze_query(
         self,
@@ -52,22 +268,56 @@ class OrchestrationAgent:
             agent_logger.log_agent_action(
                 "OrchestrationAgent", 
                 "analyze_query_start", 
-                {"query_length": len(user_query)}
+                lambda: {"query_length": len(user_query)}
             )
             
-            # 프롬프트 구성
-            analysis_prompt = self._build_analysis_prompt(user_query, session, system_prompt)
+            # 대화 컨텍스트 없는 짧은 키워드형 쿼리는 LLM 호출 없이 규칙 기반 전략 사용
+            context_info = self._context_text(session)
+            context_digest = self._context_digest(context_info)
+            if settings.model.enable_analysis_fast_path and not context_digest:
+                fast_path_result = self._get_fast_path_strategy(user_query)
+                if fast_path_result is not None:
+                    return fast_path_result
+            
+            # L1 캐시: 쿼리/시스템 프롬프트/대화 컨텍스트가 모두 같은 경우
+            cache_key = hashlib.blake2b(
+                f"{user_query}\x1f{system_prompt or ''}\x1f{context_digest}".encode(), digest_size=16
+            ).hexdigest()
+            cached_result = self._analysis_cache.get(cache_key)
+            if cached_result is not None:
+                return self._from_cache(cached_result, user_query, "exact")
+            
+            # L2 캐시: 같은 시스템 프롬프트에서 의미가 유사한 독립 쿼리
+            # 대화 컨텍스트가 있는 후속 질문("그럼 철근은?" 등)은 앞선 대화에 따라 의미가 달라지므로
+            # 유사도 매칭에서 제외 (컨텍스트가 매 턴 바뀌어 적중할 수 없으므로 임베딩 호출도 생략)
+            semantic_context = (system_prompt or "", context_digest)
+            query_embedding = None if context_digest else self._embed_query(user_query)
+            if query_embedding is not None:
+                cached_result = self._semantic_cache.get(query_embedding, semantic_context)
+                if cached_result is not None:
+                    self._analysis_cache.put(cache_key, cached_result)
+                    return self._from_cache(cached_result, user_query, "semantic")
+            
+            # 프롬프트 구성 (정적 시스템 프롬프트 / 동적 사용자 메시지 분리)
+            system_text, user_message = self._build_analysis_prompt(user_query, session, system_prompt, context_info)
             
             # Claude 모델 호출
-            response = self._call_claude_model(analysis_prompt)
+            response = self._call_claude_model(system_text, user_message)
             
             # 응답 파싱
             analysis_result = self._parse_analysis_response(response, user_query)
             
+            # 분석에 성공한 결과만 캐시 (호출 측에서 결과를 수정해도 캐시에 영향 없도록 복사본 저장)
+            if not analysis_result.get("fallback"):
+                cached_result = _copy_analysis_result(analysis_result)
+                self._analysis_cache.put(cache_key, cached_result)
+                if query_embedding is not None:
+                    self._semantic_cache.put(query_embedding, cached_result, semantic_context)
+            
             agent_logger.log_agent_action(
                 "OrchestrationAgent",
                 "analyze_query_complete",
-                {
+                lambda: {
                     "search_strategy": analysis_result.get("search_strategy", "unknown"),
                     "query_count": len(analysis_result.get("search_queries", []))
                 }
@@ -80,140 +330,196 @@ class OrchestrationAgent:
             # 실패 시 기본 전략 반환
             return self._get_fallback_strategy(user_query)
     
-    def _build_analysis_prompt(
+    async def analyze_query_async(
         self,
         user_query: str,
         session: Optional[ChatSession] = None,
         system_prompt: Optional[str] = None
-    ) -> str:
-        """분석용 프롬프트 구성 (sample.md 패턴 반영)"""
+    ) -> Dict[str, Any]:
+        """analyze_query의 비동기 버전 (블로킹 Bedrock 호출을 워커 스레드에서 실행)"""
+        return await asyncio.to_thread(self.analyze_query, user_query, session, system_prompt)
+    
+    async def batch_analyze(
+        self,
+        queries: List[str],
+        session: Optional[ChatSession] = None,
+        system_prompt: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        여러 쿼리를 동시에 분석 (동시 호출 수는 max_parallel_requests로 제한)
         
-        # 기본 시스템 프롬프트
-        default_system = """당신은 건설/건축 분야 전문 AI 어시스턴트입니다. 
-사용자의 질문을 분석하여 Knowledge Base 검색에 최적화된 검색어를 생성하는 것이 주요 역할입니다.
-실제 현장 상황을 법적 근거와 기술 기준에 연결하여 정확한 정보를 찾을 수 있도록 도와주세요."""
+        Returns:
+            쿼리 순서대로 분석 결과 (실패한 쿼리는 기본 전략)
+        """
+        semaphore = asyncio.Semaphore(self.max_parallel_requests)
         
-        system_content = system_prompt or default_system
+        async def analyze(query: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.analyze_query_async(query, session, system_prompt)
         
-        # 대화 컨텍스트 구성
-        context_info = ""
-        if session:
-            recent_messages = session.get_recent_context(max_messages=5)
-            if recent_messages:
-                context_info = "\n\n=== 최근 대화 컨텍스트 ===\n"
-                for msg in recent_messages[-3:]:  # 최근 3개 메시지만
-                    if msg.role != "system":
-                        context_info += f"{msg.role}: {msg.content[:100]}...\n"
+        return list(await asyncio.gather(*(analyze(query) for query in queries)))
+    
+    def _context_text(self, session: Optional[ChatSession]) -> str:
+        """프롬프트에 포함할 최근 대화 컨텍스트 (최근 3개 메시지, system 제외 / 없으면 빈 문자열)"""
+        if not session:
+            return ""
+        lines = [
+            f"{msg.role}: {msg.content[:100]}..."
+            for msg in session.get_recent_context(max_messages=3)
+            if msg.role != "system"
+        ]
+        if not lines:
+            return ""
+        return "=== 최근 대화 컨텍스트 ===\n" + "\n".join(lines) + "\n"
+    
+    def _context_digest(self, context_text: str) -> str:
+        """프롬프트에 들어가는 대화 컨텍스트의 지문 (컨텍스트가 다르면 캐시를 공유하지 않음)"""
+        if not context_text:
+            return ""
+        return hashlib.blake2b(context_text.encode(), digest_size=16).hexdigest()
+    
+    def _embed_query(self, user_query: str) -> Optional[List[float]]:
+        """시맨틱 캐시용 쿼리 임베딩 (임베딩 호출이 실패했으면 None - 시맨틱 캐시 미사용)"""
+        if not self._semantic_cache_enabled:
+            return None
+        return query_embedder.embed(user_query)
+    
+    def _from_cache(self, cached_result: Dict[str, Any], user_query: str, cache_type: str) -> Dict[str, Any]:
+        """캐시된 분석 결과를 현재 쿼리용 복사본으로 반환"""
+        agent_logger.log_agent_action(
+            "OrchestrationAgent",
+            "analyze_query_cache_hit",
+            lambda: {"cache_type": cache_type, "query_length": len(user_query)}
+        )
+        result = _copy_analysis_result(cached_result)
+        result["original_query"] = user_query
+        result["cache_hit"] = cache_type
+        return result
+    
+    def _build_analysis_prompt(
+        self,
+        user_query: str,
+        session: Optional[ChatSession] = None,
+        system_prompt: Optional[str] = None,
+        context_info: Optional[str] = None
+    ) -> Tuple[str, str]:
+        """
+        분석용 프롬프트 구성 (sample.md 패턴 반영)
         
-        prompt = f"""{system_content}
-
-{context_info}
-
-=== 사용자 쿼리 분석 및 KB 검색 최적화 ===
-
-사용자 질문: "{user_query}"
-
-위 질문을 분석하여 Knowledge Base에서 정확한 정보를 찾을 수 있도록 최적화된 검색 전략을 수립해주세요.
-
-다음 JSON 형태로 응답해주세요:
-
-{{
-    "query_analysis": {{
-        "user_intent": "사용자가 알고 싶어하는 핵심 내용",
-        "context_type": "현장상황|법규문의|기술질문|절차문의",
-        "complexity": "단순|보통|복잡",
-        "requires_legal_basis": true/false
-    }},
-    "search_strategy": {{
-        "approach": "단일검색|다중검색|단계적검색",
-        "primary_query": "가장 중요한 검색어 (KB 검색에 최적화)",
-        "secondary_queries": [
-            "보조 검색어 1",
-            "보조 검색어 2"
-        ],
-        "reasoning": "검색 전략 선택 이유"
-    }},
-    "domain_context": {{
-        "construction_category": "구조|시공|품질|안전|관리|설계|기타",
-        "legal_framework": "건설기술진흥법|건축법|산업안전보건법|기타|해당없음",
-        "technical_area": "콘크리트|철근|거푸집|품질관리|안전관리|기타",
-        "priority_keywords": ["핵심키워드1", "핵심키워드2", "핵심키워드3"]
-    }}
-}}
-
-=== 검색어 최적화 가이드라인 ===
-
-**현장 상황 → 법적/기술적 근거 연결**
-- 사용자의 현장 상황을 이해하고, 관련 법규나 기술 기준으로 연결
-- 예시: "철거공사 품질관리" → "건설 현장 철거 공사 품질관리 계획 품질시험 계획 수립 의무"
-
-**구체적이고 포괄적인 검색어 생성**
-- 너무 구체적이면 결과가 없고, 너무 일반적이면 부정확
-- 법조문, 시행령, 기술기준 등 다양한 관점에서 검색
-- 동의어와 관련 용어를 포함하여 검색 범위 확장
-
-**단계적 검색 전략**
-- 복잡한 질문은 여러 단계로 나누어 검색
-- 1단계: 기본 개념 및 법적 근거
-- 2단계: 구체적 적용 기준
-- 3단계: 실무 적용 방법
-
-검색어는 Knowledge Base의 문서에서 실제로 사용될 가능성이 높은 용어로 구성해주세요."""
+        Returns:
+            Tuple[정적 시스템 프롬프트(프롬프트 캐시 대상), 동적 사용자 메시지(대화 컨텍스트 + 질문)]
+        """
+        
+        system_content = system_prompt or DEFAULT_ANALYSIS_SYSTEM_PROMPT
+        
+        # 대화 컨텍스트 구성 (cachePoint 뒤의 사용자 메시지에만 포함)
+        if context_info is None:
+            context_info = self._context_text(session)
         
-        return prompt
+        user_message = ANALYSIS_USER_TEMPLATE.format(user_query=user_query)
+        if context_info:
+            user_message = f"{context_info}\n{user_message}"
+        
+        return _analysis_system_text(system_content), user_message
     
-    def _call_claude_model(self, prompt: str) -> str:
-        """Claude 모델 호출"""
+    def _call_claude_model(self, system_text: str, user_message: str) -> str:
+        """
+        Claude 모델 호출 (Converse API)
+        
+        정적 시스템 프롬프트 뒤에 cachePoint를 두어 반복 호출 시 접두부를 프롬프트 캐시에서 재사용하며,
+        스트리밍이 켜져 있으면 응답의 JSON 객체가 닫히는 즉시 수신을 중단
+        """
         try:
-            request_body = {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": settings.model.max_tokens,
-                "temperature": settings.model.temperature,
+            request = {
+                "modelId": self.model_id,
+                "system": _analysis_system_blocks(system_text, settings.model.enable_prompt_cache),
                 "messages": [
                     {
                         "role": "user",
-                        "content": prompt
+                        "content": [{"text": user_message}]
                     }
-                ]
+                ],
+                "inferenceConfig": self._inference_config
             }
             
-            response = self.bedrock_runtime.invoke_model(
-                modelId=self.model_id,
-                body=json.dumps(request_body),
-                contentType='application/json',
-                accept='application/json'
+            if settings.model.enable_streaming_analysis:
+                try:
+                    return self._stream_claude_model(request)
+                except Exception as e:
+                    # 스트리밍 실패 시 일반 호출로 재시도
+                    agent_logger.log_error(e, "orchestration_claude_stream")
+            
+            response = self.bedrock_runtime.converse(**request)
+            
+            agent_logger.log_agent_action(
+                "OrchestrationAgent",
+                "claude_usage",
+                lambda: response.get("usage", {})
             )
             
-            response_body = json.loads(response['body'].read())
-            return response_body['content'][0]['text']
+            return response["output"]["message"]["content"][0]["text"]
             
         except Exception as e:
             agent_logger.log_error(e, "orchestration_claude_call")
             raise
     
+    def _stream_claude_model(self, request: Dict[str, Any]) -> str:
+        """
+        Claude 모델 스트리밍 호출 (ConverseStream API)
+        
+        최상위 JSON 객체가 완성되어 파싱 가능한 시점에 스트림을 닫고 해당 JSON 문자열만 반환
+        (JSON 뒤에 이어지는 설명 문장 생성을 기다리지 않음)
+        """
+        response = self.bedrock_runtime.converse_stream(**request)
+        stream = response["stream"]
+        scanner = _JsonObjectScanner()
+        chunks: List[str] = []
+        
+        try:
+            for event in stream:
+                delta = event.get("contentBlockDelta")
+                if delta is not None:
+                    text = delta["delta"].get("text", "")
+                    chunks.append(text)
+                    json_str = scanner.feed(text) if scanner is not None else None
+                    if json_str is not None:
+                        try:
+                            json_loads(json_str)
+                        except ValueError:
+                            # 객체는 닫혔지만 유효한 JSON이 아님 → 전체 응답을 받아 기존 방식으로 파싱
+                            scanner = None
+                            continue
+                        agent_logger.log_agent_action(
+                            "OrchestrationAgent",
+                            "claude_stream_early_stop",
+                            lambda: {"received_chars": sum(len(chunk) for chunk in chunks)}
+                        )
+                        return json_str
+                elif "metadata" in event:
+                    agent_logger.log_agent_action(
+                        "OrchestrationAgent",
+                        "claude_usage",
+                        lambda: event["metadata"].get("usage", {})
+                    )
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+        
+        return "".join(chunks)
+    
     def _parse_analysis_response(self, response: str, original_query: str) -> Dict[str, Any]:
         """분석 응답 파싱"""
         try:
-            # JSON 추출 시도
-            response_clean = response.strip()
-            
-            # JSON 블록 찾기
-            if "```json" in response_clean:
-                start = response_clean.find("```json") + 7
-                end = response_clean.find("```", start)
-                json_str = response_clean[start:end].strip()
-            elif response_clean.startswith("{") and response_clean.endswith("}"):
-                json_str = response_clean
-            else:
-                # JSON 형태 찾기 시도
-                start = response_clean.find("{")
-                end = response_clean.rfind("}") + 1
-                if start >= 0 and end > start:
-                    json_str = response_clean[start:end]
-                else:
-                    raise ValueError("JSON format not found")
+            # JSON 블록 찾기 (```json 코드 블록 우선, 없으면 첫 '{' ~ 마지막 '}')
+            match = _JSON_BLOCK_RE.match(response)
+            if match is None:
+                raise ValueError("JSON format not found")
+            json_str = match.group("fenced")
+            if json_str is None:
+                json_str = match.group("bare")
             
-            parsed_result = json.loads(json_str)
+            parsed_result = json_loads(json_str)
             
             # 필수 필드 검증 및 기본값 설정
             result = {
@@ -240,17 +546,47 @@ class OrchestrationAgent:
     
     def _get_fallback_strategy(self, user_query: str) -> Dict[str, Any]:
         """분석 실패 시 기본 전략 반환"""
+        # 리스트 필드는 호출 측 수정이 다른 결과에 번지지 않도록 매번 새로 생성
+        return {
+            **_FALLBACK_BASE,
+            "search_queries": [user_query],
+            "expected_content_types": ["텍스트"],
+            "priority_keywords": [],
+            "original_query": user_query,
+            "analysis_timestamp": datetime.now().isoformat()
+        }
+    
+    def _get_fast_path_strategy(self, user_query: str) -> Optional[Dict[str, Any]]:
+        """
+        단순 키워드형 쿼리에 대한 규칙 기반 전략 ("콘크리트 강도" 등)
+        
+        쿼리가 짧고 핵심 키워드가 2개 이하면 원본 쿼리로 직접 검색하는 전략을 바로 반환하고,
+        그 외에는 None 반환 (LLM 분석 진행)
+        """
+        if len(user_query) >= settings.model.fast_path_max_query_length:
+            return None
+        keywords = self._extract_keywords(user_query)
+        if not keywords or len(keywords) > 2:
+            return None
+        
+        self._fast_path_hits += 1
+        agent_logger.log_agent_action(
+            "OrchestrationAgent",
+            "analyze_query_fast_path",
+            lambda: {"keywords": keywords, "fast_path_hits": self._fast_path_hits}
+        )
+        
         return {
             "query_type": "단일검색",
-            "complexity": "보통",
+            "complexity": "단순",
             "search_strategy": "직접검색",
             "search_queries": [user_query],
-            "reasoning": "쿼리 분석 실패로 기본 전략 적용",
+            "reasoning": "단순 키워드 쿼리로 규칙 기반 전략 적용",
             "expected_content_types": ["텍스트"],
-            "priority_keywords": [],
+            "priority_keywords": keywords,
             "original_query": user_query,
             "analysis_timestamp": datetime.now().isoformat(),
-            "fallback": True
+            "fast_path": True
         }
     
     def refine_search_queries(
@@ -272,51 +608,44 @@ class OrchestrationAgent:
             if not previous_results:
                 return analysis_result["search_queries"]
             
-            # 이전 결과 분석
-            total_results = sum(len(result.get("citations", [])) for result in previous_results)
+            # 이전 결과 분석 (결과가 충분하다고 판단되는 3개에 도달하면 집계 중단)
+            total_results = 0
+            for result in previous_results:
+                total_results += len(result.get("citations", ()))
+                if total_results >= 3:
+                    break
+            original_queries = analysis_result["search_queries"]
             
             if total_results == 0:
-                # 결과가 없으면 더 일반적인 쿼리로 변경
-                original_queries = analysis_result["search_queries"]
+                # 결과가 없으면 더 일반적인 쿼리로 변경 (키워드 추출 및 단순화)
+                action = "refine_queries_no_results"
                 refined_queries = []
-                
                 for query in original_queries:
-                    # 키워드 추출 및 단순화
                     keywords = self._extract_keywords(query)
-                    if len(keywords) > 2:
-                        refined_queries.append(" ".join(keywords[:2]))
-                    else:
-                        refined_queries.append(query)
-                
-                agent_logger.log_agent_action(
-                    "OrchestrationAgent",
-                    "refine_queries_no_results",
-                    {"original": len(original_queries), "refined": len(refined_queries)}
-                )
-                
-                return refined_queries
+                    refined_queries.append(" ".join(keywords[:2]) if len(keywords) > 2 else query)
             
             elif total_results < 3:
-                # 결과가 적으면 관련 키워드 추가
-                refined_queries = analysis_result["search_queries"].copy()
-                
-                # 우선순위 키워드 기반 추가 쿼리 생성
-                priority_keywords = analysis_result.get("priority_keywords", [])
-                if priority_keywords:
-                    for keyword in priority_keywords[:2]:
-                        refined_queries.append(f"{keyword} 관련 기준")
-                
-                agent_logger.log_agent_action(
-                    "OrchestrationAgent",
-                    "refine_queries_few_results",
-                    {"total_results": total_results, "added_queries": len(refined_queries) - len(analysis_result["search_queries"])}
-                )
-                
-                return refined_queries
+                # 결과가 적으면 우선순위 키워드 기반 추가 쿼리 생성
+                action = "refine_queries_few_results"
+                refined_queries = original_queries + [
+                    f"{keyword} 관련 기준" for keyword in analysis_result.get("priority_keywords", [])[:2]
+                ]
             
             else:
                 # 충분한 결과가 있으면 원본 쿼리 유지
-                return analysis_result["search_queries"]
+                return original_queries
+            
+            agent_logger.log_agent_action(
+                "OrchestrationAgent",
+                action,
+                lambda: {
+                    "total_results": total_results,
+                    "original": len(original_queries),
+                    "refined": len(refined_queries)
+                }
+            )
+            
+            return refined_queries
                 
         except Exception as e:
             agent_logger.log_error(e, "orchestration_refine_queries")
@@ -324,29 +653,12 @@ class OrchestrationAgent:
     
     def _extract_keywords(self, query: str) -> List[str]:
         """쿼리에서 핵심 키워드 추출 (간단한 구현)"""
-        # 불용어 제거 및 키워드 추출
-        stop_words = {"을", "를", "이", "가", "은", "는", "에", "에서", "으로", "로", "와", "과", "의", "도", "만", "까지", "부터", "하고", "하는", "해서", "해줘", "알려줘", "설명해줘", "하려고", "하는데"}
-        
-        words = query.split()
-        keywords = []
-        
-        for word in words:
-            # 조사 제거 처리
-            clean_word = word
-            if word.endswith("을") or word.endswith("를"):
-                clean_word = word[:-1]
-            elif word.endswith("이") or word.endswith("가"):
-                clean_word = word[:-1]
-            elif word.endswith("에서"):
-                clean_word = word[:-2]
-            elif word.endswith("으로") or word.endswith("에게"):
-                clean_word = word[:-2]
-            
-            # 길이가 2 이상이고 불용어가 아닌 경우
-            if len(clean_word) >= 2 and clean_word not in stop_words and word not in stop_words:
-                keywords.append(clean_word)
-        
-        return keywords[:5]  # 최대 5개 키워드
+        # 조사 제거 후 길이가 2 이상이고 불용어가 아닌 단어만 (최대 5개 키워드)
+        return [
+            clean_word
+            for word, clean_word in ((word, _PARTICLE_RE.sub("", word, count=1)) for word in query.split())
+            if len(clean_word) >= 2 and clean_word not in _STOP_WORDS and word not in _STOP_WORDS
+        ][:5]
     
     def get_search_priority(self, analysis_result: Dict[str, Any]) -> str:
         """검색 우선순위 결정"""
@@ -361,5 +673,8 @@ class OrchestrationAgent:
             return "balanced"  # 균형 검색
 
 
-# 전역 Orchestration Agent 인스턴스
-orchestration_agent = OrchestrationAgent()
+# 전역 Orchestration Agent 인스턴스 (첫 사용 시 생성)
+@lru_cache(maxsize=1)
+def get_orchestration_agent() -> OrchestrationAgent:
+    """전역 Orchestration Agent 반환"""
+    return OrchestrationAgent()
@@ -9,6 +9,7 @@ from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
 from config.settings import settings
+from src.utils.bedrock import bedrock_runtime_config
 from src.utils.logger import agent_logger
 from src.utils.session import ChatSession, Message
 from src.agents.intent_analyzer import intent_analyzer
@@ -25,7 +26,8 @@ class ImprovedOrchestrationAgent:
         try:
             self.bedrock_runtime = boto3.client(
                 'bedrock-runtime',
-                region_name=self.region
+                region_name=self.region,
+                config=bedrock_runtime_config()
             )
             agent_logger.log_agent_action("ImprovedOrchestrationAgent", "initialized", {"model_id": self.model_id})
         except Exception as e:
@@ -4,6 +4,7 @@ Reasoning and Acting 패턴을 구현하는 메인 Agent
 Orchestration, Action, Response Agent를 통합하여 완전한 ReAct 사이클 실행
 """
 
+from collections import deque
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 import time
@@ -11,7 +12,7 @@ import time
 from config.settings import settings
 from src.utils.logger import agent_logger, main_logger
 from src.utils.session import ChatSession, SessionContext, Message, session_manager
-from src.agents.orchestration import orchestration_agent
+from src.agents.orchestration import get_orchestration_agent
 from src.agents.action import action_agent
 from src.agents.response import response_agent
 
@@ -20,7 +21,7 @@ class ReActAgent:
     """ReAct 패턴 기반 메인 Agent"""
     
     def __init__(self):
-        self.execution_history = []
+        self.execution_history = deque(maxlen=100)  # 최근 100개만 유지
         self.current_session = None
         agent_logger.log_agent_action("ReActAgent", "initialized", {})
     
@@ -106,23 +107,24 @@ class ReActAgent:
     ) -> ChatSession:
         """세션 가져오기 또는 생성"""
         try:
-            # 세션 컨텍스트 구성
-            context = SessionContext(
-                system_prompt=system_prompt or "",
-                kb_id=kb_id or settings.knowledge_base.kb_id
-            )
-            
             if session_id:
                 session = session_manager.get_session(session_id)
                 if session:
-                    # 기존 세션의 컨텍스트 업데이트
-                    if system_prompt:
-                        session.update_context(system_prompt=system_prompt)
-                    if kb_id:
-                        session.update_context(kb_id=kb_id)
+                    # 기존 세션의 컨텍스트 업데이트 (값이 바뀐 항목만 모아 한 번에 갱신)
+                    context_updates = {}
+                    if system_prompt and session.context.system_prompt != system_prompt:
+                        context_updates["system_prompt"] = system_prompt
+                    if kb_id and session.context.kb_id != kb_id:
+                        context_updates["kb_id"] = kb_id
+                    if context_updates:
+                        session.update_context(**context_updates)
                     return session
             
-            # 새 세션 생성
+            # 새 세션 생성 (컨텍스트는 새 세션에만 필요)
+            context = SessionContext(
+                system_prompt=system_prompt or "",
+                kb_id=kb_id or settings.knowledge_base.kb_id
+            )
             session = session_manager.create_session(context)
             
             # 시스템 메시지 추가 (시스템 프롬프트가 있는 경우)
@@ -163,7 +165,7 @@ class ReActAgent:
                 
                 # === THOUGHT 단계 (Orchestration Agent) ===
                 thought_start = time.time()
-                analysis_result = orchestration_agent.analyze_query(
+                analysis_result = get_orchestration_agent().analyze_query(
                     user_query,
                     session,
                     system_prompt
@@ -278,7 +280,7 @@ class ReActAgent:
                 
                 # 결과가 부족하면 쿼리 개선 후 다음 반복
                 if iteration < max_iterations:
-                    refined_queries = orchestration_agent.refine_search_queries(
+                    refined_queries = get_orchestration_agent().refine_search_queries(
                         analysis_result,
                         [search_results]
                     )
@@ -409,10 +411,6 @@ class ReActAgent:
             }
             
             self.execution_history.append(history_entry)
-            
-            # 히스토리 크기 제한 (최근 100개만 유지)
-            if len(self.execution_history) > 100:
-                self.execution_history = self.execution_history[-100:]
                 
         except Exception as e:
             agent_logger.log_error(e, "react_save_history")
@@ -470,10 +468,19 @@ class ReActAgent:
             return {"total_queries": 0}
         
         total_queries = len(self.execution_history)
-        successful_queries = sum(1 for h in self.execution_history if h["status"] == "success")
-        total_time = sum(h["total_time"] for h in self.execution_history)
+        
+        # 히스토리 한 번 순회로 성공 수/처리 시간/반복 횟수 합계 집계
+        successful_queries = 0
+        total_time = 0.0
+        total_iterations = 0
+        for h in self.execution_history:
+            if h["status"] == "success":
+                successful_queries += 1
+            total_time += h["total_time"]
+            total_iterations += h["iterations_used"]
+        
         avg_time = total_time / total_queries
-        avg_iterations = sum(h["iterations_used"] for h in self.execution_history) / total_queries
+        avg_iterations = total_iterations / total_queries
         
         return {
             "total_queries": total_queries,
@@ -3,29 +3,166 @@ Improved ReAct Agent - Safe Version
 안전한 Response Agent를 사용하는 개선된 ReAct Agent
 """
 
+from collections import deque
 from typing import Dict, Any, Optional, List
+from dataclasses import dataclass, asdict
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import copy
+import hashlib
+import queue
+import sys
+import threading
 import time
+import uuid
 
 from config.settings import settings
+from src.utils.json_utils import json_dumps
 from src.utils.logger import agent_logger, main_logger
 from src.utils.session import ChatSession, SessionContext, Message, session_manager
-from src.agents.orchestration_improved import improved_orchestration_agent
-from src.agents.action_improved import improved_action_agent
-from src.agents.response_improved_safe import ImprovedResponseAgent  # 안전한 버전 사용
-from src.mcp.tool_call_tracker import tool_call_tracker
 
+# 결과가 부족할 때 핵심 엔티티로 추가 검색 쿼리를 만드는 접미사
+_REFINE_SUFFIXES = (" 상세 정보", " 관련 규정", " 실무 가이드")
+
+# 에러 응답 본문 (오류 내용/질문만 채워 넣음)
+_ERROR_CONTENT_TEMPLATE = """
+죄송합니다. 질문 처리 중 오류가 발생했습니다.
+
+**오류 내용**: {error_message}
+**질문**: {user_query}
+
+개선된 시스템에서 다음 기능들을 시도했습니다:
+- 🧠 사용자 의도 분석
+- 🔍 다단계 KB 검색
+- 📝 3000 토큰 이내 응답 생성
+- 🔧 MCP Tool 호출 추적
+
+다시 질문해 주시거나, 질문을 더 구체적으로 작성해 주시면 도움을 드릴 수 있습니다.
+"""
+
+# 에러 응답의 enhanced_features (응답마다 얕은 복사본 반환)
+_ERROR_ENHANCED_FEATURES = {
+    "intent_analysis": False,
+    "multi_stage_search": False,
+    "token_limited_response": False,
+    "tool_call_tracking": False
+}
+
+# validate_enhanced_system 결과 재사용 시간 (하위 Agent 구성이 같을 때)
+_VALIDATION_CACHE_TTL_SECONDS = 5.0
+
+
+def _intern_label(value: Any) -> Any:
+    """상태/의도처럼 값 종류가 적은 문자열은 intern해 히스토리 항목 간 같은 객체를 공유"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@dataclass(frozen=True)
+class ReactLogEntry:
+    """ReAct 단계 로그 항목 (응답으로 반환할 때만 dict로 변환, 소요 시간은 정수 ns로 보관)"""
+    __slots__ = ("iteration", "step", "content", "time_ns")  # Python 3.9 지원을 위해 slots=True 대신 직접 선언
+    iteration: int
+    step: str
+    content: Dict[str, Any]
+    time_ns: int
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """기존 react_log 응답 형식의 딕셔너리로 변환"""
+        return {
+            "iteration": self.iteration,
+            "step": self.step,
+            "content": self.content,
+            "time": round(self.time_ns / 1e9, 3)
+        }
+
+
+
+@dataclass(frozen=True)
+class ExecutionHistoryEntry:
+    """실행 히스토리 항목 (필드 고정 - 항목별 dict 대신 slots 객체로 보관)"""
+    __slots__ = (
+        "timestamp", "session_id", "query", "status", "iterations_used", "total_time",
+        "enhanced_features", "primary_intent", "complexity_level", "citation_count",
+        "search_stages", "additional_searches", "search_quality", "response_quality",
+        "total_tokens", "has_images"
+    )
+    timestamp: str
+    session_id: str
+    query: str
+    status: str
+    iterations_used: int
+    total_time: float
+    enhanced_features: Dict[str, Any]
+    primary_intent: str
+    complexity_level: str
+    citation_count: int
+    search_stages: int
+    additional_searches: int
+    search_quality: float
+    response_quality: float
+    total_tokens: int
+    has_images: bool
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """기존 히스토리 딕셔너리 형식으로 변환"""
+        return asdict(self)
 
 class ImprovedReActAgent:
     """개선된 ReAct 패턴 기반 메인 Agent - 안전 버전"""
     
     def __init__(self):
+        # 하위 Agent/클라이언트 모듈(boto3, numpy, tokenizer 등)은 모듈 import 시점이 아닌 생성 시점에 로드
+        from src.agents.orchestration_improved import improved_orchestration_agent
+        from src.agents.action_improved import improved_action_agent
+        from src.agents.response_improved_safe import ImprovedResponseAgent  # 안전한 버전 사용
+        from src.mcp.tool_call_tracker import tool_call_tracker
+        from src.utils.cache import TTLCache, SemanticCache
+        from src.utils.embedding import query_embedder
+        
         self.orchestration_agent = improved_orchestration_agent
         self.action_agent = improved_action_agent
         self.response_agent = ImprovedResponseAgent()  # 안전한 Response Agent 사용
         self.tool_tracker = tool_call_tracker
-        self.execution_history = []
+        self.query_embedder = query_embedder
+        self.execution_history = deque(maxlen=100)  # 최근 100개만 유지
         self.current_session = None
+        # 의도 분석과 동시에 실행하는 1차 검색용 워커
+        self._prefetch_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="primary-prefetch")
+        
+        # 비동기 쿼리 작업 (job_id -> future/진행 이벤트), submit_query_enhanced/poll_job에서 사용
+        self._job_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="react-job")
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._jobs_lock = threading.Lock()
+        
+        # 시스템 검증 결과 캐시: (생성 시각(monotonic), 하위 Agent 식별 키, 결과)
+        self._validation_cache = (0.0, None, None)
+        
+        # UI 콜백 디스패처 (settings.api.async_ui_callbacks 사용 시 첫 요청에서 스레드 시작)
+        self._ui_queue = queue.Queue(maxsize=settings.api.ui_callback_queue_size)
+        self._ui_dispatcher = None
+        self._ui_dispatcher_lock = threading.Lock()
+        
+        # 의도 분석 결과 캐시 (L1: 쿼리/컨텍스트 정확 일치, L2: 독립 쿼리의 임베딩 유사도)
+        self._intent_cache = TTLCache(
+            max_entries=settings.model.analysis_cache_max_entries,
+            ttl_seconds=settings.model.analysis_cache_ttl_seconds
+        )
+        self._intent_semantic_cache = SemanticCache(
+            threshold=settings.model.intent_cache_threshold,
+            max_entries=settings.model.analysis_cache_max_entries,
+            ttl_seconds=settings.model.analysis_cache_ttl_seconds
+        )
+        
+        # 최종 응답 캐시 (재질문/새로고침 시 같은 검색 결과로 응답을 다시 생성하지 않음)
+        self._response_cache = TTLCache(
+            max_entries=settings.model.response_cache_max_entries,
+            ttl_seconds=settings.model.analysis_cache_ttl_seconds
+        )
+        
+        # UI 이벤트에서 참조 ID로 넘긴 큰 검색 결과 (get_ui_payload로 조회, 요청/작업이 끝나면 삭제)
+        self._ui_payloads: Dict[str, Dict[str, Any]] = {}
+        self._ui_payloads_lock = threading.Lock()
         
         agent_logger.log_agent_action("ImprovedReActAgent", "initialized", {})
     
@@ -37,15 +174,25 @@ class ImprovedReActAgent:
         kb_id: Optional[str] = None,
         max_iterations: int = 3,
         image_data: Optional[str] = None,
-        ui_callback: Optional[callable] = None
+        ui_callback: Optional[callable] = None,
+        ui_payload_refs: Optional[List[str]] = None
     ) -> Dict[str, Any]:
-        """개선된 ReAct 패턴으로 사용자 쿼리 처리"""
+        """
+        개선된 ReAct 패턴으로 사용자 쿼리 처리
+        
+        ui_payload_refs를 넘기면 이번 요청에서 만든 UI payload 참조 ID를 기록하고 삭제는 호출자가 담당
+        (없으면 요청이 끝날 때 삭제 - 참조 ID는 콜백 처리 중에만 조회 가능)
+        """
         start_time = time.time()
+        release_ui_payloads = ui_payload_refs is None
+        if release_ui_payloads:
+            ui_payload_refs = []
         
         try:
-            # UI 콜백 설정
-            if ui_callback:
-                self.tool_tracker.set_ui_callback(ui_callback)
+            # UI 콜백 설정 (비동기 전달 시 에이전트 스레드는 큐에 넣기만 함)
+            # 공유 Tool 트래커에 설정하지 않고 하위 Agent 호출마다 전달 (동시 작업 간 이벤트 혼선 방지)
+            if ui_callback and settings.api.async_ui_callbacks:
+                ui_callback = self._queued_ui_callback(ui_callback)
             
             # 세션 관리
             session = self._get_or_create_session(session_id, system_prompt, kb_id)
@@ -72,7 +219,8 @@ class ImprovedReActAgent:
                 system_prompt,
                 max_iterations,
                 image_data,
-                ui_callback
+                ui_callback,
+                ui_payload_refs
             )
             
             # 실행 시간 계산
@@ -98,6 +246,234 @@ class ImprovedReActAgent:
         except Exception as e:
             agent_logger.log_error(e, "enhanced_react_process_query")
             return self._get_enhanced_error_response(user_query, str(e))
+        
+        finally:
+            # 반환 전에 이번 요청의 UI 이벤트가 모두 전달되도록 대기 (완료 후 늦게 도착하는 진행 이벤트 방지)
+            if ui_callback and settings.api.async_ui_callbacks:
+                self._flush_ui_callbacks()
+            if release_ui_payloads:
+                self._release_ui_payloads(ui_payload_refs)
+    
+    def _queued_ui_callback(self, ui_callback: callable) -> callable:
+        """UI 콜백을 큐에 넣기만 하는 콜백으로 감싸기 (실제 호출은 디스패처 스레드에서 순서대로 수행)"""
+        with self._ui_dispatcher_lock:
+            if self._ui_dispatcher is None:
+                self._ui_dispatcher = threading.Thread(
+                    target=self._dispatch_ui_callbacks, name="ui-callback-dispatcher", daemon=True
+                )
+                self._ui_dispatcher.start()
+        
+        def enqueue(update_type: str, data: Dict[str, Any]):
+            try:
+                self._ui_queue.put_nowait((ui_callback, update_type, data))
+            except queue.Full:
+                pass  # UI가 밀려 있으면 진행 이벤트는 버리고 파이프라인은 계속 진행
+        
+        return enqueue
+    
+    def _dispatch_ui_callbacks(self):
+        """UI 콜백 디스패처 스레드 루프"""
+        while True:
+            ui_callback, update_type, data = self._ui_queue.get()
+            if ui_callback is None:
+                data.set()  # flush 마커
+                continue
+            try:
+                ui_callback(update_type, data)
+            except Exception as e:
+                agent_logger.log_error(e, "ui_callback_dispatch")
+    
+    def _flush_ui_callbacks(self, timeout: float = 2.0):
+        """지금까지 큐에 들어간 UI 이벤트가 전달될 때까지 대기 (최대 timeout초)"""
+        flushed = threading.Event()
+        try:
+            self._ui_queue.put((None, None, flushed), timeout=timeout)
+        except queue.Full:
+            return
+        flushed.wait(timeout)
+    
+    def _search_complete_event(
+        self, search_results: Dict[str, Any], citation_count: int, stage_count: int,
+        ui_payload_refs: Optional[List[str]]
+    ) -> Dict[str, Any]:
+        """
+        search_complete stage_update 이벤트 구성
+        
+        검색 결과가 ui_payload_inline_max_bytes 이하이면 기존처럼 search_results로 그대로 전달하고,
+        넘으면 search_results 대신 search_results_ref만 전달 (get_ui_payload로 조회)
+        참조를 정리할 ui_payload_refs가 없으면 크기와 관계없이 그대로 전달
+        """
+        event = {
+            "stage": "search_complete",
+            "message": f"✅ 검색 완료: {citation_count}개 결과",
+            "search_summary": {
+                "status": search_results.get("status", "unknown"),
+                "citation_count": citation_count,
+                "search_stages": stage_count,
+                "quality_metrics": search_results.get("quality_metrics", {})
+            }
+        }
+        
+        inline = ui_payload_refs is None
+        if not inline:
+            try:
+                inline = len(json_dumps(search_results)) <= settings.api.ui_payload_inline_max_bytes
+            except TypeError:
+                pass  # JSON으로 표현할 수 없는 값이 있으면 참조로 전달
+        
+        if inline:
+            event["search_results"] = search_results
+        else:
+            ref = uuid.uuid4().hex
+            with self._ui_payloads_lock:
+                self._ui_payloads[ref] = search_results
+            ui_payload_refs.append(ref)
+            event["search_results_ref"] = ref
+        return event
+    
+    def get_ui_payload(self, ref: str) -> Optional[Dict[str, Any]]:
+        """
+        UI 이벤트의 참조 ID(search_results_ref)로 전체 payload 조회
+        
+        process_query_enhanced를 직접 호출하면 요청이 끝날 때, 작업(submit_query_enhanced)이면
+        poll_job으로 결과를 회수하거나 작업이 정리될 때 삭제되어 None 반환
+        """
+        with self._ui_payloads_lock:
+            return self._ui_payloads.get(ref)
+    
+    def _release_ui_payloads(self, refs: List[str]):
+        """요청/작업이 만든 UI payload 삭제"""
+        if not refs:
+            return
+        with self._ui_payloads_lock:
+            for ref in refs:
+                self._ui_payloads.pop(ref, None)
+    
+    def submit_query_enhanced(
+        self,
+        user_query: str,
+        session_id: Optional[str] = None,
+        system_prompt: Optional[str] = None,
+        kb_id: Optional[str] = None,
+        max_iterations: int = 3,
+        image_data: Optional[str] = None,
+        ui_callback: Optional[callable] = None
+    ) -> str:
+        """
+        process_query_enhanced를 백그라운드에서 실행하고 job_id를 즉시 반환
+        
+        진행 이벤트(ui_callback으로 전달되는 stage_update 등)는 작업별로 쌓이며
+        poll_job으로 결과와 함께 조회 (ui_callback을 넘기면 기존처럼 함께 호출됨)
+        """
+        job_id = str(uuid.uuid4())
+        events: List[Dict[str, Any]] = []
+        
+        def job_callback(event_type: str, data: Dict[str, Any]):
+            events.append({"type": event_type, "data": data, "timestamp": datetime.now().isoformat()})
+            if ui_callback:
+                ui_callback(event_type, data)
+        
+        job = {
+            "query": user_query,
+            "events": events,
+            "ui_payload_refs": [],
+            "submitted_at": datetime.now().isoformat()
+        }
+        with self._jobs_lock:
+            self._purge_finished_jobs()
+            job["future"] = self._job_pool.submit(
+                self.process_query_enhanced,
+                user_query,
+                session_id,
+                system_prompt,
+                kb_id,
+                max_iterations,
+                image_data,
+                job_callback,
+                ui_payload_refs=job["ui_payload_refs"]
+            )
+            # 완료 시각 기록 (조회되지 않은 완료 작업 정리 기준)
+            job["future"].add_done_callback(lambda _: job.__setitem__("finished_at", time.monotonic()))
+            self._jobs[job_id] = job
+        
+        agent_logger.log_agent_action(
+            "ImprovedReActAgent",
+            "job_submitted",
+            {"job_id": job_id[:8], "query_length": len(user_query)}
+        )
+        
+        return job_id
+    
+    def _purge_finished_jobs(self):
+        """
+        poll_job으로 회수되지 않은 완료 작업 정리 (_jobs_lock 안에서 호출)
+        
+        - 완료 후 job_result_ttl_seconds가 지난 작업 삭제
+        - 그래도 max_retained_jobs 이상이면 오래 전에 완료된 작업부터 삭제 (실행 중인 작업은 유지)
+        """
+        now = time.monotonic()
+        finished = sorted(
+            (job["finished_at"], job_id) for job_id, job in self._jobs.items() if "finished_at" in job
+        )
+        overflow = len(self._jobs) - settings.api.max_retained_jobs + 1
+        purged = 0
+        for finished_at, job_id in finished:
+            if now - finished_at <= settings.api.job_result_ttl_seconds and purged >= overflow:
+                break
+            self._release_ui_payloads(self._jobs.pop(job_id)["ui_payload_refs"])
+            purged += 1
+        
+        if purged:
+            agent_logger.log_agent_action(
+                "ImprovedReActAgent",
+                "jobs_purged",
+                {"purged_count": purged, "retained_count": len(self._jobs)}
+            )
+    
+    def poll_job(self, job_id: str, since: int = 0) -> Dict[str, Any]:
+        """
+        작업 상태 조회
+        
+        Args:
+            job_id: submit_query_enhanced가 반환한 ID
+            since: 이미 받은 이벤트 수 (이후 이벤트만 반환)
+            
+        Returns:
+            status(running/done/error/not_found), 새 이벤트, 완료 시 result
+            (완료된 작업은 결과를 한 번 반환한 뒤 삭제됨, 조회되지 않으면 TTL/개수 제한으로 정리되어 not_found)
+        """
+        with self._jobs_lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return {"job_id": job_id, "status": "not_found", "events": [], "next_event_index": since}
+            
+            future = job["future"]
+            events = job["events"]
+            poll_result = {
+                "job_id": job_id,
+                "status": "running",
+                "events": events[since:],
+                "next_event_index": len(events),
+                "submitted_at": job["submitted_at"]
+            }
+            if not future.done():
+                return poll_result
+            
+            del self._jobs[job_id]
+            self._release_ui_payloads(job["ui_payload_refs"])
+        
+        # process_query_enhanced는 예외를 에러 응답으로 변환하므로 future 예외는 예상 밖의 실패
+        error = future.exception()
+        if error is not None:
+            agent_logger.log_error(error, "enhanced_react_job")
+            poll_result["status"] = "error"
+            poll_result["result"] = self._get_enhanced_error_response(job["query"], str(error))
+        else:
+            result = future.result()
+            poll_result["status"] = "error" if result.get("status") == "error" else "done"
+            poll_result["result"] = result
+        
+        return poll_result
     
     def _execute_enhanced_react_cycle(
         self,
@@ -106,12 +482,15 @@ class ImprovedReActAgent:
         system_prompt: Optional[str],
         max_iterations: int,
         image_data: Optional[str] = None,
-        ui_callback: Optional[callable] = None
+        ui_callback: Optional[callable] = None,
+        ui_payload_refs: Optional[List[str]] = None
     ) -> Dict[str, Any]:
         """개선된 ReAct 사이클 실행"""
         
-        react_log = []
+        react_log: List[ReactLogEntry] = []
         iteration = 0
+        prev_fingerprint = None  # 직전 반복의 검색 결과(Citation 집합) 지문
+        single_pass = max_iterations == 1  # 1회만 실행하는 경우 (개선된 시스템의 일반적인 경우)
         
         try:
             while iteration < max_iterations:
@@ -124,7 +503,8 @@ class ImprovedReActAgent:
                 )
                 
                 # === ENHANCED THOUGHT 단계 ===
-                thought_start = time.time()
+                # 단계별 소요 시간은 monotonic 시계(정수 ns)로 측정하고 로그 기록 시에만 초 단위로 변환
+                thought_start = time.perf_counter_ns()
                 
                 if ui_callback:
                     ui_callback("stage_update", {
@@ -133,23 +513,23 @@ class ImprovedReActAgent:
                         "iteration": iteration
                     })
                 
-                analysis_result = self.orchestration_agent.analyze_query_with_intent(
+                analysis_result = self._analyze_with_primary_prefetch(
                     user_query, session, system_prompt
                 )
                 
-                thought_time = time.time() - thought_start
+                thought_time_ns = time.perf_counter_ns() - thought_start
                 
-                react_log.append({
-                    "iteration": iteration,
-                    "step": "ENHANCED_THOUGHT",
-                    "content": {
+                react_log.append(ReactLogEntry(
+                    iteration=iteration,
+                    step="ENHANCED_THOUGHT",
+                    content={
                         "primary_intent": analysis_result.get("primary_intent", "unknown"),
                         "complexity": analysis_result.get("complexity", "보통"),
                         "requires_additional_search": analysis_result.get("requires_additional_search", False),
                         "additional_queries_count": len(analysis_result.get("additional_search_queries", []))
                     },
-                    "time": round(thought_time, 3)
-                })
+                    time_ns=thought_time_ns
+                ))
                 
                 if ui_callback:
                     ui_callback("stage_update", {
@@ -159,7 +539,7 @@ class ImprovedReActAgent:
                     })
                 
                 # === ENHANCED ACTION 단계 ===
-                action_start = time.time()
+                action_start = time.perf_counter_ns()
                 
                 if ui_callback:
                     ui_callback("stage_update", {
@@ -172,6 +552,7 @@ class ImprovedReActAgent:
                         }
                     })
                 
+                # 재질문/후속 질문이 같은 검색으로 이어지면 KB 검색은 MultiStageSearchExecutor의 결과 캐시에서 처리됨
                 search_results = self.action_agent.execute_enhanced_search_strategy(
                     analysis_result,
                     max_results_per_query=None,
@@ -179,53 +560,74 @@ class ImprovedReActAgent:
                     ui_callback=ui_callback
                 )
                 
-                action_time = time.time() - action_start
+                action_time_ns = time.perf_counter_ns() - action_start
+                
+                # 이번 반복에서 반복 사용하는 검색 결과 값은 한 번만 조회
+                citations = search_results.get("citations") or []
+                citation_count = len(citations)
+                search_stages = search_results.get("search_stages") or []
                 
-                react_log.append({
-                    "iteration": iteration,
-                    "step": "ENHANCED_ACTION",
-                    "content": {
+                react_log.append(ReactLogEntry(
+                    iteration=iteration,
+                    step="ENHANCED_ACTION",
+                    content={
                         "status": search_results.get("status", "unknown"),
-                        "citation_count": len(search_results.get("citations", [])),
-                        "search_stages": len(search_results.get("search_stages", [])),
+                        "citation_count": citation_count,
+                        "search_stages": len(search_stages),
                         "quality_score": search_results.get("quality_metrics", {}).get("overall_quality", 0),
                         "additional_searches_performed": len(search_results.get("additional_results", []))
                     },
-                    "time": round(action_time, 3)
-                })
+                    time_ns=action_time_ns
+                ))
                 
                 if ui_callback:
-                    ui_callback("stage_update", {
-                        "stage": "search_complete",
-                        "message": f"✅ 검색 완료: {len(search_results.get('citations', []))}개 결과",
-                        "search_results": search_results
-                    })
+                    ui_callback("stage_update", self._search_complete_event(
+                        search_results, citation_count, len(search_stages), ui_payload_refs
+                    ))
                 
                 # === ENHANCED OBSERVATION 단계 ===
-                observation_result = self._evaluate_enhanced_search_results(
-                    search_results, analysis_result, iteration
-                )
-                
-                react_log.append({
-                    "iteration": iteration,
-                    "step": "ENHANCED_OBSERVATION",
-                    "content": observation_result,
-                    "time": 0.1
-                })
+                # 단일 패스는 평가 결과와 관계없이 바로 응답을 생성하므로 관찰(평가/반복 감지) 생략
+                if not single_pass:
+                    observation_start = time.perf_counter_ns()
+                    
+                    observation_result = self._evaluate_enhanced_search_results(
+                        search_results, analysis_result, iteration
+                    )
+                    
+                    # 직전 반복과 같은 검색 결과면 더 반복해도 개선되지 않으므로 현재 결과로 응답 생성
+                    fingerprint = self._citation_set_digest(citations)
+                    if not observation_result["sufficient"] and fingerprint == prev_fingerprint:
+                        agent_logger.log_agent_action(
+                            "ImprovedReActAgent",
+                            "loop_detected_abort",
+                            {"iteration": iteration, "citation_count": citation_count}
+                        )
+                        observation_result["sufficient"] = True
+                        observation_result["loop_detected"] = True
+                    prev_fingerprint = fingerprint
+                    
+                    observation_time_ns = time.perf_counter_ns() - observation_start
+                    
+                    react_log.append(ReactLogEntry(
+                        iteration=iteration,
+                        step="ENHANCED_OBSERVATION",
+                        content=self._compact_observation(observation_result),
+                        time_ns=observation_time_ns
+                    ))
                 
                 # 결과가 충분한지 확인
-                if observation_result["sufficient"]:
+                if single_pass or observation_result["sufficient"]:
                     # === ENHANCED RESPONSE 생성 ===
-                    response_start = time.time()
+                    response_start = time.perf_counter_ns()
                     
                     if ui_callback:
                         ui_callback("stage_update", {
                             "stage": "response_generation",
                             "message": "📝 포괄적 응답 생성 중... (3000 토큰 이내)",
-                            "citation_count": len(search_results.get("citations", []))
+                            "citation_count": citation_count
                         })
                     
-                    final_response = self.response_agent.generate_comprehensive_response(
+                    final_response = self._generate_response_cached(
                         user_query,
                         search_results,
                         analysis_result,
@@ -234,19 +636,19 @@ class ImprovedReActAgent:
                         image_data
                     )
                     
-                    response_time = time.time() - response_start
+                    response_time_ns = time.perf_counter_ns() - response_start
                     
-                    react_log.append({
-                        "iteration": iteration,
-                        "step": "ENHANCED_RESPONSE",
-                        "content": {
+                    react_log.append(ReactLogEntry(
+                        iteration=iteration,
+                        step="ENHANCED_RESPONSE",
+                        content={
                             "response_length": len(final_response.get("content", "")),
                             "citation_count": len(final_response.get("citations", [])),
                             "token_usage": final_response.get("response_metadata", {}).get("token_usage", {}),
                             "quality_score": final_response.get("metadata", {}).get("response_quality", {}).get("overall_quality", 0)
                         },
-                        "time": round(response_time, 3)
-                    })
+                        time_ns=response_time_ns
+                    ))
                     
                     if ui_callback:
                         ui_callback("stage_update", {
@@ -261,7 +663,7 @@ class ImprovedReActAgent:
                     )
                     
                     # ReAct 로그 및 메타데이터 추가
-                    enhanced_response["react_log"] = react_log
+                    enhanced_response["react_log"] = [entry.to_dict() for entry in react_log]
                     enhanced_response["iterations_used"] = iteration
                     enhanced_response["enhanced_features"] = {
                         "intent_analysis": True,
@@ -280,11 +682,11 @@ class ImprovedReActAgent:
                     analysis_result = refined_analysis
             
             # 최대 반복 횟수 도달 시 현재 결과로 응답 생성
-            final_response = self.response_agent.generate_comprehensive_response(
+            final_response = self._generate_response_cached(
                 user_query, search_results, analysis_result, session, system_prompt, image_data
             )
             
-            final_response["react_log"] = react_log
+            final_response["react_log"] = [entry.to_dict() for entry in react_log]
             final_response["iterations_used"] = max_iterations
             final_response["max_iterations_reached"] = True
             
@@ -294,7 +696,154 @@ class ImprovedReActAgent:
             
         except Exception as e:
             agent_logger.log_error(e, "enhanced_react_execute_cycle")
-            return self._get_enhanced_error_response(user_query, str(e), react_log)
+            return self._get_enhanced_error_response(
+                user_query, str(e), [entry.to_dict() for entry in react_log]
+            )
+    
+    def _analyze_with_primary_prefetch(
+        self, user_query: str, session: ChatSession, system_prompt: Optional[str]
+    ) -> Dict[str, Any]:
+        """
+        의도 분석과 1차 KB 검색을 동시에 실행
+        
+        1차 검색은 항상 원본 쿼리로 수행되므로 의도 분석(LLM)을 기다리는 동안 미리 검색해 두고,
+        이후 ACTION 단계의 1차 검색은 결과 캐시에서 처리됨 (추가 검색만 분석 결과를 기다림)
+        """
+        if not settings.knowledge_base.enable_primary_prefetch:
+            return self._analyze_query_cached(user_query, session, system_prompt)
+        
+        prefetch_future = self._prefetch_pool.submit(self.action_agent.prefetch_primary_search, user_query)
+        try:
+            return self._analyze_query_cached(user_query, session, system_prompt)
+        finally:
+            # 선행 검색 실패는 prefetch_primary_search에서 처리되며, ACTION 단계에서 다시 검색함
+            prefetch_future.result()
+    
+    def _analyze_query_cached(
+        self, user_query: str, session: ChatSession, system_prompt: Optional[str]
+    ) -> Dict[str, Any]:
+        """
+        캐시를 적용한 의도 분석
+        
+        - L1: 쿼리/시스템 프롬프트/KB/최근 대화가 모두 같으면 재사용 (같은 요청의 반복 iteration 포함)
+        - L2: 이전 대화가 없는 독립 쿼리만 임베딩 유사도로 재사용
+          (후속 질문은 앞선 대화에 따라 의도가 달라지므로 제외)
+        """
+        if not settings.model.enable_intent_cache:
+            return self.orchestration_agent.analyze_query_with_intent(user_query, session, system_prompt)
+        
+        # 의도 분석에 들어가는 입력과 같은 범위(최근 6개 메시지, 300자)로 컨텍스트 지문 구성
+        recent_messages = session.messages[-6:]
+        history_text = "\n".join(f"{msg.role}: {msg.content[:300]}" for msg in recent_messages)
+        kb_id = getattr(session.context, "kb_id", "") or ""
+        cache_key = hashlib.blake2b(
+            f"{user_query}\x1f{system_prompt or ''}\x1f{kb_id}\x1f{history_text}".encode(), digest_size=16
+        ).hexdigest()
+        
+        cached_result = self._intent_cache.get(cache_key)
+        if cached_result is not None:
+            return self._from_intent_cache(cached_result, user_query, "exact")
+        
+        is_standalone = not any(msg.role != "system" for msg in recent_messages[:-1])
+        semantic_context = (system_prompt or "", kb_id)
+        query_embedding = self.query_embedder.embed(user_query) if is_standalone else None
+        if query_embedding is not None:
+            cached_result = self._intent_semantic_cache.get(query_embedding, semantic_context)
+            if cached_result is not None:
+                return self._from_intent_cache(cached_result, user_query, "semantic")
+        
+        analysis_result = self.orchestration_agent.analyze_query_with_intent(user_query, session, system_prompt)
+        
+        # 분석에 실패한 기본 결과는 캐시하지 않음
+        if not analysis_result.get("agent_version", "").endswith("_fallback"):
+            cached_result = copy.deepcopy(analysis_result)
+            self._intent_cache.put(cache_key, cached_result)
+            if query_embedding is not None:
+                self._intent_semantic_cache.put(query_embedding, cached_result, semantic_context)
+        
+        return analysis_result
+    
+    def _from_intent_cache(
+        self, cached_result: Dict[str, Any], user_query: str, cache_type: str
+    ) -> Dict[str, Any]:
+        """캐시된 의도 분석 결과를 현재 쿼리용 복사본으로 반환 (1차 검색 쿼리는 현재 쿼리로 교체)"""
+        agent_logger.log_agent_action(
+            "ImprovedReActAgent",
+            "intent_cache_hit",
+            lambda: {"cache_type": cache_type, "query_length": len(user_query)}
+        )
+        result = copy.deepcopy(cached_result)
+        result["original_query"] = user_query
+        result["primary_query"] = user_query
+        result["search_queries"] = [user_query]
+        result["cache_hit"] = cache_type
+        return result
+    
+    def _generate_response_cached(
+        self,
+        user_query: str,
+        search_results: Dict[str, Any],
+        analysis_result: Dict[str, Any],
+        session: ChatSession,
+        system_prompt: Optional[str],
+        image_data: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        캐시를 적용한 포괄적 응답 생성
+        
+        쿼리+시스템 프롬프트, 응답 프롬프트에 쓰이는 분석 결과 값(의도/복잡도/핵심 엔티티),
+        검색된 Citation ID 집합이 모두 같으면 이전 응답을 재사용
+        (이미지가 포함된 요청과 오류 응답은 캐시하지 않음)
+        """
+        if image_data is not None or not settings.model.enable_response_cache:
+            return self.response_agent.generate_comprehensive_response(
+                user_query, search_results, analysis_result, session, system_prompt, image_data
+            )
+        
+        hit_start = datetime.now()
+        citations = search_results.get("citations") or []
+        key_entities = (analysis_result.get("search_priorities") or {}).get("key_entities") or []
+        prompt_inputs = "\x1f".join((
+            user_query,
+            system_prompt or "",
+            str(analysis_result.get("primary_intent", "")),
+            str(analysis_result.get("complexity", "")),
+            "\x1e".join(map(str, key_entities))
+        ))
+        cache_key = (
+            hashlib.blake2b(prompt_inputs.encode(), digest_size=16).hexdigest(),
+            self._citation_set_digest(citations)
+        )
+        
+        cached_response = self._response_cache.get(cache_key)
+        if cached_response is not None:
+            agent_logger.log_agent_action(
+                "ImprovedReActAgent",
+                "response_cache_hit",
+                lambda: {"query_length": len(user_query), "citation_count": len(citations)}
+            )
+            final_response = copy.deepcopy(cached_response)
+            # 처리 시간/시각은 캐시에 저장된 값이 아닌 이번 요청 기준으로 갱신
+            response_metadata = final_response.setdefault("response_metadata", {})
+            response_metadata["cache_hit"] = True
+            response_metadata["processing_time"] = (datetime.now() - hit_start).total_seconds()
+            response_metadata["timestamp"] = hit_start.isoformat()
+            return final_response
+        
+        final_response = self.response_agent.generate_comprehensive_response(
+            user_query, search_results, analysis_result, session, system_prompt, image_data
+        )
+        
+        if final_response.get("status") != "error":
+            self._response_cache.put(cache_key, copy.deepcopy(final_response))
+        
+        return final_response
+    
+    @staticmethod
+    def _citation_set_digest(citations: List[Dict[str, Any]]) -> str:
+        """Citation ID 집합 지문 (순서 무관)"""
+        citation_ids = sorted(c.get("id", "") for c in citations)
+        return hashlib.blake2b("\x1f".join(citation_ids).encode(), digest_size=16).hexdigest()
     
     def _evaluate_enhanced_search_results(
         self, search_results: Dict[str, Any], analysis_result: Dict[str, Any], iteration: int
@@ -334,49 +883,71 @@ class ImprovedReActAgent:
                 "error": str(e)
             }
     
+    @staticmethod
+    def _compact_observation(observation_result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        react_log용 평가 결과 요약
+        
+        중첩된 품질 지표는 전체 점수만 남기고 나머지 값은 그대로 복사
+        (ACTION 단계 로그와 같은 quality_score 형식, 검색 결과와 dict를 공유하지 않음)
+        """
+        compact = {key: value for key, value in observation_result.items() if key != "quality_metrics"}
+        if "quality_metrics" in observation_result:
+            compact["quality_score"] = observation_result["quality_metrics"].get("overall_quality", 0)
+        return compact
+    
     def _refine_analysis_for_next_iteration(
         self, analysis_result: Dict[str, Any], search_results: Dict[str, Any], observation_result: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """다음 반복을 위한 분석 결과 개선"""
-        refined_analysis = analysis_result.copy()
-        
-        if observation_result.get("citation_count", 0) < 3:
-            existing_queries = refined_analysis.get("additional_search_queries", [])
-            key_entities = refined_analysis.get("search_priorities", {}).get("key_entities", [])
-            
-            new_queries = []
-            for entity in key_entities[:2]:
-                new_queries.extend([
-                    f"{entity} 상세 정보",
-                    f"{entity} 관련 규정",
-                    f"{entity} 실무 가이드"
-                ])
-            
-            all_queries = existing_queries + [q for q in new_queries if q not in existing_queries]
-            refined_analysis["additional_search_queries"] = all_queries[:5]
-            refined_analysis["max_additional_searches"] = min(len(all_queries), 5)
-        
-        return refined_analysis
+        """
+        다음 반복을 위한 분석 결과 개선
+        
+        바뀌는 키가 없으면 원본을 그대로 반환하고, 있으면 변경된 키만 덮어쓴 새 dict 반환
+        (원본은 수정하지 않음, 하위 Agent/UI가 dict로 직렬화하므로 ChainMap 대신 dict 사용)
+        """
+        if observation_result.get("citation_count", 0) >= 3:
+            return analysis_result
+        
+        existing_queries = analysis_result.get("additional_search_queries", [])
+        key_entities = analysis_result.get("search_priorities", {}).get("key_entities", [])
+        
+        new_queries = [f"{entity}{suffix}" for entity in key_entities[:2] for suffix in _REFINE_SUFFIXES]
+        
+        # 순서를 유지하는 중복 제거 (기존 쿼리 우선)
+        seen_queries = dict.fromkeys(existing_queries)
+        for query in new_queries:
+            seen_queries.setdefault(query, None)
+        all_queries = list(seen_queries)
+        
+        return {
+            **analysis_result,
+            "additional_search_queries": all_queries[:5],
+            "max_additional_searches": min(len(all_queries), 5)
+        }
     
     def _get_or_create_session(
         self, session_id: Optional[str], system_prompt: Optional[str], kb_id: Optional[str]
     ) -> ChatSession:
         """세션 가져오기 또는 생성"""
         try:
-            context = SessionContext(
-                system_prompt=system_prompt or "",
-                kb_id=kb_id or settings.knowledge_base.kb_id
-            )
-            
             if session_id:
                 session = session_manager.get_session(session_id)
                 if session:
-                    if system_prompt:
-                        session.update_context(system_prompt=system_prompt)
-                    if kb_id:
-                        session.update_context(kb_id=kb_id)
+                    # 값이 바뀐 항목만 갱신 (매 요청마다 같은 값으로 잠금/로그가 반복되지 않도록)
+                    context_updates = {}
+                    if system_prompt and session.context.system_prompt != system_prompt:
+                        context_updates["system_prompt"] = system_prompt
+                    if kb_id and session.context.kb_id != kb_id:
+                        context_updates["kb_id"] = kb_id
+                    if context_updates:
+                        session.update_context(**context_updates)
                     return session
             
+            # 컨텍스트는 새 세션을 만들 때만 생성
+            context = SessionContext(
+                system_prompt=system_prompt or "",
+                kb_id=kb_id or settings.knowledge_base.kb_id
+            )
             session = session_manager.create_session(context)
             
             if system_prompt:
@@ -395,29 +966,29 @@ class ImprovedReActAgent:
     ):
         """개선된 실행 히스토리 저장"""
         try:
-            history_entry = {
-                "timestamp": datetime.now().isoformat(),
-                "session_id": session_id,
-                "query": user_query[:100],
-                "status": result.get("status", "unknown"),
-                "iterations_used": result.get("iterations_used", 0),
-                "total_time": total_time,
-                "enhanced_features": result.get("enhanced_features", {}),
-                "primary_intent": result.get("metadata", {}).get("primary_intent", "unknown"),
-                "complexity_level": result.get("metadata", {}).get("complexity_level", "보통"),
-                "citation_count": len(result.get("citations", [])),
-                "search_stages": result.get("metadata", {}).get("total_search_stages", 0),
-                "additional_searches": result.get("metadata", {}).get("additional_searches_performed", 0),
-                "search_quality": result.get("metadata", {}).get("search_quality", {}).get("overall_quality", 0),
-                "response_quality": result.get("metadata", {}).get("response_quality", {}).get("overall_quality", 0),
-                "token_usage": result.get("response_metadata", {}).get("token_usage", {}),
-                "has_images": result.get("metadata", {}).get("has_images", False)
-            }
+            # 중첩 경로는 한 번만 조회하고 히스토리에는 스칼라 값으로 저장
+            metadata = result.get("metadata") or {}
+            token_usage = (result.get("response_metadata") or {}).get("token_usage") or {}
+            history_entry = ExecutionHistoryEntry(
+                timestamp=datetime.now().isoformat(),
+                session_id=session_id,
+                query=user_query[:100],  # 100자 이하면 슬라이싱 없이 원본 객체 그대로 사용
+                status=_intern_label(result.get("status", "unknown")),
+                iterations_used=result.get("iterations_used", 0),
+                total_time=total_time,
+                enhanced_features=result.get("enhanced_features", {}),
+                primary_intent=_intern_label(metadata.get("primary_intent", "unknown")),
+                complexity_level=_intern_label(metadata.get("complexity_level", "보통")),
+                citation_count=len(result.get("citations", [])),
+                search_stages=metadata.get("total_search_stages", 0),
+                additional_searches=metadata.get("additional_searches_performed", 0),
+                search_quality=float((metadata.get("search_quality") or {}).get("overall_quality", 0.0)),
+                response_quality=float((metadata.get("response_quality") or {}).get("overall_quality", 0.0)),
+                total_tokens=int(token_usage.get("total_tokens", 0)),
+                has_images=bool(metadata.get("has_images", False))
+            )
             
             self.execution_history.append(history_entry)
-            
-            if len(self.execution_history) > 100:
-                self.execution_history = self.execution_history[-100:]
                 
         except Exception as e:
             agent_logger.log_error(e, "enhanced_execution_history_save")
@@ -427,30 +998,12 @@ class ImprovedReActAgent:
     ) -> Dict[str, Any]:
         """개선된 에러 응답 생성"""
         return {
-            "content": f"""
-죄송합니다. 질문 처리 중 오류가 발생했습니다.
-
-**오류 내용**: {error_message}
-**질문**: {user_query}
-
-개선된 시스템에서 다음 기능들을 시도했습니다:
-- 🧠 사용자 의도 분석
-- 🔍 다단계 KB 검색
-- 📝 3000 토큰 이내 응답 생성
-- 🔧 MCP Tool 호출 추적
-
-다시 질문해 주시거나, 질문을 더 구체적으로 작성해 주시면 도움을 드릴 수 있습니다.
-""",
+            "content": _ERROR_CONTENT_TEMPLATE.format(error_message=error_message, user_query=user_query),
             "citations": [],
             "status": "error",
             "error": error_message,
             "react_log": react_log or [],
-            "enhanced_features": {
-                "intent_analysis": False,
-                "multi_stage_search": False,
-                "token_limited_response": False,
-                "tool_call_tracking": False
-            },
+            "enhanced_features": dict(_ERROR_ENHANCED_FEATURES),
             "metadata": {
                 "error_timestamp": datetime.now().isoformat(),
                 "original_query": user_query,
@@ -459,7 +1012,18 @@ class ImprovedReActAgent:
         }
     
     def validate_enhanced_system(self) -> Dict[str, Any]:
-        """개선된 시스템 유효성 검증"""
+        """개선된 시스템 유효성 검증 (하위 Agent 구성이 같으면 짧은 시간 동안 결과 재사용)"""
+        now = time.monotonic()
+        components_key = (
+            id(self.orchestration_agent), id(self.action_agent), id(self.response_agent), id(self.tool_tracker)
+        )
+        cached_at, cached_key, cached_results = self._validation_cache
+        if cached_results is not None and cached_key == components_key and now - cached_at < _VALIDATION_CACHE_TTL_SECONDS:
+            # 검증 시각만 갱신한 사본 반환 (components 등 하위 값은 읽기 전용으로 공유)
+            validation_results = cached_results.copy()
+            validation_results["validation_timestamp"] = datetime.now().isoformat()
+            return validation_results
+        
         validation_results = {
             "system_status": "healthy",
             "components": {},
@@ -500,8 +1064,19 @@ class ImprovedReActAgent:
             validation_results["system_status"] = "error"
             validation_results["error"] = str(e)
         
+        self._validation_cache = (now, components_key, validation_results.copy())
         return validation_results
 
 
-# 전역 개선된 ReAct Agent 인스턴스
-improved_react_agent = ImprovedReActAgent()
+# 전역 개선된 ReAct Agent 인스턴스 (첫 사용 시 생성)
+@lru_cache(maxsize=1)
+def get_improved_react_agent() -> ImprovedReActAgent:
+    """전역 개선된 ReAct Agent 반환"""
+    return ImprovedReActAgent()
+
+
+def __getattr__(name: str):
+    # 기존 `from ... import improved_react_agent` 사용처 호환 (모듈 import만으로는 Agent를 생성하지 않음)
+    if name == "improved_react_agent":
+        return get_improved_react_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -10,6 +10,7 @@ from datetime import datetime
 import re
 
 from config.settings import settings
+from src.utils.bedrock import bedrock_runtime_config
 from src.utils.logger import agent_logger
 from src.utils.session import ChatSession, Message
 from src.utils.citation import CitationCollection, CitationProcessor
@@ -35,7 +36,8 @@ class ImprovedResponseAgent:
         try:
             self.bedrock_runtime = boto3.client(
                 'bedrock-runtime',
-                region_name=self.region
+                region_name=self.region,
+                config=bedrock_runtime_config()
             )
             
             # 토큰 계산용 인코더 초기화 (안전 처리)
@@ -3,9 +3,13 @@ Bedrock Knowledge Base MCP 클라이언트
 KB 검색 기능과 Citation 생성을 담당합니다.
 """
 
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Union
 import time
 from datetime import datetime
 
@@ -22,11 +26,26 @@ class BedrockKBClient:
         self.region = region or settings.knowledge_base.region
         
         try:
+            # 연결 풀/keep-alive 설정으로 동시 검색 시 TLS 연결을 재사용
+            client_config = Config(
+                max_pool_connections=settings.knowledge_base.max_pool_connections,
+                tcp_keepalive=True,
+                retries={
+                    "mode": "adaptive",
+                    "max_attempts": settings.knowledge_base.max_retry_attempts
+                }
+            )
             self.bedrock_agent_runtime = boto3.client(
                 'bedrock-agent-runtime',
-                region_name=self.region
+                region_name=self.region,
+                config=client_config
             )
             mcp_logger.log_mcp_call("bedrock_client_init", {"kb_id": self.kb_id}, "success")
+            
+            # batch_search용 워커 (호출마다 스레드를 새로 띄우지 않고 재사용, 동시 검색 수는 max_concurrency로 제한)
+            self._batch_pool_lock = threading.Lock()
+            self._batch_pool: Optional[ThreadPoolExecutor] = None
+            self._get_batch_pool()
         except NoCredentialsError:
             mcp_logger.log_error(
                 Exception("AWS credentials not found"), 
@@ -112,6 +131,73 @@ class BedrockKBClient:
             mcp_logger.log_error(e, "kb_search")
             raise
     
+    async def asearch_knowledge_base(
+        self,
+        query: str,
+        max_results: Optional[int] = None,
+        search_type: Optional[str] = None,
+        filter_criteria: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[Dict[str, Any]], float]:
+        """
+        Knowledge Base 검색 (비동기)
+        
+        블로킹 boto3 호출을 워커 스레드에서 실행하여 여러 검색을 동시에 진행할 수 있도록 함
+        """
+        return await asyncio.to_thread(
+            self.search_knowledge_base,
+            query=query,
+            max_results=max_results,
+            search_type=search_type,
+            filter_criteria=filter_criteria
+        )
+    
+    def batch_search(
+        self,
+        queries: List[str],
+        max_results_each: Optional[int] = None,
+        search_type: Optional[str] = None
+    ) -> List[Union[Tuple[List[Dict[str, Any]], float], Exception]]:
+        """
+        여러 쿼리를 동시에 검색 (Bedrock Retrieve API는 다중 쿼리 호출을 지원하지 않으므로
+        같은 클라이언트의 연결 풀을 공유하는 워커 스레드로 병렬 요청)
+        
+        워커 풀은 클라이언트 단위로 공유되므로 동시 검색 수 제한(max_concurrency)은 모든 batch_search 호출에 함께 적용
+        
+        Returns:
+            쿼리 순서대로 (검색 결과, 검색 시간) 또는 실패한 경우 예외 객체
+        """
+        if not queries:
+            return []
+        
+        def search(query: str) -> Union[Tuple[List[Dict[str, Any]], float], Exception]:
+            try:
+                return self.search_knowledge_base(
+                    query=query,
+                    max_results=max_results_each,
+                    search_type=search_type
+                )
+            except Exception as e:
+                return e
+        
+        return list(self._get_batch_pool().map(search, queries))
+    
+    def _get_batch_pool(self) -> ThreadPoolExecutor:
+        """batch_search용 스레드 풀 반환 (close() 이후 호출되면 다시 생성)"""
+        with self._batch_pool_lock:
+            if self._batch_pool is None:
+                self._batch_pool = ThreadPoolExecutor(
+                    max_workers=max(1, settings.knowledge_base.max_concurrency),
+                    thread_name_prefix="kb-batch-search"
+                )
+            return self._batch_pool
+    
+    def close(self):
+        """batch_search용 스레드 풀 종료 (공유 클라이언트이므로 이후 batch_search 호출 시 풀을 다시 생성)"""
+        with self._batch_pool_lock:
+            batch_pool, self._batch_pool = self._batch_pool, None
+        if batch_pool is not None:
+            batch_pool.shutdown(wait=False)
+    
     def search_and_create_citations(
         self,
         query: str,
@@ -133,21 +219,23 @@ class BedrockKBClient:
             filter_criteria=filter_criteria
         )
         
-        # Citation 생성
+        return self._create_citations(kb_results), search_time
+    
+    def _create_citations(self, kb_results: List[Dict[str, Any]]) -> CitationCollection:
+        """KB 검색 결과에서 중복 제거된 CitationCollection 생성"""
         citations = CitationCollection()
         
-        for result in kb_results:
-            try:
-                # KB 결과에서 Citation 생성 (이미지 지원 포함)
-                citation = Citation.from_kb_result(result)
+        # KB 결과에서 Citation 일괄 생성 (이미지 지원 포함, 실패 항목은 None)
+        converted, errors = Citation.from_kb_result_batch(kb_results, as_dict=False)
+        if errors:
+            mcp_logger.log_error(
+                Exception(f"Failed to create citation from KB result: {errors[0]}"),
+                f"citation_creation ({len(errors)}/{len(kb_results)} failed)"
+            )
+        
+        for citation in converted:
+            if citation is not None:
                 citations.add_citation(citation)
-                
-            except Exception as e:
-                mcp_logger.log_error(
-                    Exception(f"Failed to create citation from KB result: {e}"),
-                    "citation_creation"
-                )
-                continue
         
         # 중복 제거 및 정리
         citations.remove_duplicates()
@@ -158,7 +246,7 @@ class BedrockKBClient:
             len(kb_results) - len(citations)  # 제거된 중복 수
         )
         
-        return citations, search_time
+        return citations
     
     def multi_query_search(
         self,
@@ -186,13 +274,20 @@ class BedrockKBClient:
             "started"
         )
         
-        for i, query in enumerate(queries):
+        # 쿼리별 KB 검색은 동시에 수행하고 Citation 생성은 쿼리 순서대로 처리
+        start_time = time.time()
+        batch_results = self.batch_search(
+            queries,
+            max_results_each=max_results_per_query,
+            search_type=search_type
+        )
+        
+        for i, (query, batch_result) in enumerate(zip(queries, batch_results)):
             try:
-                citations, search_time = self.search_and_create_citations(
-                    query=query,
-                    max_results=max_results_per_query,
-                    search_type=search_type
-                )
+                if isinstance(batch_result, Exception):
+                    raise batch_result
+                kb_results, search_time = batch_result
+                citations = self._create_citations(kb_results)
                 
                 # Citation에 쿼리 정보 추가
                 for citation in citations:
@@ -214,7 +309,8 @@ class BedrockKBClient:
         all_citations.remove_duplicates()
         all_citations.merge_similar_citations()
         
-        total_time = sum(search_times)
+        # 동시 검색이므로 쿼리별 시간의 합이 아닌 실제 경과 시간 기록
+        total_time = time.time() - start_time
         mcp_logger.log_performance(
             "multi_query_search",
             total_time,
@@ -5,8 +5,9 @@ MCP Tool 호출을 추적하고 UI에 표시할 메시지를 생성하는 모듈
 
 from typing import Dict, Any, List, Optional, Callable
 from datetime import datetime
+import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 
 from src.utils.logger import mcp_logger
@@ -33,6 +34,8 @@ class ToolCallInfo:
     result: Optional[Dict[str, Any]] = None
     error_message: Optional[str] = None
     ui_message: Optional[str] = None
+    # 호출별 UI 콜백 (동시에 처리 중인 요청끼리 이벤트가 섞이지 않도록 호출 시작 시 지정)
+    ui_callback: Optional[Callable] = field(default=None, repr=False, compare=False)
     
     def get_duration(self) -> float:
         """호출 소요 시간 반환"""
@@ -67,6 +70,14 @@ class ToolCallInfo:
                 "search_time": self.result.get("search_time", 0)
             }
         
+        if self.tool_name == "kb_batch_search":
+            return {
+                "query_count": self.result.get("query_count", 0),
+                "successful_queries": self.result.get("successful_queries", 0),
+                "citation_count": len(self.result.get("citations", [])),
+                "search_time": self.result.get("search_time", 0)
+            }
+        
         return {"status": self.result.get("status", "unknown")}
 
 
@@ -78,18 +89,30 @@ class MCPToolCallTracker:
         self.completed_calls: List[ToolCallInfo] = []
         self.ui_callback: Optional[Callable] = None
         self.call_counter = 0
+        self._lock = threading.Lock()  # 동시 요청의 호출 ID 발급/활성 호출 갱신 보호
         
         mcp_logger.log_mcp_call("tool_call_tracker_init", {}, "success")
     
     def set_ui_callback(self, callback: Callable[[str, Dict[str, Any]], None]):
-        """UI 업데이트 콜백 설정"""
+        """
+        기본 UI 업데이트 콜백 설정
+        
+        모든 호출에 공유되므로 요청이 동시에 처리될 수 있으면 start_tool_call의 ui_callback을 사용
+        """
         self.ui_callback = callback
     
+    def _notify(self, call_info: ToolCallInfo, update_type: str):
+        """호출에 지정된 UI 콜백(없으면 기본 콜백)으로 업데이트 전달"""
+        ui_callback = call_info.ui_callback or self.ui_callback
+        if ui_callback:
+            ui_callback(update_type, call_info.to_dict())
+    
     def start_tool_call(
         self,
         tool_name: str,
         parameters: Dict[str, Any],
-        stage: str = "search"
+        stage: str = "search",
+        ui_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None
     ) -> str:
         """
         Tool 호출 시작 추적
@@ -98,12 +121,14 @@ class MCPToolCallTracker:
             tool_name: 호출할 도구 이름
             parameters: 도구 파라미터
             stage: 호출 단계 (primary_search, additional_search_1, etc.)
+            ui_callback: 이 호출의 시작/완료/실패 이벤트를 받을 UI 콜백 (없으면 기본 콜백)
             
         Returns:
             호출 ID
         """
-        self.call_counter += 1
-        call_id = f"call_{self.call_counter}_{int(time.time() * 1000)}"
+        with self._lock:
+            self.call_counter += 1
+            call_id = f"call_{self.call_counter}_{int(time.time() * 1000)}"
         
         # UI 메시지 생성
         ui_message = self._generate_ui_message(tool_name, parameters, stage, "start")
@@ -116,14 +141,15 @@ class MCPToolCallTracker:
             stage=stage,
             status=ToolCallStatus.RUNNING,
             start_time=datetime.now(),
-            ui_message=ui_message
+            ui_message=ui_message,
+            ui_callback=ui_callback
         )
         
-        self.active_calls[call_id] = call_info
+        with self._lock:
+            self.active_calls[call_id] = call_info
         
         # UI 업데이트
-        if self.ui_callback:
-            self.ui_callback("tool_call_start", call_info.to_dict())
+        self._notify(call_info, "tool_call_start")
         
         mcp_logger.log_mcp_call(
             "tool_call_start",
@@ -144,10 +170,11 @@ class MCPToolCallTracker:
         result: Dict[str, Any]
     ):
         """Tool 호출 완료 처리"""
-        if call_id not in self.active_calls:
+        with self._lock:
+            call_info = self.active_calls.pop(call_id, None)
+        if call_info is None:
             return
         
-        call_info = self.active_calls[call_id]
         call_info.status = ToolCallStatus.COMPLETED
         call_info.end_time = datetime.now()
         call_info.result = result
@@ -164,11 +191,10 @@ class MCPToolCallTracker:
         
         # 완료된 호출로 이동
         self.completed_calls.append(call_info)
-        del self.active_calls[call_id]
         
         # UI 업데이트
-        if self.ui_callback:
-            self.ui_callback("tool_call_complete", call_info.to_dict())
+        self._notify(call_info, "tool_call_complete")
+        call_info.ui_callback = None  # 완료 기록이 요청별 콜백(작업 이벤트 목록 등)을 계속 참조하지 않도록 해제
         
         mcp_logger.log_mcp_call(
             "tool_call_complete",
@@ -186,10 +212,11 @@ class MCPToolCallTracker:
         error_message: str
     ):
         """Tool 호출 실패 처리"""
-        if call_id not in self.active_calls:
+        with self._lock:
+            call_info = self.active_calls.pop(call_id, None)
+        if call_info is None:
             return
         
-        call_info = self.active_calls[call_id]
         call_info.status = ToolCallStatus.FAILED
         call_info.end_time = datetime.now()
         call_info.error_message = error_message
@@ -206,11 +233,10 @@ class MCPToolCallTracker:
         
         # 완료된 호출로 이동
         self.completed_calls.append(call_info)
-        del self.active_calls[call_id]
         
         # UI 업데이트
-        if self.ui_callback:
-            self.ui_callback("tool_call_failed", call_info.to_dict())
+        self._notify(call_info, "tool_call_failed")
+        call_info.ui_callback = None  # 완료 기록이 요청별 콜백(작업 이벤트 목록 등)을 계속 참조하지 않도록 해제
         
         mcp_logger.log_mcp_call(
             "tool_call_failed",
@@ -222,6 +248,59 @@ class MCPToolCallTracker:
             "error"
         )
     
+    def track_batch_search(
+        self,
+        queries: List[str],
+        stage_results: List[Dict[str, Any]],
+        max_results: int = 20,
+        stage: str = "additional_search_batch",
+        ui_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None
+    ) -> str:
+        """
+        동시에 실행된 여러 KB 검색을 하나의 Tool 호출로 기록
+        
+        쿼리마다 호출을 따로 기록하지 않으므로 UI 업데이트/로그도 한 번씩만 발생
+        
+        Args:
+            queries: 검색 쿼리 목록
+            stage_results: 쿼리별 검색 결과 (status, citations, search_time 포함)
+            max_results: 쿼리당 최대 결과 수
+            stage: 호출 단계
+            ui_callback: 이 호출의 UI 콜백 (없으면 기본 콜백)
+            
+        Returns:
+            호출 ID
+        """
+        call_id = self.start_tool_call(
+            tool_name="kb_batch_search",
+            parameters={
+                "queries": queries,
+                "max_results": max_results,
+                "search_type": "HYBRID"
+            },
+            stage=stage,
+            ui_callback=ui_callback
+        )
+        
+        successful_results = [result for result in stage_results if result.get("status") == "success"]
+        if stage_results and not successful_results:
+            self.fail_tool_call(call_id, stage_results[0].get("error", "All searches failed"))
+            return call_id
+        
+        citations = []
+        for result in successful_results:
+            citations.extend(result.get("citations", []))
+        
+        # 동시 실행이므로 전체 소요 시간은 가장 오래 걸린 검색 기준
+        self.complete_tool_call(call_id, {
+            "status": "success" if len(successful_results) == len(stage_results) else "partial",
+            "citations": citations,
+            "query_count": len(stage_results),
+            "successful_queries": len(successful_results),
+            "search_time": max((result.get("search_time", 0) for result in successful_results), default=0)
+        })
+        return call_id
+    
     def _generate_ui_message(
         self,
         tool_name: str,
@@ -241,6 +320,7 @@ class MCPToolCallTracker:
             "additional_search_3": {"icon": "🔍", "desc": "추가 검색 3"},
             "additional_search_4": {"icon": "🔍", "desc": "추가 검색 4"},
             "additional_search_5": {"icon": "🔍", "desc": "추가 검색 5"},
+            "additional_search_batch": {"icon": "🔍", "desc": "추가 검색"},
             "rerank": {"icon": "📊", "desc": "결과 재정렬"},
             "integration": {"icon": "🔗", "desc": "결과 통합"}
         }
@@ -262,6 +342,19 @@ class MCPToolCallTracker:
             elif action == "fail":
                 return f"❌ {desc} 실패: {error_message}"
         
+        elif tool_name == "kb_batch_search":
+            query_count = len(parameters.get("queries", []))
+            
+            if action == "start":
+                return f"{icon} {desc}: {query_count}개 쿼리로 KB 동시 검색 중..."
+            elif action == "complete" and result:
+                citation_count = len(result.get("citations", []))
+                successful_queries = result.get("successful_queries", 0)
+                search_time = result.get("search_time", 0)
+                return f"✅ {desc} 완료: {successful_queries}/{query_count}개 쿼리, {citation_count}개 결과 ({search_time:.1f}초)"
+            elif action == "fail":
+                return f"❌ {desc} 실패: {error_message}"
+        
         elif tool_name == "rerank":
             if action == "start":
                 return f"{icon} {desc}: 검색 결과 재정렬 중..."
@@ -292,6 +385,8 @@ class MCPToolCallTracker:
                 summary[key] = value
             elif key == "search_type":
                 summary[key] = value
+            elif key == "queries" and isinstance(value, list):
+                summary[key] = len(value)
             else:
                 summary[key] = str(type(value).__name__)
         
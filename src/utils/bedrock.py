@@ -0,0 +1,27 @@
+"""
+Bedrock Runtime 클라이언트 설정
+에이전트별 Bedrock Runtime 클라이언트가 같은 연결 풀/재시도 설정을 사용하도록 한 곳에서 생성
+"""
+
+from typing import Optional
+
+from botocore.config import Config
+
+from config.settings import settings
+
+
+def bedrock_runtime_config(max_pool_connections: Optional[int] = None) -> Config:
+    """
+    Bedrock Runtime 클라이언트 설정 (settings.model 기준)
+    
+    Args:
+        max_pool_connections: 연결 풀 크기 (미지정 시 settings.model.max_pool_connections)
+    """
+    return Config(
+        max_pool_connections=max_pool_connections or settings.model.max_pool_connections,
+        tcp_keepalive=True,
+        retries={
+            "mode": "adaptive",
+            "max_attempts": settings.model.max_retry_attempts
+        }
+    )
@@ -0,0 +1,157 @@
+"""
+캐시 유틸리티
+TTL 만료와 LRU 방출을 지원하는 스레드 안전 인메모리 캐시
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional
+
+import numpy as np
+
+
+class TTLCache:
+    """TTL + LRU 인메모리 캐시 (스레드 안전)"""
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """캐시 조회 (만료된 항목은 제거 후 default 반환)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return default
+
+            # 최근 사용 항목으로 이동
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """캐시 저장 (최대 크기 초과 시 가장 오래 사용되지 않은 항목부터 제거)"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """전체 캐시 무효화"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계 반환"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total * 100, 1) if total else 0.0
+        }
+
+
+class SemanticCache:
+    """
+    임베딩 코사인 유사도 기반 인메모리 캐시 (스레드 안전)
+    
+    같은 context_key로 저장된 항목 중 유사도가 threshold 이상인 가장 가까운 항목을 반환하며,
+    최대 크기를 넘으면 가장 오래된 항목부터 제거
+    """
+
+    def __init__(self, threshold: float = 0.9, max_entries: int = 1024, ttl_seconds: float = 600.0):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._vectors: List[np.ndarray] = []
+        self._entries: List[tuple] = []  # (만료 시각, context_key, value)
+        self._matrix: Optional[np.ndarray] = None  # _vectors를 쌓은 행렬 (추가 시 무효화)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize(embedding: Any) -> Optional[np.ndarray]:
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(vector))
+        if not norm:
+            return None
+        return vector / norm
+
+    def get(self, embedding: Any, context_key: Hashable = None, default: Any = None) -> Any:
+        """유사 항목 조회 (context_key가 다른 항목은 유사도와 무관하게 제외)"""
+        query = self._normalize(embedding)
+        with self._lock:
+            if query is None or not self._vectors:
+                self.misses += 1
+                return default
+            
+            if self._matrix is None:
+                self._matrix = np.vstack(self._vectors)
+            if self._matrix.shape[1] != query.shape[0]:
+                self.misses += 1
+                return default
+            
+            now = time.monotonic()
+            scores = self._matrix @ query
+            for index in np.argsort(-scores):
+                if scores[index] < self.threshold:
+                    break
+                expires_at, entry_context, value = self._entries[index]
+                if entry_context == context_key and expires_at >= now:
+                    self.hits += 1
+                    return value
+            
+            self.misses += 1
+            return default
+
+    def put(self, embedding: Any, value: Any, context_key: Hashable = None) -> None:
+        """항목 저장"""
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+        with self._lock:
+            self._vectors.append(vector)
+            self._entries.append((time.monotonic() + self.ttl_seconds, context_key, value))
+            if len(self._vectors) > self.max_entries:
+                overflow = len(self._vectors) - self.max_entries
+                del self._vectors[:overflow]
+                del self._entries[:overflow]
+            self._matrix = None
+
+    def clear(self) -> None:
+        """전체 캐시 무효화"""
+        with self._lock:
+            self._vectors.clear()
+            self._entries.clear()
+            self._matrix = None
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계 반환"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._vectors),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total * 100, 1) if total else 0.0
+        }
@@ -4,12 +4,75 @@ RAG 검색 결과의 출처 정보를 관리하고 처리합니다.
 """
 
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Union, Tuple
 from datetime import datetime
+from functools import lru_cache
 import hashlib
 import json
 import re
-from urllib.parse import urlparse
+from urllib.parse import urlparse, unquote
+
+import numpy as np
+
+# xxhash 안전 import (없으면 hashlib.blake2b 사용)
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+# numba 안전 import (없으면 numpy 교집합 사용)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _sorted_intersection_size(a, b):
+        """정렬된 고유값 배열 두 개의 교집합 크기 (two-pointer 병합)"""
+        i = 0
+        j = 0
+        count = 0
+        while i < a.size and j < b.size:
+            if a[i] == b[j]:
+                count += 1
+                i += 1
+                j += 1
+            elif a[i] < b[j]:
+                i += 1
+            else:
+                j += 1
+        return count
+else:
+    def _sorted_intersection_size(a: np.ndarray, b: np.ndarray) -> int:
+        """정렬된 고유값 배열 두 개의 교집합 크기"""
+        return np.intersect1d(a, b, assume_unique=True).size
+
+
+def make_citation_id(document_uri: str, chunk_text: str) -> str:
+    """문서 URI와 chunk 앞부분으로 12자리 Citation ID 생성 (비암호화 용도)"""
+    content = f"{document_uri}:{chunk_text[:100]}".encode()
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_64_hexdigest(content)[:12]
+    return hashlib.blake2b(content, digest_size=6).hexdigest()
+
+
+@lru_cache(maxsize=4096)
+def s3_document_title(document_uri: str) -> str:
+    """S3 URI의 파일명(URL 디코딩)을 문서 제목으로 반환 (같은 문서가 여러 검색 단계에 반복되므로 캐시)"""
+    if document_uri and document_uri.startswith('s3://'):
+        filename = document_uri.split('/')[-1]
+        if filename and '.' in filename:
+            # URL 디코딩이 필요한 경우 처리
+            try:
+                filename = unquote(filename)
+            except:
+                pass
+            return filename
+    return "Unknown Document"
 
 
 @dataclass
@@ -70,8 +133,7 @@ class Citation:
         """Citation ID 자동 생성 및 컨텐츠 타입 결정"""
         if not self.id:
             # 문서 URI와 chunk 텍스트 기반으로 고유 ID 생성
-            content = f"{self.document_uri}:{self.chunk_text[:100]}"
-            self.id = hashlib.md5(content.encode()).hexdigest()[:12]
+            self.id = make_citation_id(self.document_uri, self.chunk_text)
         
         # 컨텐츠 타입 자동 결정
         if self.images and self.chunk_text.strip():
@@ -129,9 +191,8 @@ class Citation:
         metadata = kb_result.get('metadata', {})
         location = kb_result.get('location', {})
         
-        # S3 URI에서 파일명 추출 (우선순위 순서)
+        # S3 URI 추출 (우선순위 순서)
         document_uri = ""
-        document_title = "Unknown Document"
         
         # 1. location에서 S3 URI 추출 (가장 신뢰할 수 있는 소스)
         if location and 's3Location' in location:
@@ -142,16 +203,7 @@ class Citation:
             document_uri = metadata.get('x-amz-bedrock-kb-source-uri', '')
         
         # 3. 파일명을 제목으로 사용
-        if document_uri and document_uri.startswith('s3://'):
-            filename = document_uri.split('/')[-1]
-            if filename and '.' in filename:
-                # URL 디코딩이 필요한 경우 처리
-                try:
-                    from urllib.parse import unquote
-                    filename = unquote(filename)
-                except:
-                    pass
-                document_title = filename
+        document_title = s3_document_title(document_uri)
         
         # 페이지 번호 추출 (올바른 키 사용)
         page_number = metadata.get('x-amz-bedrock-kb-document-page-number')
@@ -177,6 +229,70 @@ class Citation:
         
         return citation
     
+    @classmethod
+    def from_kb_result_batch(
+        cls,
+        kb_results: List[Dict[str, Any]],
+        confidence_score: float = 0.0,
+        as_dict: bool = True
+    ) -> Tuple[List[Optional[Union['Citation', Dict[str, Any]]]], List[Exception]]:
+        """
+        KB 검색 결과 목록을 Citation 딕셔너리(as_dict=False면 Citation 객체) 목록으로 일괄 변환
+        
+        변환에 실패한 항목은 예외를 전파하지 않고 None으로 채우며,
+        발생한 예외는 별도 목록으로 반환하여 호출 측에서 한 번에 처리하도록 함
+        """
+        if as_dict:
+            from_kb_result = lambda kb_result, score: cls.from_kb_result(kb_result, score).to_dict()
+        else:
+            from_kb_result = cls.from_kb_result
+        is_valid = cls._is_valid_kb_result
+        citations: List[Optional[Union['Citation', Dict[str, Any]]]] = []
+        errors: List[Exception] = []
+        
+        # 구조 검증을 통과한 항목은 항목별 예외 처리 없이 변환
+        try:
+            for kb_result in kb_results:
+                if is_valid(kb_result):
+                    citations.append(from_kb_result(kb_result, confidence_score))
+                else:
+                    citations.append(None)
+                    errors.append(ValueError("invalid KB result structure"))
+            return citations, errors
+        except Exception:
+            pass
+        
+        # 검증을 통과했는데도 예외가 발생한 경우에만 항목별로 다시 처리
+        citations = []
+        errors = []
+        for kb_result in kb_results:
+            try:
+                citations.append(from_kb_result(kb_result, confidence_score))
+            except Exception as e:
+                citations.append(None)
+                errors.append(e)
+        
+        return citations, errors
+    
+    @staticmethod
+    def _is_valid_kb_result(kb_result: Any) -> bool:
+        """from_kb_result로 변환 가능한 구조인지 사전 검증"""
+        if not isinstance(kb_result, dict):
+            return False
+        
+        content = kb_result.get('content', {})
+        metadata = kb_result.get('metadata', {})
+        location = kb_result.get('location', {})
+        
+        if not isinstance(content, dict) or not isinstance(content.get('text', ''), str):
+            return False
+        if not isinstance(metadata, dict):
+            return False
+        if location and not (isinstance(location, dict) and isinstance(location.get('s3Location', {}), dict)):
+            return False
+        
+        return True
+    
     @classmethod
     def _extract_images_from_kb_result(cls, citation: 'Citation', kb_result: Dict[str, Any]) -> None:
         """KB 결과에서 이미지 정보 추출"""
@@ -291,9 +407,14 @@ class CitationCollection:
     
     def merge_similar_citations(self, similarity_threshold: float = 0.8) -> None:
         """유사한 Citation 병합"""
-        # 간단한 텍스트 유사도 기반 병합 (향후 개선 가능)
+        # 같은 문서 URI 안에서만 비교하므로 URI별로 묶어 둠 (원래 순서 유지)
+        by_uri: Dict[str, List[Citation]] = {}
+        for citation in self.citations:
+            by_uri.setdefault(citation.document_uri, []).append(citation)
+        
         merged = []
         processed_ids = set()
+        signatures: Dict[str, np.ndarray] = {}
         
         for citation in self.citations:
             if citation.id in processed_ids:
@@ -303,13 +424,16 @@ class CitationCollection:
             similar_citations = [citation]
             processed_ids.add(citation.id)
             
-            for other in self.citations:
+            for other in by_uri[citation.document_uri]:
                 if other.id in processed_ids:
                     continue
                 
-                # 간단한 유사도 계산 (문서 URI와 텍스트 유사도)
-                if (citation.document_uri == other.document_uri and 
-                    self._calculate_text_similarity(citation.chunk_text, other.chunk_text) > similarity_threshold):
+                # 문서 URI가 같고 텍스트 유사도가 임계값을 넘는 경우
+                if self._signature_similarity(
+                    self._get_signature(citation, signatures),
+                    self._get_signature(other, signatures),
+                    similarity_threshold
+                ) > similarity_threshold:
                     similar_citations.append(other)
                     processed_ids.add(other.id)
             
@@ -319,19 +443,38 @@ class CitationCollection:
         
         self.citations = merged
     
-    def _calculate_text_similarity(self, text1: str, text2: str) -> float:
-        """간단한 텍스트 유사도 계산"""
-        # Jaccard 유사도 사용
-        words1 = set(text1.lower().split())
-        words2 = set(text2.lower().split())
+    @staticmethod
+    def _word_signature(text: str) -> np.ndarray:
+        """소문자 단어 집합의 해시값을 정렬된 정수 배열로 변환"""
+        return np.unique(np.fromiter((hash(word) for word in text.lower().split()), dtype=np.int64))
+    
+    def _get_signature(self, citation: Citation, signatures: Dict[str, np.ndarray]) -> np.ndarray:
+        """Citation별 단어 집합 시그니처 (병합 1회 동안 캐시)"""
+        signature = signatures.get(citation.id)
+        if signature is None:
+            signature = self._word_signature(citation.chunk_text)
+            signatures[citation.id] = signature
+        return signature
+    
+    @staticmethod
+    def _signature_similarity(sig1: np.ndarray, sig2: np.ndarray, threshold: float = 0.0) -> float:
+        """
+        정렬된 해시 배열 간 Jaccard 유사도
         
-        if not words1 and not words2:
+        Jaccard는 min/max 크기 비율을 넘을 수 없으므로 비율이 threshold 이하이면 교집합 계산 생략
+        """
+        size1, size2 = sig1.size, sig2.size
+        if not size1 and not size2:
             return 1.0
+        if min(size1, size2) <= threshold * max(size1, size2):
+            return min(size1, size2) / max(size1, size2)
         
-        intersection = words1.intersection(words2)
-        union = words1.union(words2)
-        
-        return len(intersection) / len(union) if union else 0.0
+        intersection = _sorted_intersection_size(sig1, sig2)
+        return intersection / (size1 + size2 - intersection)
+    
+    def _calculate_text_similarity(self, text1: str, text2: str) -> float:
+        """간단한 텍스트 유사도 계산 (단어 집합 Jaccard)"""
+        return self._signature_similarity(self._word_signature(text1), self._word_signature(text2))
     
     def to_dict(self) -> Dict[str, Any]:
         """딕셔너리로 변환"""
@@ -0,0 +1,89 @@
+"""
+쿼리 임베딩 유틸리티
+시맨틱 캐시에서 사용하는 Titan 텍스트 임베딩 (결과 캐시 포함)
+"""
+
+import hashlib
+import time
+from typing import List, Optional
+
+import boto3
+
+from config.settings import settings
+from src.utils.bedrock import bedrock_runtime_config
+from src.utils.logger import agent_logger
+from src.utils.cache import TTLCache
+from src.utils.json_utils import json_dumps, json_loads
+
+# 호출 실패 후 임베딩을 건너뛰는 시간 (연속 실패 시 두 배씩 늘려 최대값까지)
+_FAILURE_COOLDOWN_SECONDS = 5.0
+_MAX_FAILURE_COOLDOWN_SECONDS = 300.0
+
+
+class QueryEmbedder:
+    """Titan 임베딩 클라이언트 (같은 텍스트는 캐시에서 반환, 호출 실패 시 잠시 건너뜀)"""
+
+    def __init__(self, model_id: Optional[str] = None, region: Optional[str] = None):
+        self.model_id = model_id or settings.model.embedding_model_id
+        self.region = region or settings.model.region
+        self.enabled = True  # False면 임베딩을 사용하지 않음 (수동 비활성화용)
+        self._consecutive_failures = 0
+        self._retry_after = 0.0  # 이 시각(monotonic) 전까지는 호출하지 않음
+        self._bedrock_runtime = None  # 첫 호출 시 생성
+        self._embedding_cache = TTLCache(
+            max_entries=settings.model.analysis_cache_max_entries,
+            ttl_seconds=settings.model.analysis_cache_ttl_seconds
+        )
+
+    @property
+    def bedrock_runtime(self):
+        """Bedrock Runtime 클라이언트 (지연 생성)"""
+        if self._bedrock_runtime is None:
+            self._bedrock_runtime = boto3.client(
+                'bedrock-runtime',
+                region_name=self.region,
+                config=bedrock_runtime_config()
+            )
+        return self._bedrock_runtime
+
+    def embed(self, text: str) -> Optional[List[float]]:
+        """
+        텍스트 임베딩 (실패 시 None 반환)
+
+        스로틀링/타임아웃 같은 일시적 실패가 매 요청 지연으로 이어지지 않도록
+        실패 후 일정 시간(연속 실패 시 점점 길게)은 호출 없이 None을 반환하고 이후 다시 시도
+        """
+        if not self.enabled or time.monotonic() < self._retry_after:
+            return None
+
+        cache_key = hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+        embedding = self._embedding_cache.get(cache_key)
+        if embedding is not None:
+            return embedding
+
+        try:
+            request = {"inputText": text, "normalize": True}
+            response = self.bedrock_runtime.invoke_model(
+                modelId=self.model_id,
+                body=json_dumps(request),
+                contentType='application/json',
+                accept='application/json'
+            )
+            body = response['body'].read()
+            embedding = json_loads(body)['embedding']
+        except Exception as e:
+            agent_logger.log_error(e, "query_embedding")
+            self._consecutive_failures += 1
+            cooldown = min(
+                _FAILURE_COOLDOWN_SECONDS * 2 ** (self._consecutive_failures - 1), _MAX_FAILURE_COOLDOWN_SECONDS
+            )
+            self._retry_after = time.monotonic() + cooldown
+            return None
+
+        self._consecutive_failures = 0
+        self._embedding_cache.put(cache_key, embedding)
+        return embedding
+
+
+# 전역 쿼리 임베딩 인스턴스
+query_embedder = QueryEmbedder()
@@ -0,0 +1,28 @@
+"""
+JSON 유틸리티
+orjson이 설치되어 있으면 사용하고, 없으면 표준 json으로 처리
+"""
+
+import json
+from typing import Any
+
+# orjson 안전 import (없으면 표준 json 사용)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def json_loads(data: Any) -> Any:
+    """JSON 파싱 (orjson이 있으면 사용 - bytes/str 모두 허용)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(data: Any) -> bytes:
+    """JSON 직렬화 (orjson이 있으면 사용 - UTF-8 bytes 반환)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
@@ -3,11 +3,13 @@
 프로젝트 전반에서 사용할 로깅 설정과 유틸리티 함수들
 """
 
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union, Callable
 from config.settings import settings
 
 
@@ -16,6 +18,7 @@ class Logger:
     
     _loggers = {}
     _initialized = False
+    _listener: Optional[logging.handlers.QueueListener] = None
     
     @classmethod
     def setup_logging(cls) -> None:
@@ -42,7 +45,6 @@ class Logger:
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.INFO)
         console_handler.setFormatter(formatter)
-        root_logger.addHandler(console_handler)
         
         # 파일 핸들러 (로테이션)
         file_handler = logging.handlers.RotatingFileHandler(
@@ -53,7 +55,20 @@ class Logger:
         )
         file_handler.setLevel(getattr(logging, settings.logging.level.upper()))
         file_handler.setFormatter(formatter)
-        root_logger.addHandler(file_handler)
+        
+        if settings.logging.async_logging:
+            # 호출 스레드는 큐에 레코드만 넣고, 콘솔/파일 출력은 리스너 스레드에서 처리
+            log_queue = queue.SimpleQueue()
+            root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+            cls._listener = logging.handlers.QueueListener(
+                log_queue, console_handler, file_handler, respect_handler_level=True
+            )
+            cls._listener.start()
+            # 종료 시 남은 레코드 출력
+            atexit.register(cls._listener.stop)
+        else:
+            root_logger.addHandler(console_handler)
+            root_logger.addHandler(file_handler)
         
         cls._initialized = True
         
@@ -91,15 +106,38 @@ class StructuredLogger:
     def __init__(self, name: str):
         self.logger = get_logger(name)
     
-    def log_agent_action(self, agent_name: str, action: str, details: dict = None):
-        """Agent 액션 로깅"""
+    def is_enabled_for(self, level: int = logging.INFO) -> bool:
+        """해당 레벨 로그가 실제로 출력되는지 여부"""
+        return self.logger.isEnabledFor(level)
+    
+    def log_agent_action(
+        self,
+        agent_name: str,
+        action: str,
+        details: Union[dict, Callable[[], dict], None] = None
+    ):
+        """
+        Agent 액션 로깅
+        
+        details에 dict 대신 dict를 반환하는 callable을 전달하면
+        INFO 레벨이 비활성화된 경우 payload 구성 비용 없이 건너뜀
+        """
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        if callable(details):
+            details = details()
         message = f"[{agent_name}] {action}"
         if details:
+            # 소요 시간 등 float 값은 호출 측에서 반올림하지 않고 출력 시에만 소수점 3자리로 표시
+            if isinstance(details, dict):
+                details = {key: round(value, 3) if isinstance(value, float) else value for key, value in details.items()}
             message += f" - {details}"
         self.logger.info(message)
     
     def log_mcp_call(self, tool_name: str, parameters: dict, result_summary: str):
         """MCP 도구 호출 로깅"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         self.logger.info(f"MCP Call: {tool_name} | Params: {parameters} | Result: {result_summary}")
     
     def log_kb_search(self, query: str, result_count: int, search_time: float):
@@ -128,6 +166,8 @@ class StructuredLogger:
     
     def log_performance(self, operation: str, duration: float, details: dict = None):
         """성능 로깅"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         message = f"Performance: {operation} took {duration:.2f}s"
         if details:
             message += f" | {details}"
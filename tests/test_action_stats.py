@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+ImprovedActionAgent 실행 통계 누적값 확인 스크립트
+히스토리(최근 100개)에서 오래된 항목이 밀려날 때 누적 통계가 남은 항목 기준 값과 같은지 확인합니다.
+
+실행: python tests/test_action_stats.py (pytest로도 실행 가능, KB 호출 없음)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agents.action_improved import ImprovedActionAgent
+
+INTENTS = ("절차_문의", "규정_확인", "기술_질문")
+
+
+def _save(agent: ImprovedActionAgent, index: int):
+    """index에 따라 값이 달라지는 실행 결과 하나를 히스토리에 저장 (이진 소수로 정확히 표현되는 값 사용)"""
+    analysis_result = {
+        "primary_intent": INTENTS[index % len(INTENTS)],
+        "complexity": "보통",
+        "requires_additional_search": index % 2 == 0
+    }
+    final_results = {
+        "search_stages": [{}] * (1 + index % 4),
+        "citations": [{}] * (index % 7),
+        "total_execution_time": (index % 8) * 0.25,
+        "quality_metrics": {"overall_quality": (index % 5) * 0.125},
+        "tool_call_statistics": {"tool_statistics": {}}
+    }
+    agent._save_enhanced_execution_history(analysis_result, final_results)
+
+
+def _expected_stats(history):
+    """남아 있는 히스토리 항목으로 직접 계산한 통계"""
+    count = len(history)
+    intent_stats = {}
+    for entry in history:
+        intent_total = intent_stats.setdefault(entry["primary_intent"], [0, 0.0])
+        intent_total[0] += 1
+        intent_total[1] += entry["overall_quality"]
+
+    return {
+        "total_executions": count,
+        "average_execution_time": round(sum(h["total_execution_time"] for h in history) / count, 3),
+        "average_citation_count": round(sum(h["final_citation_count"] for h in history) / count, 1),
+        "average_quality_score": round(sum(h["overall_quality"] for h in history) / count, 3),
+        "additional_search_rate": round(
+            sum(1 for h in history if h["requires_additional_search"]) / count * 100, 1
+        ),
+        "average_additional_searches": round(sum(h["additional_searches_performed"] for h in history) / count, 1),
+        "intent_statistics": {
+            intent: {"count": n, "avg_quality": round(quality / n, 3)}
+            for intent, (n, quality) in intent_stats.items()
+        }
+    }
+
+
+def _assert_stats_match(agent: ImprovedActionAgent):
+    stats = agent.get_enhanced_execution_stats()
+    expected = _expected_stats(list(agent.execution_history))
+    for key, value in expected.items():
+        assert stats[key] == value, f"{key}: {stats[key]} != {value}"
+
+
+def test_stats_before_history_is_full():
+    """히스토리가 가득 차기 전에는 저장된 모든 항목 기준"""
+    agent = ImprovedActionAgent()
+    assert agent.get_enhanced_execution_stats() == {"total_executions": 0}
+
+    for index in range(30):
+        _save(agent, index)
+    _assert_stats_match(agent)
+
+
+def test_stats_after_oldest_entries_are_evicted():
+    """가장 오래된 항목이 밀려나면 누적 통계에서도 제외"""
+    agent = ImprovedActionAgent()
+    maxlen = agent.execution_history.maxlen
+
+    for index in range(maxlen + 57):
+        _save(agent, index)
+        if index in (maxlen - 1, maxlen, maxlen + 56):
+            _assert_stats_match(agent)
+
+    assert len(agent.execution_history) == maxlen
+
+
+def test_intent_removed_when_all_entries_evicted():
+    """의도별 통계는 해당 의도의 항목이 모두 밀려나면 사라짐"""
+    agent = ImprovedActionAgent()
+    maxlen = agent.execution_history.maxlen
+
+    agent._save_enhanced_execution_history(
+        {"primary_intent": "일반_문의", "requires_additional_search": False},
+        {"search_stages": [{}], "citations": [], "total_execution_time": 1.0}
+    )
+    for index in range(maxlen):
+        _save(agent, index)
+
+    assert "일반_문의" not in agent.get_enhanced_execution_stats()["intent_statistics"]
+    _assert_stats_match(agent)
+
+
+def main():
+    """모든 테스트 실행"""
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failed}/{len(tests)} 통과")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+TTLCache / SemanticCache 동작 확인 스크립트
+만료(TTL), LRU 방출, 유사도 임계값/컨텍스트 구분을 확인합니다.
+
+실행: python tests/test_cache.py (pytest로도 실행 가능)
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.cache import TTLCache, SemanticCache
+
+
+def test_ttl_cache_expiry():
+    """TTL이 지난 항목은 default 반환 후 제거"""
+    cache = TTLCache(max_entries=10, ttl_seconds=0.05)
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+
+    time.sleep(0.1)
+    assert cache.get("a", "expired") == "expired"
+    assert len(cache) == 0
+    assert cache.get_stats()["hits"] == 1
+    assert cache.get_stats()["misses"] == 1
+
+
+def test_ttl_cache_lru_eviction():
+    """최대 크기를 넘으면 가장 오래 사용되지 않은 항목부터 제거"""
+    cache = TTLCache(max_entries=2, ttl_seconds=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")  # a를 최근 사용 항목으로 이동
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_put_refreshes_entry():
+    """같은 키를 다시 저장하면 값과 만료 시각이 갱신됨"""
+    cache = TTLCache(max_entries=2, ttl_seconds=0.1)
+    cache.put("a", 1)
+    time.sleep(0.06)
+    cache.put("a", 2)
+    time.sleep(0.06)
+    assert cache.get("a") == 2
+
+
+def test_semantic_cache_threshold_and_context():
+    """유사도 임계값 이상이면서 context_key가 같은 항목만 반환"""
+    cache = SemanticCache(threshold=0.9, max_entries=10, ttl_seconds=60)
+    cache.put([1.0, 0.0, 0.0], "x", context_key="kb1")
+
+    assert cache.get([0.99, 0.05, 0.0], context_key="kb1") == "x"
+    assert cache.get([0.99, 0.05, 0.0], context_key="kb2") is None  # 컨텍스트가 다름
+    assert cache.get([0.0, 1.0, 0.0], context_key="kb1") is None  # 유사도 미달
+    assert cache.get([0.0, 0.0, 0.0], context_key="kb1") is None  # 영벡터
+    assert cache.get([1.0, 0.0], context_key="kb1") is None  # 차원이 다름
+
+
+def test_semantic_cache_returns_closest_match():
+    """임계값을 넘는 항목이 여럿이면 가장 가까운 항목 반환"""
+    cache = SemanticCache(threshold=0.8, max_entries=10, ttl_seconds=60)
+    cache.put([1.0, 0.3], "far")
+    cache.put([1.0, 0.05], "near")
+    assert cache.get([1.0, 0.0]) == "near"
+
+
+def test_semantic_cache_expiry():
+    """만료된 항목은 유사해도 반환하지 않음"""
+    cache = SemanticCache(threshold=0.9, max_entries=10, ttl_seconds=0.05)
+    cache.put([1.0, 0.0], "x")
+    time.sleep(0.1)
+    assert cache.get([1.0, 0.0]) is None
+
+
+def test_semantic_cache_eviction():
+    """최대 크기를 넘으면 가장 오래된 항목부터 제거"""
+    cache = SemanticCache(threshold=0.99, max_entries=2, ttl_seconds=60)
+    cache.put([1.0, 0.0, 0.0], "a")
+    cache.put([0.0, 1.0, 0.0], "b")
+    cache.put([0.0, 0.0, 1.0], "c")
+
+    assert len(cache) == 2
+    assert cache.get([1.0, 0.0, 0.0]) is None
+    assert cache.get([0.0, 1.0, 0.0]) == "b"
+    assert cache.get([0.0, 0.0, 1.0]) == "c"
+
+
+def main():
+    """모든 테스트 실행"""
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failed}/{len(tests)} 통과")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+다단계 검색 Citation 중복 제거 동작 확인 스크립트
+근사/정확 중복 판정과 단계별 통합 중복 제거 결과를 확인합니다.
+
+실행: python tests/test_citation_dedup.py (pytest로도 실행 가능, KB 호출 없음)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agents.multi_stage_search import (
+    MultiStageSearchExecutor,
+    _CitationDeduplicator,
+    _SimHashIndex,
+    _exact_fingerprint,
+    _simhash64,
+    _hamming_distance,
+    SIMHASH_MAX_DISTANCE,
+)
+
+BASE_TEXT = (
+    "거푸집 동바리 설치 시 구조 검토를 실시하고 작업발판 일체형 거푸집은 "
+    "설계도서에 따라 조립하며 콘크리트 타설 전 관리감독자가 안전 상태를 확인해야 한다 "
+    "타설 중에는 거푸집의 변형 여부를 수시로 점검한다"
+)
+OTHER_TEXT = "철근 인장시험은 로트별로 시료를 채취하여 항복강도와 인장강도를 확인한다 합격 판정 기준은 KS 규격을 따른다"
+
+
+def _make_citation(citation_id: str, uri: str, preview: str, page_number=None):
+    return {"id": citation_id, "uri": uri, "preview": preview, "page_number": page_number}
+
+
+def _annotated(executor, *citations):
+    return executor._annotate_citations(list(citations))
+
+
+def test_simhash_near_duplicate():
+    """단어 하나만 다른 텍스트는 Hamming 거리 임계값 이내, 다른 텍스트는 임계값 초과"""
+    base_words = tuple(BASE_TEXT.lower().split())
+    near_words = tuple(BASE_TEXT.replace("수시로", "자주").lower().split())
+    other_words = tuple(OTHER_TEXT.lower().split())
+
+    assert _hamming_distance(_simhash64(base_words), _simhash64(near_words)) <= SIMHASH_MAX_DISTANCE
+    assert _hamming_distance(_simhash64(base_words), _simhash64(other_words)) > SIMHASH_MAX_DISTANCE
+    assert _simhash64(()) == 0
+
+
+def test_simhash_index_lookup():
+    """LSH 인덱스는 근사 중복만 찾고, 길이 차이가 큰 후보와 빈 지문은 제외"""
+    base_words = tuple(BASE_TEXT.lower().split())
+    near_words = tuple(BASE_TEXT.replace("수시로", "자주").lower().split())
+    other_words = tuple(OTHER_TEXT.lower().split())
+
+    index = _SimHashIndex()
+    index.add(_simhash64(base_words), len(base_words))
+
+    assert index.has_near_duplicate(_simhash64(near_words), len(near_words))
+    assert not index.has_near_duplicate(_simhash64(other_words), len(other_words))
+    assert not index.has_near_duplicate(_simhash64(base_words), len(base_words) * 2)  # 길이 비율 미달
+    assert not index.has_near_duplicate(0)
+
+
+def test_exact_fingerprint_normalization():
+    """정확 일치 지문은 공백/대소문자 차이를 무시"""
+    assert _exact_fingerprint(tuple("KS  Standard\ttest".lower().split())) == \
+        _exact_fingerprint(tuple("ks standard test".split()))
+    assert _exact_fingerprint(()) == 0
+
+
+def test_deduplicator_keeps_first_seen_in_stage_order():
+    """같은 ID/URI는 먼저 추가된 단계의 Citation을 유지"""
+    executor = MultiStageSearchExecutor()
+    primary = _annotated(
+        executor,
+        _make_citation("id-1", "s3://kb/a.pdf", BASE_TEXT),
+        _make_citation("id-2", "s3://kb/b.pdf", OTHER_TEXT),
+    )
+    additional_1 = _annotated(
+        executor,
+        _make_citation("id-1", "s3://kb/a-copy.pdf", "다른 본문"),  # ID 중복
+        _make_citation("id-3", "s3://kb/b.pdf", "다른 본문"),  # URI 중복
+        _make_citation("id-4", "s3://kb/c.pdf", "새 문서"),
+    )
+    additional_2 = _annotated(executor, _make_citation("id-5", "s3://kb/c.pdf", "새 문서 다른 페이지"))
+
+    deduplicator = _CitationDeduplicator()
+    deduplicator.add_stage(primary, "primary", 1.0)
+    deduplicator.add_stage(additional_1, "additional_1", 0.8)
+    deduplicator.add_stage(additional_2, "additional_2", 0.7)
+
+    assert [c["id"] for c in deduplicator.kept] == ["id-1", "id-2", "id-4"]
+    assert [c["source_stage"] for c in deduplicator.kept] == ["primary", "primary", "additional_1"]
+    assert deduplicator.seen_count == 6
+
+
+def test_deduplicator_preview_checks_only_without_uri():
+    """preview 기반 판정은 URI가 없는 Citation에만 적용 (URI가 다르면 같은 본문도 유지)"""
+    executor = MultiStageSearchExecutor()
+    citations = _annotated(
+        executor,
+        _make_citation("id-1", "s3://kb/a.pdf", BASE_TEXT),
+        _make_citation("id-2", "s3://kb/b.pdf", BASE_TEXT),  # URI가 다르므로 유지
+        _make_citation("id-3", "", BASE_TEXT.replace(" ", "  ")),  # URI 없음 + 정규화 preview 일치
+        _make_citation("id-4", "", BASE_TEXT.replace("수시로", "자주")),  # URI 없음 + 근사 중복
+        _make_citation("id-5", "", OTHER_TEXT),
+    )
+
+    deduplicator = _CitationDeduplicator()
+    deduplicator.add_stage(citations, "primary", 1.0)
+
+    assert [c["id"] for c in deduplicator.kept] == ["id-1", "id-2", "id-5"]
+
+
+def test_additional_search_filter_matches_deduplicator():
+    """추가 검색 결과 필터(_is_duplicate_citation)도 통합 중복 제거와 같은 규칙 적용"""
+    executor = MultiStageSearchExecutor()
+    primary = _annotated(executor, _make_citation("id-1", "s3://kb/a.pdf", BASE_TEXT))
+    index = executor._build_duplicate_index(primary)
+
+    same_uri, other_uri, no_uri_near, no_uri_other = _annotated(
+        executor,
+        _make_citation("id-2", "s3://kb/a.pdf", OTHER_TEXT),
+        _make_citation("id-3", "s3://kb/b.pdf", BASE_TEXT),
+        _make_citation("id-4", "", BASE_TEXT.replace("수시로", "자주")),
+        _make_citation("id-5", "", OTHER_TEXT),
+    )
+
+    assert executor._is_duplicate_citation(same_uri, index)
+    assert not executor._is_duplicate_citation(other_uri, index)
+    assert executor._is_duplicate_citation(no_uri_near, index)
+    assert not executor._is_duplicate_citation(no_uri_other, index)
+
+
+def main():
+    """모든 테스트 실행"""
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failed}/{len(tests)} 통과")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
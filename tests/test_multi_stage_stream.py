@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+다단계 검색 스트리밍(stream_multi_stage_search) 동작 확인 스크립트
+단계별 결과 전달 순서와 스트림 중단 시 대기 중인 추가 검색 취소를 확인합니다.
+
+실행: python tests/test_multi_stage_stream.py (pytest로도 실행 가능, KB 호출 없음)
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agents.multi_stage_search import MultiStageSearchExecutor
+
+
+def _kb_result(query: str):
+    return {
+        "content": {"text": f"{query} 관련 본문"},
+        "location": {"s3Location": {"uri": f"s3://kb/{query}.pdf"}},
+        "metadata": {},
+        "score": 0.5
+    }
+
+
+class _FakeKBClient:
+    """쿼리별로 문서 하나를 즉시 반환하는 KB 클라이언트 (호출된 쿼리 기록)"""
+
+    def __init__(self):
+        self.queries = []
+
+    async def asearch_knowledge_base(self, query, max_results=None, search_type=None, filter_criteria=None):
+        self.queries.append(query)
+        await asyncio.sleep(0)
+        return [_kb_result(query)], 0.0
+
+
+class _SlowAdditionalKBClient:
+    """1차 검색은 즉시, 추가 검색은 오래 걸리는 KB 클라이언트 (취소 여부 기록)"""
+
+    def __init__(self, primary_query: str):
+        self.primary_query = primary_query
+        self.cancelled = []
+
+    async def asearch_knowledge_base(self, query, max_results=None, search_type=None, filter_criteria=None):
+        if query != self.primary_query:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                self.cancelled.append(query)
+                raise
+        return [_kb_result(query)], 0.0
+
+
+def _analysis(query: str, additional_queries):
+    return {
+        "original_query": query,
+        "requires_additional_search": bool(additional_queries),
+        "additional_search_queries": list(additional_queries),
+        "primary_intent": "절차_문의"
+    }
+
+
+async def _collect(executor, analysis_result):
+    return [event async for event in executor.stream_multi_stage_search(analysis_result)]
+
+
+def test_stream_yields_primary_additional_then_final():
+    """1차 결과를 먼저, 추가 검색은 완료될 때마다, 마지막에 통합 결과를 전달"""
+    executor = MultiStageSearchExecutor()
+    executor.kb_client = _FakeKBClient()
+    try:
+        events = asyncio.run(_collect(executor, _analysis("거푸집 안전", ["거푸집 절차", "거푸집 규정"])))
+    finally:
+        executor.close()
+
+    assert [event["stage"] for event in events] == ["primary", "additional", "additional", "final"]
+    assert sorted(event["stage_number"] for event in events[1:3]) == [1, 2]
+
+    final_result = events[-1]["result"]
+    assert final_result["status"] == "success"
+    assert len(final_result["citations"]) == 3
+    assert len(final_result["search_stages"]) == 3
+
+
+def test_stream_cancels_pending_searches_on_close():
+    """스트리밍 검색을 중간에 닫으면 완료되지 않은 추가 검색 태스크를 취소"""
+    executor = MultiStageSearchExecutor()
+    kb_client = _SlowAdditionalKBClient("거푸집 안전")
+    executor.kb_client = kb_client
+    async def consume_primary_only():
+        stream = executor.stream_multi_stage_search(_analysis("거푸집 안전", ["거푸집 절차", "거푸집 규정"]))
+        first_event = await stream.__anext__()
+        await stream.aclose()
+        await asyncio.sleep(0)  # 취소 처리
+        return first_event
+
+    try:
+        first_event = asyncio.run(consume_primary_only())
+    finally:
+        executor.close()
+
+    assert first_event["stage"] == "primary"
+    assert len(first_event["citations"]) == 1
+    assert not any(key.startswith("_") for key in first_event["citations"][0])
+    assert sorted(kb_client.cancelled) == ["거푸집 규정", "거푸집 절차"]
+
+
+def test_repeated_search_is_served_from_kb_cache():
+    """같은 분석 결과로 다시 검색하면 KB를 다시 호출하지 않고 같은 결과를 반환"""
+    executor = MultiStageSearchExecutor()
+    kb_client = _FakeKBClient()
+    executor.kb_client = kb_client
+    analysis_result = _analysis("거푸집 안전", ["거푸집 절차"])
+    try:
+        first = asyncio.run(executor.execute_multi_stage_search_async(analysis_result))
+        second = asyncio.run(executor.execute_multi_stage_search_async(analysis_result))
+    finally:
+        executor.close()
+
+    assert sorted(kb_client.queries) == ["거푸집 안전", "거푸집 절차"]
+    assert [c["id"] for c in second["citations"]] == [c["id"] for c in first["citations"]]
+    assert second["citations"][0] is not first["citations"][0]  # 실행마다 새 Citation dict
+
+
+def test_concurrent_runs_keep_their_own_stages():
+    """같은 executor로 동시에 실행한 검색의 단계 목록이 서로 섞이지 않음"""
+    executor = MultiStageSearchExecutor()
+    executor.kb_client = _FakeKBClient()
+    runs = {
+        "거푸집 안전": ["거푸집 절차"],
+        "철근 시험": ["철근 규정", "철근 기준", "철근 절차"],
+    }
+
+    async def run_all():
+        return await asyncio.gather(*(
+            executor.execute_multi_stage_search_async(_analysis(query, additional_queries))
+            for query, additional_queries in runs.items()
+        ))
+
+    try:
+        results = asyncio.run(run_all())
+    finally:
+        executor.close()
+
+    for (query, additional_queries), result in zip(runs.items(), results):
+        stage_queries = sorted(stage["query"] for stage in result["search_stages"])
+        assert stage_queries == sorted([query] + additional_queries), f"{query}: {stage_queries}"
+    assert sorted(h["search_stages"] for h in executor.execution_history) == [2, 4]
+
+
+def main():
+    """모든 테스트 실행"""
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failed}/{len(tests)} 통과")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+ImprovedReActAgent 비동기 작업 API(submit_query_enhanced / poll_job) 확인 스크립트
+작업별 진행 이벤트 분리, 결과 조회 후 삭제, 조회되지 않은 완료 작업 정리를 확인합니다.
+
+실제 쿼리 처리(process_query_enhanced)는 Tool 호출 추적만 수행하는 함수로 바꿔 실행합니다 (KB/LLM 호출 없음).
+
+실행: python tests/test_query_jobs.py (pytest로도 실행 가능)
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import settings
+from src.agents.react_agent_improved_safe import ImprovedReActAgent
+
+
+def _make_agent(job_count: int = 1) -> ImprovedReActAgent:
+    """Tool 호출 시작/완료만 기록하는 처리 함수를 가진 Agent (동시 작업이 서로 교차하도록 barrier 사용)"""
+    agent = ImprovedReActAgent()
+    barrier = threading.Barrier(job_count, timeout=5)
+
+    def fake_process(user_query, session_id=None, system_prompt=None, kb_id=None,
+                     max_iterations=3, image_data=None, ui_callback=None, ui_payload_refs=None):
+        call_id = agent.tool_tracker.start_tool_call(
+            "kb_search", {"query": user_query}, "primary_search", ui_callback=ui_callback
+        )
+        barrier.wait()  # 모든 작업이 호출을 시작한 뒤 완료 처리
+        agent.tool_tracker.complete_tool_call(call_id, {"citations": [], "search_time": 0.0})
+        return {"status": "success", "content": user_query}
+
+    agent.process_query_enhanced = fake_process
+    return agent
+
+
+def _wait_done(agent: ImprovedReActAgent, job_id: str, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = agent._jobs.get(job_id)
+        if job is None or job["future"].done():
+            return
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_poll_returns_result_once():
+    """완료된 작업은 결과를 한 번 반환한 뒤 삭제"""
+    agent = _make_agent()
+    job_id = agent.submit_query_enhanced("거푸집 안전")
+    _wait_done(agent, job_id)
+
+    poll_result = agent.poll_job(job_id)
+    assert poll_result["status"] == "done"
+    assert poll_result["result"]["content"] == "거푸집 안전"
+    assert [event["type"] for event in poll_result["events"]] == ["tool_call_start", "tool_call_complete"]
+
+    assert agent.poll_job(job_id)["status"] == "not_found"
+
+
+def test_poll_since_returns_only_new_events():
+    """since 이후의 이벤트만 반환"""
+    agent = _make_agent()
+    job_id = agent.submit_query_enhanced("거푸집 안전")
+    _wait_done(agent, job_id)
+
+    poll_result = agent.poll_job(job_id, since=1)
+    assert [event["type"] for event in poll_result["events"]] == ["tool_call_complete"]
+    assert poll_result["next_event_index"] == 2
+
+
+def test_concurrent_jobs_receive_only_their_own_events():
+    """동시에 실행되는 작업의 Tool 호출 이벤트가 다른 작업으로 전달되지 않음"""
+    queries = [f"쿼리 {i}" for i in range(4)]
+    agent = _make_agent(job_count=len(queries))
+    forwarded = {query: [] for query in queries}
+
+    job_ids = {
+        query: agent.submit_query_enhanced(
+            query, ui_callback=lambda event_type, data, query=query: forwarded[query].append(data)
+        )
+        for query in queries
+    }
+    for job_id in job_ids.values():
+        _wait_done(agent, job_id)
+
+    for query, job_id in job_ids.items():
+        events = agent.poll_job(job_id)["events"]
+        assert len(events) == 2, f"{query}: {len(events)} events"
+        assert all(event["data"]["parameters"]["query"] == query for event in events)
+        assert all(data["parameters"]["query"] == query for data in forwarded[query])
+
+
+def test_unpolled_jobs_are_purged():
+    """조회되지 않은 완료 작업은 TTL/개수 제한으로 정리"""
+    original = (settings.api.job_result_ttl_seconds, settings.api.max_retained_jobs)
+    try:
+        agent = _make_agent()
+
+        # TTL 초과
+        settings.api.job_result_ttl_seconds = 0.05
+        settings.api.max_retained_jobs = 100
+        old_jobs = [agent.submit_query_enhanced(f"old {i}") for i in range(3)]
+        for job_id in old_jobs:
+            _wait_done(agent, job_id)
+        time.sleep(0.1)
+        agent.submit_query_enhanced("new")
+        assert all(agent.poll_job(job_id)["status"] == "not_found" for job_id in old_jobs)
+
+        # 개수 제한 초과 (오래 전에 완료된 작업부터 삭제)
+        settings.api.job_result_ttl_seconds = 600
+        settings.api.max_retained_jobs = 3
+        jobs = []
+        for i in range(3):
+            jobs.append(agent.submit_query_enhanced(f"job {i}"))
+            _wait_done(agent, jobs[-1])
+            time.sleep(0.01)  # 완료 시각 기록(done callback) 대기
+        agent.submit_query_enhanced("latest")
+        assert len(agent._jobs) <= 3
+        assert agent.poll_job(jobs[0])["status"] == "not_found"
+        assert agent.poll_job(jobs[-1])["status"] == "done"
+    finally:
+        settings.api.job_result_ttl_seconds, settings.api.max_retained_jobs = original
+
+
+def test_search_complete_event_inlines_small_results():
+    """작은 검색 결과는 기존처럼 search_results로 전달하고 참조를 만들지 않음"""
+    agent = ImprovedReActAgent()
+    refs = []
+    search_results = {"status": "success", "citations": [{"id": "a"}]}
+
+    event = agent._search_complete_event(search_results, 1, 1, refs)
+    assert event["search_results"] is search_results
+    assert "search_results_ref" not in event
+    assert refs == []
+
+
+def test_large_search_results_are_released_with_their_job():
+    """큰 검색 결과는 참조 ID로 전달되고 작업 결과를 회수하면 삭제"""
+    agent = ImprovedReActAgent()
+    large_results = {
+        "status": "success",
+        "citations": [{"id": str(i), "preview": "본문 " * 50} for i in range(20)]
+    }
+
+    def fake_process(user_query, session_id=None, system_prompt=None, kb_id=None,
+                     max_iterations=3, image_data=None, ui_callback=None, ui_payload_refs=None):
+        ui_callback("stage_update", agent._search_complete_event(large_results, 20, 1, ui_payload_refs))
+        return {"status": "success", "content": user_query}
+
+    agent.process_query_enhanced = fake_process
+    job_id = agent.submit_query_enhanced("거푸집 안전")
+    _wait_done(agent, job_id)
+
+    event = agent._jobs[job_id]["events"][0]["data"]
+    assert "search_results" not in event
+    assert event["search_summary"]["citation_count"] == 20
+    assert agent.get_ui_payload(event["search_results_ref"]) is large_results
+
+    assert agent.poll_job(job_id)["status"] == "done"
+    assert agent.get_ui_payload(event["search_results_ref"]) is None
+
+
+def main():
+    """모든 테스트 실행"""
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failed}/{len(tests)} 통과")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+ImprovedReActAgent 응답 캐시 동작 확인 스크립트
+캐시 키 구성(분석 결과 반영)과 캐시 적중 시 메타데이터 갱신을 확인합니다.
+
+하위 Agent는 호출 횟수만 기록하는 객체로 바꿔 실행합니다 (KB/LLM 호출 없음).
+
+실행: python tests/test_react_caches.py (pytest로도 실행 가능)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agents.react_agent_improved_safe import ImprovedReActAgent
+from src.utils.session import session_manager
+
+SEARCH_RESULTS = {"status": "success", "citations": [{"id": "a"}, {"id": "b"}]}
+
+
+class _CountingResponseAgent:
+    """응답 생성 횟수를 세는 Response Agent"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate_comprehensive_response(self, user_query, search_results, analysis_result,
+                                        session=None, system_prompt=None, image_data=None):
+        self.calls += 1
+        return {
+            "content": f"{user_query} / {analysis_result.get('primary_intent')}",
+            "status": "success",
+            "response_metadata": {"processing_time": 3.0, "timestamp": "2000-01-01T00:00:00"}
+        }
+
+
+def _make_agent():
+    agent = ImprovedReActAgent()
+    agent.response_agent = _CountingResponseAgent()
+    return agent, session_manager.create_session()
+
+
+def _analysis(primary_intent="절차_문의", complexity="보통", key_entities=("거푸집",)):
+    return {
+        "primary_intent": primary_intent,
+        "complexity": complexity,
+        "search_priorities": {"key_entities": list(key_entities)}
+    }
+
+
+def test_response_cache_hit_for_same_inputs():
+    """쿼리/분석/Citation 집합이 같으면 응답을 다시 생성하지 않음"""
+    agent, session = _make_agent()
+    first = agent._generate_response_cached("거푸집 안전", SEARCH_RESULTS, _analysis(), session, None)
+    second = agent._generate_response_cached("거푸집 안전", SEARCH_RESULTS, _analysis(), session, None)
+
+    assert agent.response_agent.calls == 1
+    assert second["content"] == first["content"]
+    assert second["response_metadata"]["cache_hit"] is True
+
+
+def test_response_cache_key_includes_analysis_fields():
+    """응답 프롬프트에 쓰이는 의도/복잡도/핵심 엔티티가 다르면 새로 생성"""
+    agent, session = _make_agent()
+    agent._generate_response_cached("거푸집 안전", SEARCH_RESULTS, _analysis(), session, None)
+    agent._generate_response_cached("거푸집 안전", SEARCH_RESULTS, _analysis(primary_intent="일반_정보"), session, None)
+    agent._generate_response_cached("거푸집 안전", SEARCH_RESULTS, _analysis(complexity="복잡"), session, None)
+    agent._generate_response_cached("거푸집 안전", SEARCH_RESULTS, _analysis(key_entities=("동바리",)), session, None)
+
+    assert agent.response_agent.calls == 4
+
+
+def test_response_cache_hit_refreshes_timing_metadata():
+    """캐시 적중 응답의 처리 시간/시각은 이번 요청 기준"""
+    agent, session = _make_agent()
+    agent._generate_response_cached("거푸집 안전", SEARCH_RESULTS, _analysis(), session, None)
+    cached = agent._generate_response_cached("거푸집 안전", SEARCH_RESULTS, _analysis(), session, None)
+
+    assert cached["response_metadata"]["processing_time"] < 3.0
+    assert cached["response_metadata"]["timestamp"] != "2000-01-01T00:00:00"
+
+
+def main():
+    """모든 테스트 실행"""
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failed}/{len(tests)} 통과")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)